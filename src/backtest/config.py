@@ -0,0 +1,124 @@
+"""Backtest configuration loading."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from src.common.types import RiskLimits
+from src.common.utils import load_yaml
+from src.risk.sizing import KellyConfig
+from src.risk.stops_tps import StopConfig
+
+from .signals import StrategyParams
+
+
+def _as_datetime(value: Any) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    return datetime.fromisoformat(str(value))
+
+
+@dataclass(slots=True)
+class BacktestConfig:
+    engine: str
+    symbol: str
+    data_dir: Path = Path("data/bars")
+    data_resolution: str = "M1"
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    initial_capital: float = 100_000.0
+    commission_bps: float = 1.0
+    slippage_bps: float = 0.5
+    latency_ms: float = 150.0
+    config_dir: Path = Path("configs")
+    routing_profile: Optional[str] = None
+    params: StrategyParams = field(default_factory=StrategyParams)
+
+    @classmethod
+    def from_file(cls, path: Path, symbol: str, **overrides: Any) -> BacktestConfig:
+        """Build a config from ``configs/backtest.yaml``-style settings."""
+
+        raw = load_yaml(path)
+        values: Dict[str, Any] = {
+            "engine": str(raw.get("engine", "event")),
+            "symbol": symbol,
+            "data_resolution": str(raw.get("data_resolution", "M1")),
+            "start": _as_datetime(raw.get("start")),
+            "end": _as_datetime(raw.get("end")),
+            "initial_capital": float(raw.get("initial_capital", 100_000.0)),
+            "commission_bps": float(raw.get("commission_bps", 1.0)),
+            "slippage_bps": float(raw.get("slippage_bps", 0.5)),
+            "latency_ms": float(raw.get("latency_ms", 150.0)),
+            "config_dir": path.parent,
+        }
+        if "data_dir" in raw:
+            values["data_dir"] = Path(raw["data_dir"])
+        values.update(overrides)
+        return cls(**values)
+
+
+@dataclass(slots=True)
+class PipelineConfig:
+    """Risk, sizing and routing settings shared by the backtest engines."""
+
+    limits: RiskLimits
+    kelly: KellyConfig
+    stops: StopConfig
+    routing_profiles: Dict[str, Dict[str, object]]
+    routing_profile: str
+    atr_multiplier: float
+
+    @property
+    def prefer(self) -> str:
+        """Order style of the active routing profile."""
+
+        return str(self.routing_profiles.get(self.routing_profile, {}).get("prefer", "market"))
+
+
+def load_pipeline_config(
+    config_dir: Path, symbol: str, routing_profile: Optional[str] = None
+) -> PipelineConfig:
+    """Read risk, routing and per-symbol settings from *config_dir*."""
+
+    risk = load_yaml(config_dir / "risk.yaml")
+    routing = load_yaml(config_dir / "routing.yaml")
+    symbols = load_yaml(config_dir / "symbols.yaml").get("symbols", {})
+    limits = risk.get("limits", {})
+    kelly = risk.get("kelly", {})
+    stops = risk.get("stops", {})
+    return PipelineConfig(
+        limits=RiskLimits(
+            daily_drawdown_pct=float(limits.get("daily_drawdown_pct", 3.0)),
+            max_losing_streak=int(limits.get("max_losing_streak", 4)),
+            correlation_limit=float(limits.get("correlation_limit", 0.7)),
+            spread_cap_bps=float(limits.get("spread_cap_bps", 30.0)),
+            latency_cap_ms=float(limits.get("latency_cap_ms", 300.0)),
+        ),
+        kelly=KellyConfig(
+            max_fraction=float(kelly.get("max_fraction", 0.02)),
+            floor_fraction=float(kelly.get("floor_fraction", 0.002)),
+        ),
+        stops=StopConfig(
+            atr_multiplier=float(stops.get("atr_multiplier_default", 2.0)),
+            break_even_r=float(stops.get("break_even_r_multiple", 1.0)),
+            partial_take_profits={
+                float(level["at_r"]): float(level["pct"])
+                for level in stops.get("partial_take_profits", [])
+            },
+            trailing_atr_multiplier=float(stops.get("trailing_atr_multiplier", 1.5)),
+        ),
+        routing_profiles=routing.get("profiles", {}),
+        routing_profile=routing_profile
+        or str(routing.get("default", {}).get("fallback", "market_on_signal")),
+        atr_multiplier=float(
+            symbols.get(symbol, {}).get("atr_multiplier", stops.get("atr_multiplier_default", 2.0))
+        ),
+    )
+
+
+__all__ = ["BacktestConfig", "PipelineConfig", "load_pipeline_config"]
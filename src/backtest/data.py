@@ -0,0 +1,182 @@
+"""Historical bar loading for backtests."""
+
+from __future__ import annotations
+
+import csv
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src.common.clock import TIMEFRAME_SECONDS, to_epoch_ns
+from src.common.column_store import ColumnStore
+
+BAR_COLUMNS = ("open", "high", "low", "close", "volume")
+RESOLUTION_SECONDS: Dict[str, int] = TIMEFRAME_SECONDS
+
+
+@dataclass(slots=True)
+class BarSeries:
+    """Columnar OHLCV bars for one symbol; ``timestamps`` are bar-open epoch nanoseconds."""
+
+    symbol: str
+    resolution: str
+    timestamps: NDArray[np.int64]
+    open: NDArray[np.float64]
+    high: NDArray[np.float64]
+    low: NDArray[np.float64]
+    close: NDArray[np.float64]
+    volume: NDArray[np.float64]
+
+    def __len__(self) -> int:
+        return int(self.timestamps.size)
+
+    @property
+    def bar_ns(self) -> int:
+        return RESOLUTION_SECONDS[self.resolution] * 1_000_000_000
+
+    def slice(self, lo: int, hi: int) -> BarSeries:
+        """Return rows ``lo:hi`` as views."""
+
+        return BarSeries(
+            self.symbol,
+            self.resolution,
+            self.timestamps[lo:hi],
+            self.open[lo:hi],
+            self.high[lo:hi],
+            self.low[lo:hi],
+            self.close[lo:hi],
+            self.volume[lo:hi],
+        )
+
+    def between(self, start: datetime | None = None, end: datetime | None = None) -> BarSeries:
+        """Return the bars with ``start <= timestamp < end`` as views."""
+
+        lo = (
+            0
+            if start is None
+            else int(np.searchsorted(self.timestamps, to_epoch_ns(start), side="left"))
+        )
+        hi = (
+            len(self)
+            if end is None
+            else int(np.searchsorted(self.timestamps, to_epoch_ns(end), side="left"))
+        )
+        return self.slice(lo, hi)
+
+
+def bar_path(data_dir: Path, symbol: str, resolution: str, suffix: str) -> Path:
+    return data_dir / f"{symbol}_{resolution}{suffix}"
+
+
+def save_bars(series: BarSeries, data_dir: Path) -> Path:
+    """Write *series* to ``<data_dir>/<symbol>_<resolution>.npz``."""
+
+    data_dir.mkdir(parents=True, exist_ok=True)
+    path = bar_path(data_dir, series.symbol, series.resolution, ".npz")
+    np.savez(
+        path, timestamps=series.timestamps, **{name: getattr(series, name) for name in BAR_COLUMNS}
+    )
+    return path
+
+
+def _read_csv(path: Path) -> Dict[str, NDArray]:
+    timestamps = []
+    columns: Dict[str, list] = {name: [] for name in BAR_COLUMNS}
+    with path.open("r", encoding="utf-8", newline="") as fh:
+        for row in csv.DictReader(fh):
+            stamp = row["timestamp"]
+            timestamps.append(
+                int(stamp) if stamp.isdigit() else to_epoch_ns(datetime.fromisoformat(stamp))
+            )
+            for name in BAR_COLUMNS:
+                columns[name].append(float(row.get(name) or 0.0))
+    arrays: Dict[str, NDArray] = {
+        name: np.asarray(values, dtype=np.float64) for name, values in columns.items()
+    }
+    arrays["timestamps"] = np.asarray(timestamps, dtype=np.int64)
+    return arrays
+
+
+def load_bars(
+    data_dir: Path,
+    symbol: str,
+    resolution: str = "M1",
+    start: datetime | None = None,
+    end: datetime | None = None,
+) -> BarSeries:
+    """Load bars from a :class:`ColumnStore` at *data_dir*, or a ``.npz``/``.csv`` file.
+
+    Files are named ``<symbol>_<resolution>``. Store reads only open the day
+    partitions inside ``[start, end)`` and return memory-mapped columns. CSV
+    files need a header with ``timestamp`` (epoch nanoseconds or ISO-8601) and
+    the OHLCV columns; rows must be in time order.
+    """
+
+    store = ColumnStore(data_dir)
+    if store.has(symbol, resolution):
+        arrays = store.read(symbol, resolution, start, end, columns=BAR_COLUMNS)
+        return BarSeries(symbol, resolution, **arrays)
+    npz = bar_path(data_dir, symbol, resolution, ".npz")
+    if npz.exists():
+        with np.load(npz) as archive:
+            arrays: Dict[str, NDArray] = {
+                name: archive[name] for name in ("timestamps", *BAR_COLUMNS)
+            }
+    else:
+        csv_path = bar_path(data_dir, symbol, resolution, ".csv")
+        if not csv_path.exists():
+            raise FileNotFoundError(f"no {resolution} bars for {symbol} in {data_dir}")
+        arrays = _read_csv(csv_path)
+    series = BarSeries(
+        symbol=symbol,
+        resolution=resolution,
+        timestamps=np.ascontiguousarray(arrays["timestamps"], dtype=np.int64),
+        **{name: np.ascontiguousarray(arrays[name], dtype=np.float64) for name in BAR_COLUMNS},
+    )
+    if start is not None or end is not None:
+        series = series.between(start, end)
+    return series
+
+
+def synthetic_bars(
+    symbol: str,
+    bars: int,
+    start: datetime = datetime(2021, 1, 4),
+    price: float = 2000.0,
+    volatility: float = 2e-4,
+    trend: float = 3e-5,
+    regime_bars: int = 1440,
+    seed: int = 0,
+    resolution: str = "M1",
+) -> BarSeries:
+    """Generate a random-walk series whose drift flips sign every ``regime_bars`` bars."""
+
+    rng = np.random.default_rng(seed)
+    drift = np.where((np.arange(bars) // regime_bars) % 2 == 0, trend, -trend)
+    returns = drift + volatility * rng.standard_normal(bars)
+    close = price * np.exp(np.cumsum(returns))
+    open_ = np.empty(bars)
+    open_[0] = price
+    open_[1:] = close[:-1]
+    wick = np.abs(rng.standard_normal((2, bars))) * volatility * 0.5 * close
+    high = np.maximum(open_, close) + wick[0]
+    low = np.minimum(open_, close) - wick[1]
+    volume = rng.gamma(2.0, 50.0, bars) * (1 + 5 * np.abs(returns) / volatility)
+    step = RESOLUTION_SECONDS[resolution] * 1_000_000_000
+    timestamps = to_epoch_ns(start) + step * np.arange(bars, dtype=np.int64)
+    return BarSeries(symbol, resolution, timestamps, open_, high, low, close, volume)
+
+
+__all__ = [
+    "BAR_COLUMNS",
+    "RESOLUTION_SECONDS",
+    "BarSeries",
+    "bar_path",
+    "load_bars",
+    "save_bars",
+    "synthetic_bars",
+]
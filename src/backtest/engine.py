@@ -3,35 +3,289 @@
 from __future__ import annotations
 
 import argparse
-from dataclasses import dataclass
+import time
 from pathlib import Path
-from typing import Dict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
+import numpy as np
 from structlog import get_logger
 
+from src.common.types import Direction, OrderRequest
+from src.execution.router import ExecutionRouter
+from src.risk.limits import LimitEvaluator
+from src.risk.sizing import confidence_scaled_size
+from src.risk.stops_tps import move_to_break_even
+from src.strategy.gates import MultiTimeframeGate
+from src.strategy.signal_ensemble import SignalEnsemble
+
+from .config import BacktestConfig, PipelineConfig, load_pipeline_config
+from .data import BarSeries, load_bars
+from .reporting import BacktestResult, Trade, summarize
+from .signals import SignalFrame, compute_signals, fill_rows
+from .vectorized import VectorizedEngine
+
 LOGGER = get_logger(__name__)
 
+DAY_NS = 86_400 * 1_000_000_000
+
+
+class EventDrivenEngine:
+    """Replay bars through the gate, ensemble, risk and routing pipeline.
+
+    Orders decided at a bar close reach the market ``latency_ms`` later and
+    fill at the open of the bar that is trading by then (the next bar for
+    sub-bar latencies). Market orders pay ``slippage_bps``; limit and maker
+    routes rest at the signal close and fill only if price trades through it.
+    Commission is charged on the notional of every fill. Exits follow the
+    risk config: ATR stop, partial take-profits, break-even and ATR trailing,
+    with a ``max_hold_bars`` time stop.
+    """
+
+    def __init__(
+        self,
+        config: BacktestConfig,
+        pipeline: PipelineConfig | None = None,
+        gate: MultiTimeframeGate | None = None,
+        ensemble: SignalEnsemble | None = None,
+    ) -> None:
+        self._config = config
+        self._pipeline = pipeline or load_pipeline_config(
+            config.config_dir, config.symbol, config.routing_profile
+        )
+        self._gate = gate or MultiTimeframeGate()
+        self._ensemble = ensemble or SignalEnsemble()
+        self._router = ExecutionRouter(self._pipeline.routing_profiles)
+        self._take_profits: List[Tuple[float, float]] = sorted(
+            self._pipeline.stops.partial_take_profits.items()
+        )
+
+    def signals(self, series: BarSeries) -> SignalFrame:
+        return compute_signals(series, self._config.params, self._gate, self._ensemble)
+
+    def run(self, series: BarSeries, signals: SignalFrame | None = None) -> BacktestResult:
+        config = self._config
+        params = config.params
+        pipeline = self._pipeline
+        started = time.perf_counter()
+        signals = signals if signals is not None else self.signals(series)
+        size = len(series)
+        timestamps = series.timestamps
+        signal_rows = np.flatnonzero(signals.entry)
+        fills = fill_rows(series, signal_rows, config.latency_ms)
+
+        long_prices = (
+            series.open.tolist(),
+            series.high.tolist(),
+            series.low.tolist(),
+            series.close.tolist(),
+        )
+        short_prices: Optional[Tuple[List[float], ...]] = None
+        atr = signals.atr.tolist()
+        confidence = signals.confidence.tolist()
+        is_long = signals.long.tolist()
+        stamps = timestamps.tolist()
+        atr_multiplier = params.atr_multiplier or pipeline.atr_multiplier
+        slippage = config.slippage_bps / 10_000
+        commission = config.commission_bps / 10_000
+
+        equity = config.initial_capital
+        trades: List[Trade] = []
+        limits = LimitEvaluator(pipeline.limits)
+        market_state = {"latency_ms": config.latency_ms}
+        current_day = -1
+        cursor = 0
+        for signal_row, fill_row in zip(signal_rows.tolist(), fills.tolist()):
+            if signal_row < cursor:
+                continue
+            if fill_row >= size:
+                break
+            day = stamps[signal_row] // DAY_NS
+            if day != current_day:
+                current_day = day
+                limits = LimitEvaluator(pipeline.limits)
+            if not limits.can_trade(market_state):
+                continue
+            stop_distance = atr[signal_row] * atr_multiplier
+            if stop_distance <= 0:
+                continue
+            direction: Direction = "long" if is_long[signal_row] else "short"
+            if direction == "long":
+                opens, highs, lows, closes = long_prices
+            else:
+                if short_prices is None:
+                    short_prices = (
+                        (-series.open).tolist(),
+                        (-series.low).tolist(),
+                        (-series.high).tolist(),
+                        (-series.close).tolist(),
+                    )
+                opens, highs, lows, closes = short_prices
+            reference = long_prices[3][signal_row]
+            risk_amount = confidence_scaled_size(
+                confidence[signal_row], pipeline.kelly.max_fraction, equity
+            )
+            units = risk_amount / stop_distance
+            order = OrderRequest(
+                symbol=series.symbol,
+                direction=direction,
+                size=units,
+                order_type="market",
+                price=reference,
+                stop_loss=(
+                    reference - stop_distance if direction == "long" else reference + stop_distance
+                ),
+                take_profit=None,
+                metadata={"notional": units * reference},
+            )
+            decision = self._router.route(order, pipeline.routing_profile)
+            # Prices below are in "long space": short trades use negated prices,
+            # so every comparison and PnL formula reads as for a long.
+            if decision.prefer == "market":
+                entry = opens[fill_row] + slippage * abs(opens[fill_row])
+            else:
+                limit = closes[signal_row]
+                if opens[fill_row] <= limit:
+                    entry = opens[fill_row]
+                elif lows[fill_row] <= limit:
+                    entry = limit
+                else:
+                    cursor = fill_row
+                    continue
+            exit_row, proceeds, exit_reason = self._manage(
+                opens, highs, lows, closes, atr, fill_row, entry, units, stop_distance, slippage
+            )
+            fees = commission * (abs(entry) * units + proceeds[1])
+            pnl = proceeds[0] - entry * units - fees
+            exit_price = proceeds[1] / units
+            trades.append(
+                Trade(
+                    symbol=series.symbol,
+                    direction=direction,
+                    entry_ts=stamps[fill_row],
+                    exit_ts=stamps[exit_row],
+                    entry_price=abs(entry),
+                    exit_price=exit_price,
+                    units=units,
+                    pnl=pnl,
+                    bars_held=exit_row - fill_row + 1,
+                    exit_reason=exit_reason,
+                )
+            )
+            limits.record_trade(pnl / equity * 100)
+            equity += pnl
+            cursor = exit_row
+
+        metrics = summarize([trade.pnl for trade in trades], config.initial_capital)
+        metrics["bars"] = float(size)
+        elapsed = time.perf_counter() - started
+        LOGGER.info(
+            "event_backtest_complete",
+            symbol=series.symbol,
+            bars=size,
+            trades=len(trades),
+            seconds=elapsed,
+        )
+        return BacktestResult(metrics=metrics, trades=trades)
+
+    def _manage(
+        self,
+        opens: Sequence[float],
+        highs: Sequence[float],
+        lows: Sequence[float],
+        closes: Sequence[float],
+        atr: Sequence[float],
+        start: int,
+        entry: float,
+        units: float,
+        risk: float,
+        slippage: float,
+    ) -> Tuple[int, Tuple[float, float], str]:
+        """Walk an open position bar by bar until it is flat.
+
+        Returns the exit bar, ``(signed proceeds, absolute exit notional)`` in
+        long space and the reason for the final fill.
+        """
+
+        params = self._config.params
+        stops = self._pipeline.stops
+        use_stops = params.use_stops
+        last = min(len(closes), start + params.max_hold_bars) - 1
+        stop = entry - risk
+        targets = [(entry + level * risk, pct * units) for level, pct in self._take_profits]
+        break_even = False
+        remaining = units
+        proceeds = 0.0
+        notional = 0.0
+        for row in range(start, last + 1):
+            if use_stops:
+                if lows[row] <= stop:
+                    price = min(stop, opens[row])
+                    price -= slippage * abs(price)
+                    return (
+                        row,
+                        (proceeds + price * remaining, notional + abs(price) * remaining),
+                        "stop",
+                    )
+                high = highs[row]
+                while targets and high >= targets[0][0]:
+                    price, quantity = targets.pop(0)
+                    quantity = min(quantity, remaining)
+                    proceeds += price * quantity
+                    notional += abs(price) * quantity
+                    remaining -= quantity
+                    if remaining <= 1e-12 * units:
+                        return row, (proceeds, notional), "take_profit"
+                if not break_even and move_to_break_even((high - entry) / risk, stops):
+                    break_even = True
+                    stop = max(stop, entry)
+                if break_even:
+                    stop = max(stop, closes[row] - stops.trailing_atr_multiplier * atr[row])
+        price = closes[last] - slippage * abs(closes[last])
+        reason = "time" if last - start + 1 >= params.max_hold_bars else "end_of_data"
+        return last, (proceeds + price * remaining, notional + abs(price) * remaining), reason
+
+
+ENGINES = {"event": EventDrivenEngine, "vectorized": VectorizedEngine, "vectorbt": VectorizedEngine}
+
+
+def select_engine(config: BacktestConfig) -> type[EventDrivenEngine] | type[VectorizedEngine]:
+    """Return the engine class for ``config.engine``.
+
+    ``vectorbt`` (the name configs/backtest.yaml uses) selects the NumPy
+    :class:`VectorizedEngine`; strategies with stop-based exits fall back to
+    the event-driven engine.
+    """
 
-@dataclass(slots=True)
-class BacktestConfig:
-    engine: str
-    symbol: str
+    engine = ENGINES.get(config.engine)
+    if engine is None:
+        raise ValueError(f"unknown backtest engine {config.engine!r}")
+    if engine is VectorizedEngine and not VectorizedEngine.supports(config.params):
+        LOGGER.debug("vectorized_fallback", reason="path-dependent exits", symbol=config.symbol)
+        return EventDrivenEngine
+    return engine
 
 
-def run_backtest(config: BacktestConfig) -> Dict[str, float]:
-    """Placeholder backtest routine returning mock metrics."""
+def run_backtest(config: BacktestConfig, series: BarSeries | None = None) -> Dict[str, float]:
+    """Run *config* over its bar history and return summary metrics."""
 
     LOGGER.info("run_backtest", engine=config.engine, symbol=config.symbol)
-    return {"win_rate": 0.8, "profit_factor": 2.1, "max_drawdown": -0.03}
+    engine = select_engine(config)
+    if series is None:
+        series = load_bars(
+            config.data_dir, config.symbol, config.data_resolution, config.start, config.end
+        )
+    return engine(config).run(series).metrics
 
 
 def cli(argv: list[str] | None = None) -> None:
     parser = argparse.ArgumentParser(description="Backtest runner")
     parser.add_argument("--config", required=True)
     parser.add_argument("--symbol", required=True)
+    parser.add_argument("--data-dir")
     args = parser.parse_args(argv)
     config_path = Path(args.config)
-    config = BacktestConfig(engine="vectorbt", symbol=args.symbol)
+    overrides: Dict[str, Any] = {"data_dir": Path(args.data_dir)} if args.data_dir else {}
+    config = BacktestConfig.from_file(config_path, args.symbol, **overrides)
     metrics = run_backtest(config)
     LOGGER.info("backtest_metrics", metrics=metrics, config_file=str(config_path))
 
@@ -0,0 +1,248 @@
+"""Parallel (symbol x scenario x parameter set) backtest runner."""
+
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from structlog import get_logger
+
+from src.common.utils import load_yaml
+
+from .config import BacktestConfig
+from .data import BAR_COLUMNS, BarSeries, load_bars
+from .engine import select_engine
+from .scenarios import get_scenario
+from .signals import StrategyParams
+
+LOGGER = get_logger(__name__)
+
+FULL_PERIOD = "full"
+
+# Series opened by this worker process, keyed by (shared dir, symbol).
+_WORKER_SERIES: Dict[Tuple[str, str], BarSeries] = {}
+
+
+@dataclass(slots=True)
+class BacktestJob:
+    symbol: str
+    scenario: str = FULL_PERIOD
+    params: StrategyParams = field(default_factory=StrategyParams)
+    label: str = ""
+
+
+@dataclass(slots=True)
+class JobResult:
+    job: BacktestJob
+    metrics: Dict[str, float]
+
+
+@dataclass(slots=True)
+class ParallelReport:
+    """Metrics for every job plus aggregates across them."""
+
+    results: List[JobResult]
+
+    def rows(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "symbol": item.job.symbol,
+                "scenario": item.job.scenario,
+                "label": item.job.label,
+                **item.metrics,
+            }
+            for item in self.results
+        ]
+
+    def summary(self, by: str = "symbol") -> Dict[str, Dict[str, float]]:
+        """Aggregate jobs grouped by ``symbol``, ``scenario`` or ``label``.
+
+        Trades and net PnL are summed; win rate is trade-weighted; drawdown is
+        the worst of the group.
+        """
+
+        groups: Dict[str, List[Dict[str, float]]] = {}
+        for item in self.results:
+            groups.setdefault(str(getattr(item.job, by)), []).append(item.metrics)
+        summary: Dict[str, Dict[str, float]] = {}
+        for key, metrics in groups.items():
+            trades = sum(entry["trades"] for entry in metrics)
+            wins = sum(entry["win_rate"] * entry["trades"] for entry in metrics)
+            summary[key] = {
+                "jobs": float(len(metrics)),
+                "trades": trades,
+                "win_rate": wins / trades if trades else 0.0,
+                "net_pnl": sum(entry["net_pnl"] for entry in metrics),
+                "max_drawdown": min(entry["max_drawdown"] for entry in metrics),
+            }
+        return summary
+
+
+def build_jobs(
+    symbols: Sequence[str],
+    scenarios: Sequence[str] = (FULL_PERIOD,),
+    param_sets: Sequence[Tuple[str, StrategyParams]] = (("default", StrategyParams()),),
+) -> List[BacktestJob]:
+    """Return the cross product of *symbols*, *scenarios* and labelled parameter sets."""
+
+    return [
+        BacktestJob(symbol=symbol, scenario=scenario, params=params, label=label)
+        for symbol in symbols
+        for scenario in scenarios
+        for label, params in param_sets
+    ]
+
+
+def _window(config: BacktestConfig, scenario: str) -> Tuple[Optional[datetime], Optional[datetime]]:
+    if scenario == FULL_PERIOD:
+        return config.start, config.end
+    item = get_scenario(scenario)
+    return datetime.fromisoformat(item.start), datetime.fromisoformat(item.end) + timedelta(days=1)
+
+
+def open_shared(shared_dir: str, symbol: str, resolution: str) -> BarSeries:
+    """Return a symbol published by :meth:`ParallelRunner.share`, memory-mapped once per process."""
+
+    key = (shared_dir, symbol)
+    series = _WORKER_SERIES.get(key)
+    if series is None:
+        root = Path(shared_dir) / symbol
+        columns = {
+            name: np.load(root / f"{name}.npy", mmap_mode="r").view(np.ndarray)
+            for name in ("timestamps", *BAR_COLUMNS)
+        }
+        series = _WORKER_SERIES[key] = BarSeries(symbol=symbol, resolution=resolution, **columns)
+    return series
+
+
+def _forget_shared(shared_dir: str, symbol: str | None = None) -> None:
+    """Drop cached maps of *shared_dir* (one *symbol* or all) from this process."""
+
+    for key in [key for key in _WORKER_SERIES if key[0] == shared_dir and symbol in (None, key[1])]:
+        del _WORKER_SERIES[key]
+
+
+def _run_job(shared_dir: str, config: BacktestConfig, job: BacktestJob) -> Dict[str, float]:
+    series = open_shared(shared_dir, job.symbol, config.data_resolution).between(
+        *_window(config, job.scenario)
+    )
+    job_config = replace(config, symbol=job.symbol, params=job.params)
+    return select_engine(job_config)(job_config).run(series).metrics
+
+
+class ParallelRunner:
+    """Fan backtest jobs out over a process pool.
+
+    Each symbol's bars are loaded once in the parent and written as one
+    ``.npy`` file per column; workers memory-map those files, so every process
+    shares the same page-cache copy instead of receiving pickled arrays.
+    """
+
+    def __init__(
+        self, config: BacktestConfig, workers: int | None = None, shared_dir: Path | None = None
+    ) -> None:
+        self._config = config
+        self._workers = workers or os.cpu_count() or 1
+        self._owns_dir = shared_dir is None
+        self._shared_dir = shared_dir or Path(tempfile.mkdtemp(prefix="backtest-"))
+        self._shared: set[str] = set()
+
+    @property
+    def shared_dir(self) -> Path:
+        return self._shared_dir
+
+    def __enter__(self) -> ParallelRunner:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        # The parent maps shared files too (single-worker runs, walk-forward windows).
+        _forget_shared(str(self._shared_dir))
+        if self._owns_dir:
+            shutil.rmtree(self._shared_dir, ignore_errors=True)
+
+    def share(self, symbol: str, series: BarSeries | None = None) -> bool:
+        """Publish a symbol's bars (loaded from ``config.data_dir`` by default) to the workers.
+
+        Returns ``False`` when this runner already shared *symbol*. Files are
+        replaced rather than rewritten, so maps opened before a re-share keep
+        reading the old bars until they are dropped.
+        """
+
+        if symbol in self._shared:
+            return False
+        config = self._config
+        if series is None:
+            series = load_bars(config.data_dir, symbol, config.data_resolution)
+        root = self._shared_dir / symbol
+        root.mkdir(parents=True, exist_ok=True)
+        for name in ("timestamps", *BAR_COLUMNS):
+            tmp = root / f"{name}.npy.tmp"
+            with tmp.open("wb") as fh:
+                np.save(fh, getattr(series, name))
+            os.replace(tmp, root / f"{name}.npy")
+        _forget_shared(str(self._shared_dir), symbol)
+        self._shared.add(symbol)
+        return True
+
+    def run(self, jobs: Iterable[BacktestJob], workers: int | None = None) -> ParallelReport:
+        jobs = list(jobs)
+        for symbol in dict.fromkeys(job.symbol for job in jobs):
+            self.share(symbol)
+        shared_dir = str(self._shared_dir)
+        workers = min(workers or self._workers, len(jobs)) or 1
+        LOGGER.info("parallel_backtest_start", jobs=len(jobs), workers=workers)
+        if workers == 1:
+            metrics = [_run_job(shared_dir, self._config, job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                metrics = list(
+                    pool.map(_run_job, [shared_dir] * len(jobs), [self._config] * len(jobs), jobs)
+                )
+        return ParallelReport([JobResult(job, result) for job, result in zip(jobs, metrics)])
+
+
+def cli(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Parallel multi-symbol, multi-scenario backtests")
+    parser.add_argument("--config", required=True)
+    parser.add_argument("--data-dir")
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args(argv)
+    config_path = Path(args.config)
+    config = BacktestConfig.from_file(config_path, symbol="")
+    if args.data_dir:
+        config = replace(config, data_dir=Path(args.data_dir))
+    settings = load_yaml(config_path)
+    jobs = build_jobs(settings.get("symbols", []), [FULL_PERIOD, *settings.get("scenarios", [])])
+    with ParallelRunner(config, workers=args.workers) as runner:
+        report = runner.run(jobs)
+    LOGGER.info(
+        "parallel_backtest_summary",
+        by_symbol=report.summary("symbol"),
+        by_scenario=report.summary("scenario"),
+    )
+
+
+__all__ = [
+    "BacktestJob",
+    "JobResult",
+    "ParallelReport",
+    "ParallelRunner",
+    "build_jobs",
+    "open_shared",
+    "FULL_PERIOD",
+]
+
+
+if __name__ == "__main__":
+    cli()
@@ -3,7 +3,11 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from src.common.types import Direction
 
 
 @dataclass(slots=True)
@@ -13,6 +17,26 @@ class PerformanceReport:
     max_drawdown: float
 
 
+@dataclass(slots=True)
+class Trade:
+    symbol: str
+    direction: Direction
+    entry_ts: int
+    exit_ts: int
+    entry_price: float
+    exit_price: float
+    units: float
+    pnl: float
+    bars_held: int
+    exit_reason: str
+
+
+@dataclass(slots=True)
+class BacktestResult:
+    metrics: Dict[str, float]
+    trades: List[Trade]
+
+
 def generate(metrics: Dict[str, float]) -> PerformanceReport:
     return PerformanceReport(
         win_rate=float(metrics.get("win_rate", 0.0)),
@@ -21,4 +45,31 @@ def generate(metrics: Dict[str, float]) -> PerformanceReport:
     )
 
 
-__all__ = ["PerformanceReport", "generate"]
+def summarize(pnls: Sequence[float], initial_capital: float) -> Dict[str, float]:
+    """Return the metrics consumed by :func:`generate` from per-trade net PnL.
+
+    ``max_drawdown`` is the worst peak-to-trough move of realised equity as a
+    (non-positive) fraction of the peak.
+    """
+
+    values = np.asarray(pnls, dtype=np.float64)
+    gross_profit = float(values[values > 0].sum())
+    gross_loss = float(-values[values < 0].sum())
+    if gross_loss > 0:
+        profit_factor = gross_profit / gross_loss
+    else:
+        profit_factor = float("inf") if gross_profit > 0 else 0.0
+    equity = initial_capital + np.concatenate(([0.0], np.cumsum(values)))
+    peaks = np.maximum.accumulate(equity)
+    net_pnl = float(values.sum())
+    return {
+        "trades": float(values.size),
+        "win_rate": float((values > 0).mean()) if values.size else 0.0,
+        "profit_factor": profit_factor,
+        "max_drawdown": float((equity / peaks - 1.0).min()),
+        "net_pnl": net_pnl,
+        "total_return": net_pnl / initial_capital,
+    }
+
+
+__all__ = ["BacktestResult", "PerformanceReport", "Trade", "generate", "summarize"]
@@ -0,0 +1,180 @@
+"""Bar-level feature and signal precomputation for backtests.
+
+The gate and ensemble are stateless per bar, so their decisions for a whole
+history are computed once with the batch APIs; the engines then only walk the
+path-dependent parts (fills, exits, risk) bar by bar.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from numpy.typing import NDArray
+
+from src.common.indicators import batch
+from src.strategy.gates import GateBatch, MultiTimeframeGate
+from src.strategy.signal_ensemble import EnsembleBatch, SignalEnsemble
+
+from .data import BarSeries
+
+FloatArray = NDArray[np.float64]
+
+# London/New York overlap in UTC hours, fed to playbooks as ``session_overlap``.
+SESSION_OVERLAP_UTC = (12, 16)
+
+
+@dataclass(slots=True)
+class StrategyParams:
+    """Tunable signal and exit parameters shared by every backtest engine."""
+
+    ema_fast: int = 50
+    ema_slow: int = 200
+    period: int = 14
+    volume_lookback: int = 60
+    swing_lookback: int = 20
+    min_confidence: float = 0.5
+    atr_multiplier: Optional[float] = None
+    max_hold_bars: int = 240
+    use_stops: bool = True
+
+
+@dataclass(slots=True)
+class SignalFrame:
+    """Per-bar signal columns aligned with a :class:`BarSeries`."""
+
+    entry: NDArray[np.bool_]
+    long: NDArray[np.bool_]
+    confidence: FloatArray
+    atr: FloatArray
+    invalidation: FloatArray
+
+    def __len__(self) -> int:
+        return int(self.entry.size)
+
+    def slice(self, lo: int, hi: int) -> SignalFrame:
+        """Return rows ``lo:hi`` as views."""
+
+        return SignalFrame(
+            entry=self.entry[lo:hi],
+            long=self.long[lo:hi],
+            confidence=self.confidence[lo:hi],
+            atr=self.atr[lo:hi],
+            invalidation=self.invalidation[lo:hi],
+        )
+
+
+def fill_rows(
+    series: BarSeries, signal_rows: NDArray[np.intp], latency_ms: float
+) -> NDArray[np.intp]:
+    """Bar whose open fills an order decided at the close of each signal bar.
+
+    The order reaches the market ``latency_ms`` after the close and fills in
+    the bar trading at that moment, never earlier than the next bar.
+    """
+
+    timestamps = series.timestamps
+    arrival = timestamps[signal_rows] + series.bar_ns + int(latency_ms * 1_000_000)
+    return np.maximum(signal_rows + 1, np.searchsorted(timestamps, arrival, side="right") - 1)
+
+
+def _rolling_extreme(values: FloatArray, window: int, maximum: bool) -> FloatArray:
+    reduce = np.maximum if maximum else np.minimum
+    out = reduce.accumulate(values)
+    if values.size >= window:
+        view = sliding_window_view(values, window)
+        out[window - 1 :] = view.max(axis=1) if maximum else view.min(axis=1)
+    return out
+
+
+def bar_features(series: BarSeries, params: StrategyParams) -> Dict[str, FloatArray]:
+    """Return the gate and playbook inputs for every bar of *series*."""
+
+    close, high, low = series.close, series.high, series.low
+    _, _, macd_hist = batch.macd(close)
+    bar_range = high - low
+    with np.errstate(divide="ignore", invalid="ignore"):
+        imbalance = np.where(bar_range > 0, (close - series.open) / bar_range, 0.0)
+    hours = (series.timestamps // 3_600_000_000_000) % 24
+    return {
+        "ema_fast": batch.ema(close, params.ema_fast),
+        "ema_slow": batch.ema(close, params.ema_slow),
+        "adx": batch.adx(high, low, close, params.period),
+        "atr": batch.atr(high, low, close, params.period),
+        "macd_hist": macd_hist,
+        "rsi": batch.rsi(close, params.period),
+        "rel_volume": batch.relative_volume(series.volume, params.volume_lookback),
+        "imbalance": imbalance,
+        "swing_low": _rolling_extreme(low, params.swing_lookback, maximum=False),
+        "swing_high": _rolling_extreme(high, params.swing_lookback, maximum=True),
+        "session_overlap": (
+            (hours >= SESSION_OVERLAP_UTC[0]) & (hours < SESSION_OVERLAP_UTC[1])
+        ).astype(np.float64),
+    }
+
+
+def compute_signals(
+    series: BarSeries,
+    params: StrategyParams,
+    gate: MultiTimeframeGate | None = None,
+    ensemble: SignalEnsemble | None = None,
+    features: Dict[str, FloatArray] | None = None,
+) -> SignalFrame:
+    """Run the gate and ensemble over every bar close of *series*."""
+
+    features = features if features is not None else bar_features(series, params)
+    gate = gate or MultiTimeframeGate()
+    ensemble = ensemble or SignalEnsemble()
+    size = len(series)
+    gated = gate.evaluate_arrays(
+        GateBatch(
+            symbols=[series.symbol] * size,
+            price=series.close,
+            ema_fast=features["ema_fast"],
+            ema_slow=features["ema_slow"],
+            adx=features["adx"],
+            macd_hist=features["macd_hist"],
+            rsi=features["rsi"],
+            rel_volume=features["rel_volume"],
+            orderflow=features["imbalance"],
+            swing_low=features["swing_low"],
+            swing_high=features["swing_high"],
+        )
+    )
+    passed = gated.passed
+    passed[: max(params.ema_slow, params.volume_lookback)] = False
+    rows = np.flatnonzero(passed)
+    confidence = np.zeros(size)
+    confidence[rows] = ensemble.combine_batch(
+        EnsembleBatch(
+            symbols=[series.symbol] * rows.size,
+            confidence=gated.confidence[rows],
+            orderflow_score=(features["imbalance"][rows] + 1) / 2,
+            ml_probability=np.full(rows.size, np.nan),
+            sentiment_bias=np.zeros(rows.size),
+            features={
+                "relative_volume": features["rel_volume"][rows],
+                "session_overlap": features["session_overlap"][rows],
+            },
+        )
+    )
+    entry = passed & (confidence >= params.min_confidence)
+    return SignalFrame(
+        entry=entry,
+        long=gated.long,
+        confidence=confidence,
+        atr=features["atr"],
+        invalidation=gated.invalidation,
+    )
+
+
+__all__ = [
+    "SESSION_OVERLAP_UTC",
+    "SignalFrame",
+    "StrategyParams",
+    "bar_features",
+    "compute_signals",
+    "fill_rows",
+]
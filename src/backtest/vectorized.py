@@ -0,0 +1,241 @@
+"""Vectorised backtester for parameter sweeps."""
+
+from __future__ import annotations
+
+import time
+from dataclasses import fields, replace
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+from structlog import get_logger
+
+from src.common.types import Direction
+from src.risk.limits import LimitEvaluator
+from src.risk.sizing import confidence_scaled_size
+from src.strategy.gates import MultiTimeframeGate
+from src.strategy.signal_ensemble import SignalEnsemble
+
+from .config import BacktestConfig, PipelineConfig, load_pipeline_config
+from .data import BarSeries
+from .reporting import BacktestResult, Trade, summarize
+from .signals import (
+    FloatArray,
+    SignalFrame,
+    StrategyParams,
+    bar_features,
+    compute_signals,
+    fill_rows,
+)
+
+LOGGER = get_logger(__name__)
+
+DAY_NS = 86_400 * 1_000_000_000
+
+# StrategyParams fields that change bar_features; the rest only affect entries and exits.
+FEATURE_PARAMS = ("ema_fast", "ema_slow", "period", "volume_lookback", "swing_lookback")
+
+
+class VectorizedEngine:
+    """Array backtester for strategies whose exits do not depend on the price path.
+
+    With stops disabled every position is held ``max_hold_bars`` bars (or to
+    the end of data), so fills, exits and per-unit PnL for every signal are
+    computed as arrays using the same latency, slippage, routing and
+    commission model as :class:`~src.backtest.engine.EventDrivenEngine`. Only
+    picking non-overlapping trades, compounding size and applying the risk
+    limits is sequential, and that loop visits signals rather than bars.
+    """
+
+    def __init__(
+        self,
+        config: BacktestConfig,
+        pipeline: PipelineConfig | None = None,
+        gate: MultiTimeframeGate | None = None,
+        ensemble: SignalEnsemble | None = None,
+    ) -> None:
+        self._config = config
+        self._pipeline = pipeline or load_pipeline_config(
+            config.config_dir, config.symbol, config.routing_profile
+        )
+        self._gate = gate or MultiTimeframeGate()
+        self._ensemble = ensemble or SignalEnsemble()
+
+    @staticmethod
+    def supports(params: StrategyParams) -> bool:
+        """Whether *params* describe exits this engine can evaluate without the price path."""
+
+        return not params.use_stops
+
+    def signals(
+        self, series: BarSeries, features: Dict[str, FloatArray] | None = None
+    ) -> SignalFrame:
+        return compute_signals(series, self._config.params, self._gate, self._ensemble, features)
+
+    def run(self, series: BarSeries, signals: SignalFrame | None = None) -> BacktestResult:
+        config = self._config
+        params = config.params
+        pipeline = self._pipeline
+        if not self.supports(params):
+            raise ValueError("stop-based exits are path dependent; use the event-driven engine")
+        started = time.perf_counter()
+        signals = signals if signals is not None else self.signals(series)
+        size = len(series)
+        rows = np.flatnonzero(signals.entry)
+        fills = fill_rows(series, rows, config.latency_ms)
+        inside = fills < size
+        rows, fills = rows[inside], fills[inside]
+
+        # Work in "long space": short trades use negated prices (and swapped
+        # high/low) so one set of formulas covers both directions.
+        long = signals.long[rows]
+        sign = np.where(long, 1.0, -1.0)
+        slippage = config.slippage_bps / 10_000
+        commission = config.commission_bps / 10_000
+        opens = series.open[fills] * sign
+        if pipeline.prefer == "market":
+            entry = opens + slippage * np.abs(opens)
+            filled = np.ones(rows.size, dtype=bool)
+        else:
+            limit = series.close[rows] * sign
+            lows = np.where(long, series.low[fills], -series.high[fills])
+            entry = np.where(opens <= limit, opens, limit)
+            filled = (opens <= limit) | (lows <= limit)
+        last = np.minimum(size, fills + params.max_hold_bars) - 1
+        closes = series.close[last] * sign
+        exit_ = closes - slippage * np.abs(closes)
+        gross = exit_ - entry
+        fees = commission * (np.abs(entry) + np.abs(exit_))
+        stop_distance = signals.atr[rows] * (params.atr_multiplier or pipeline.atr_multiplier)
+        timed_out = (last - fills + 1) >= params.max_hold_bars
+
+        confidence = signals.confidence[rows].tolist()
+        equity = config.initial_capital
+        trades: List[Trade] = []
+        limits = LimitEvaluator(pipeline.limits)
+        market_state = {"latency_ms": config.latency_ms}
+        current_day = -1
+        cursor = 0
+        timestamps = series.timestamps
+        columns = zip(
+            rows.tolist(),
+            timestamps[rows].tolist(),
+            timestamps[fills].tolist(),
+            timestamps[last].tolist(),
+            fills.tolist(),
+            last.tolist(),
+            long.tolist(),
+            filled.tolist(),
+            entry.tolist(),
+            exit_.tolist(),
+            gross.tolist(),
+            fees.tolist(),
+            stop_distance.tolist(),
+            timed_out.tolist(),
+            confidence,
+        )
+        for (
+            row,
+            signal_ts,
+            entry_ts,
+            exit_ts,
+            fill,
+            exit_row,
+            is_long,
+            is_filled,
+            entry_px,
+            exit_px,
+            per_unit,
+            fee,
+            risk,
+            timed,
+            conf,
+        ) in columns:
+            if row < cursor:
+                continue
+            day = signal_ts // DAY_NS
+            if day != current_day:
+                current_day = day
+                limits = LimitEvaluator(pipeline.limits)
+            if not limits.can_trade(market_state):
+                continue
+            if risk <= 0:
+                continue
+            if not is_filled:
+                cursor = fill
+                continue
+            units = confidence_scaled_size(conf, pipeline.kelly.max_fraction, equity) / risk
+            pnl = units * per_unit - units * fee
+            direction: Direction = "long" if is_long else "short"
+            trades.append(
+                Trade(
+                    symbol=series.symbol,
+                    direction=direction,
+                    entry_ts=entry_ts,
+                    exit_ts=exit_ts,
+                    entry_price=abs(entry_px),
+                    exit_price=abs(exit_px),
+                    units=units,
+                    pnl=pnl,
+                    bars_held=exit_row - fill + 1,
+                    exit_reason="time" if timed else "end_of_data",
+                )
+            )
+            limits.record_trade(pnl / equity * 100)
+            equity += pnl
+            cursor = exit_row
+
+        metrics = summarize([trade.pnl for trade in trades], config.initial_capital)
+        metrics["bars"] = float(size)
+        LOGGER.debug(
+            "vectorized_backtest_complete",
+            symbol=series.symbol,
+            trades=len(trades),
+            seconds=time.perf_counter() - started,
+        )
+        return BacktestResult(metrics=metrics, trades=trades)
+
+
+def _with_overrides(params: StrategyParams, overrides: Dict[str, Any]) -> StrategyParams:
+    types = {item.name: type(getattr(params, item.name)) for item in fields(params)}
+    coerced = {
+        name: (
+            int(round(value))
+            if types[name] is int
+            else bool(value) if types[name] is bool else value
+        )
+        for name, value in overrides.items()
+    }
+    return replace(params, **coerced)
+
+
+def sweep_objective(
+    series: BarSeries, config: BacktestConfig, metric: str = "total_return"
+) -> Callable[..., float]:
+    """Return ``objective(**params) -> metric`` for optimisers.
+
+    Keyword arguments override :class:`StrategyParams` fields (floats are
+    rounded for integer fields, as Bayesian optimisers propose them). Gate and
+    ensemble output is cached per distinct indicator setting, so sweeps over
+    entry and exit parameters only pay for the array backtest.
+    """
+
+    engine_pipeline = load_pipeline_config(config.config_dir, config.symbol, config.routing_profile)
+    cache: Dict[Tuple[Any, ...], SignalFrame] = {}
+
+    def objective(**overrides: Any) -> float:
+        params = _with_overrides(config.params, overrides)
+        engine = VectorizedEngine(replace(config, params=params), pipeline=engine_pipeline)
+        key = tuple(getattr(params, name) for name in FEATURE_PARAMS)
+        gated = cache.get(key)
+        if gated is None:
+            unfiltered = replace(params, min_confidence=-np.inf)
+            gated = cache[key] = compute_signals(
+                series, unfiltered, features=bar_features(series, params)
+            )
+        signals = replace(gated, entry=gated.entry & (gated.confidence >= params.min_confidence))
+        return engine.run(series, signals).metrics[metric]
+
+    return objective
+
+
+__all__ = ["FEATURE_PARAMS", "VectorizedEngine", "sweep_objective"]
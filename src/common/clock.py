@@ -3,11 +3,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime, time, timezone
+from datetime import datetime, time, timedelta, timezone
 from typing import Dict
 
 import pytz
 
+TIMEFRAME_SECONDS: Dict[str, int] = {"M1": 60, "M5": 300, "M15": 900, "H1": 3600, "D1": 86400}
+
 
 @dataclass(slots=True)
 class SessionWindow:
@@ -46,9 +48,27 @@ class TradingClock:
         return {name: window for name, window in self._sessions.items() if window.contains(moment)}
 
 
+def to_epoch_ns(dt: datetime) -> int:
+    """Return *dt* as integer nanoseconds since the epoch (naive values are UTC)."""
+
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    delta = dt - _EPOCH
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000_000 + delta.microseconds * 1_000
+
+
+def from_epoch_ns(value: int) -> datetime:
+    """Inverse of :func:`to_epoch_ns`, returning an aware UTC datetime."""
+
+    return _EPOCH + timedelta(microseconds=value // 1_000)
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
 def _parse_time(value: str) -> time:
     hour, minute = (int(part) for part in value.split(":", maxsplit=1))
     return time(hour=hour, minute=minute, tzinfo=timezone.utc)
 
 
-__all__ = ["TradingClock", "SessionWindow"]
+__all__ = ["TIMEFRAME_SECONDS", "TradingClock", "SessionWindow", "to_epoch_ns", "from_epoch_ns"]
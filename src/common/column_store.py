@@ -0,0 +1,319 @@
+"""Columnar on-disk market history partitioned by symbol, dataset and UTC day.
+
+Layout::
+
+    <root>/<symbol>/<dataset>/schema.json
+    <root>/<symbol>/<dataset>/<YYYYMMDD>/timestamps.bin
+    <root>/<symbol>/<dataset>/<YYYYMMDD>/<column>.bin
+
+``dataset`` is a bar timeframe (``M1``, ``H1`` ...) or ``ticks``. Every column
+is a headerless fixed-width array, so reads are memory-mapped views with no
+parsing, and a time range only opens the day partitions it overlaps.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from .clock import to_epoch_ns
+from .ring_buffer import BAR_FIELDS, TICK_FIELDS
+
+if TYPE_CHECKING:
+    from src.ingest.market_feed import MarketEvent
+
+TICKS = "ticks"
+TIMESTAMPS = "timestamps"
+DAY_NS = 86_400 * 1_000_000_000
+DEFAULT_FLUSH_ROWS = 4096
+
+_EPOCH_DATE = date(1970, 1, 1)
+_NO_ROWS = np.iinfo(np.int64).min
+
+
+def _day_name(day: int) -> str:
+    return (_EPOCH_DATE + timedelta(days=day)).strftime("%Y%m%d")
+
+
+def _map(file: str, dtype: np.dtype, rows: int | None = None) -> NDArray:
+    """Map a column file (its first *rows* values, or every whole value) read-only."""
+
+    with open(file, "rb") as fh:
+        size = os.fstat(fh.fileno()).st_size
+        if size < dtype.itemsize:
+            return np.empty(0, dtype=dtype)
+        buffer = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    count = size // dtype.itemsize if rows is None else rows
+    return np.frombuffer(buffer, dtype=dtype, count=count)
+
+
+def _join(chunks: List[NDArray], dtype: np.dtype) -> NDArray:
+    if not chunks:
+        return np.empty(0, dtype=dtype)
+    if len(chunks) == 1:
+        return chunks[0]
+    return np.concatenate(chunks)
+
+
+class ColumnStore:
+    """Append-only columnar store with memory-mapped, time-range reads.
+
+    Rows within a ``(symbol, dataset)`` must arrive in time order. Each append
+    writes the value columns before ``timestamps.bin`` and readers take a
+    partition's row count from ``timestamps.bin``, so a torn write is
+    invisible to readers and truncated away by the next append.
+    """
+
+    def __init__(self, root: Path, flush_rows: int = DEFAULT_FLUSH_ROWS) -> None:
+        self._root = Path(root)
+        self._flush_rows = flush_rows
+        self._schemas: Dict[Tuple[str, str], Dict[str, np.dtype]] = {}
+        self._tails: Dict[Tuple[str, str], int] = {}
+        self._pending: Dict[Tuple[str, str], Tuple[List[int], List[Tuple[float, ...]]]] = {}
+
+    def __enter__(self) -> ColumnStore:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.flush()
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    def _dataset_dir(self, symbol: str, dataset: str) -> Path:
+        return self._root / symbol / dataset
+
+    def schema(self, symbol: str, dataset: str) -> Optional[Dict[str, np.dtype]]:
+        """Return the value columns and dtypes of a dataset, or ``None`` if it was never written."""
+
+        key = (symbol, dataset)
+        schema = self._schemas.get(key)
+        if schema is None:
+            path = self._dataset_dir(symbol, dataset) / "schema.json"
+            if not path.exists():
+                return None
+            columns = json.loads(path.read_text(encoding="utf-8"))["columns"]
+            schema = self._schemas[key] = {name: np.dtype(code) for name, code in columns.items()}
+        return schema
+
+    def has(self, symbol: str, dataset: str) -> bool:
+        return self.schema(symbol, dataset) is not None
+
+    def partitions(self, symbol: str, dataset: str) -> List[date]:
+        """Return the UTC days stored for ``(symbol, dataset)`` in order."""
+
+        names = self._partition_names(symbol, dataset)
+        return [datetime.strptime(name, "%Y%m%d").date() for name in names]
+
+    def _partition_names(
+        self, symbol: str, dataset: str, first: str | None = None, last: str | None = None
+    ) -> List[str]:
+        root = self._dataset_dir(symbol, dataset)
+        if not root.is_dir():
+            return []
+        names = sorted(name for name in os.listdir(root) if name.isdigit())
+        return [
+            name
+            for name in names
+            if (first is None or name >= first) and (last is None or name <= last)
+        ]
+
+    @staticmethod
+    def _rows(directory: str, schema: Mapping[str, np.dtype]) -> int:
+        """Complete rows in a partition: the shortest column file decides."""
+
+        rows = None
+        for name, dtype in [(TIMESTAMPS, np.dtype(np.int64)), *schema.items()]:
+            try:
+                count = os.stat(os.path.join(directory, f"{name}.bin")).st_size // dtype.itemsize
+            except FileNotFoundError:
+                return 0
+            rows = count if rows is None else min(rows, count)
+        return rows or 0
+
+    def _tail(self, symbol: str, dataset: str, schema: Mapping[str, np.dtype]) -> int:
+        """Return the last stored timestamp of a dataset, repairing a torn final append."""
+
+        key = (symbol, dataset)
+        tail = self._tails.get(key)
+        if tail is not None:
+            return tail
+        tail = _NO_ROWS
+        root = self._dataset_dir(symbol, dataset)
+        for name in reversed(self._partition_names(symbol, dataset)):
+            directory = str(root / name)
+            rows = self._rows(directory, schema)
+            for column, dtype in [(TIMESTAMPS, np.dtype(np.int64)), *schema.items()]:
+                file = os.path.join(directory, f"{column}.bin")
+                if os.path.exists(file) and os.stat(file).st_size > rows * dtype.itemsize:
+                    os.truncate(file, rows * dtype.itemsize)
+            if rows:
+                file = os.path.join(directory, f"{TIMESTAMPS}.bin")
+                stamps = _map(file, np.dtype(np.int64), rows)
+                tail = int(stamps[-1])
+                break
+        self._tails[key] = tail
+        return tail
+
+    def _ensure_schema(
+        self, symbol: str, dataset: str, columns: Mapping[str, NDArray]
+    ) -> Dict[str, np.dtype]:
+        schema = self.schema(symbol, dataset)
+        if schema is None:
+            schema = {name: values.dtype for name, values in columns.items()}
+            root = self._dataset_dir(symbol, dataset)
+            root.mkdir(parents=True, exist_ok=True)
+            document = {"columns": {name: dtype.str for name, dtype in schema.items()}}
+            # Replace rather than write in place so a crash never leaves undecodable JSON.
+            tmp = root / "schema.json.tmp"
+            with tmp.open("w", encoding="utf-8") as fh:
+                fh.write(json.dumps(document))
+                fh.flush()
+                os.fsync(fh.fileno())
+            os.replace(tmp, root / "schema.json")
+            self._schemas[(symbol, dataset)] = schema
+        elif set(schema) != set(columns):
+            raise ValueError(
+                f"{symbol}/{dataset} stores columns {sorted(schema)}, got {sorted(columns)}"
+            )
+        return schema
+
+    def append(
+        self, symbol: str, dataset: str, timestamps: ArrayLike, columns: Mapping[str, ArrayLike]
+    ) -> int:
+        """Append rows (epoch-nanosecond *timestamps* plus one array per column).
+
+        The first append fixes the dataset's columns and dtypes. Returns the
+        number of rows written.
+        """
+
+        stamps = np.ascontiguousarray(timestamps, dtype=np.int64)
+        if not stamps.size:
+            return 0
+        arrays = {name: np.asarray(values) for name, values in columns.items()}
+        for name, values in arrays.items():
+            if values.shape != stamps.shape:
+                raise ValueError(f"column {name!r} has {values.size} rows, expected {stamps.size}")
+        if stamps.size > 1 and bool(np.any(stamps[1:] < stamps[:-1])):
+            raise ValueError("timestamps must be non-decreasing")
+        schema = self._ensure_schema(symbol, dataset, arrays)
+        arrays = {
+            name: np.ascontiguousarray(arrays[name], dtype=dtype) for name, dtype in schema.items()
+        }
+
+        days = stamps // DAY_NS
+        bounds = [0, *(np.flatnonzero(days[1:] != days[:-1]) + 1).tolist(), stamps.size]
+        root = self._dataset_dir(symbol, dataset)
+        chunks = [
+            (root / _day_name(int(days[lo])), lo, hi) for lo, hi in zip(bounds[:-1], bounds[1:])
+        ]
+        if stamps[0] < self._tail(symbol, dataset, schema):
+            raise ValueError(f"rows for {symbol}/{dataset} are older than the stored data")
+        try:
+            for path, lo, hi in chunks:
+                path.mkdir(parents=True, exist_ok=True)
+                for name, values in arrays.items():
+                    with (path / f"{name}.bin").open("ab") as fh:
+                        values[lo:hi].tofile(fh)
+                with (path / f"{TIMESTAMPS}.bin").open("ab") as fh:
+                    stamps[lo:hi].tofile(fh)
+        except BaseException:
+            # Some columns may hold extra bytes; the next append re-runs the repair.
+            self._tails.pop((symbol, dataset), None)
+            raise
+        self._tails[(symbol, dataset)] = int(stamps[-1])
+        return int(stamps.size)
+
+    def record(self, event: MarketEvent) -> None:
+        """Buffer a :class:`~src.ingest.market_feed.MarketEvent` for appending.
+
+        Bar payloads (with a ``timeframe``) go to that dataset with
+        :data:`~src.common.ring_buffer.BAR_FIELDS`, price payloads to ``ticks``
+        with :data:`~src.common.ring_buffer.TICK_FIELDS`. Buffered rows are
+        written every ``flush_rows`` events per dataset and on :meth:`flush`.
+        """
+
+        payload = event.payload
+        if "timeframe" in payload:
+            dataset = str(payload["timeframe"])
+            row = tuple(float(payload.get(name, 0.0)) for name in BAR_FIELDS)
+        elif "price" in payload:
+            dataset = TICKS
+            row = tuple(float(payload.get(name, 0.0)) for name in TICK_FIELDS)
+        else:
+            return
+        key = (event.symbol, dataset)
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = ([], [])
+        pending[0].append(to_epoch_ns(event.timestamp))
+        pending[1].append(row)
+        if len(pending[0]) >= self._flush_rows:
+            self._flush_key(key)
+
+    def _flush_key(self, key: Tuple[str, str]) -> None:
+        stamps, rows = self._pending.pop(key)
+        if not stamps:
+            return
+        symbol, dataset = key
+        fields = TICK_FIELDS if dataset == TICKS else BAR_FIELDS
+        values = np.asarray(rows, dtype=np.float64)
+        columns = {name: values[:, idx] for idx, name in enumerate(fields)}
+        self.append(symbol, dataset, stamps, columns)
+
+    def flush(self) -> None:
+        """Write every buffered :meth:`record` row."""
+
+        for key in list(self._pending):
+            self._flush_key(key)
+
+    def read(
+        self,
+        symbol: str,
+        dataset: str,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        columns: Iterable[str] | None = None,
+    ) -> Dict[str, NDArray]:
+        """Return ``timestamps`` and *columns* for rows with ``start <= timestamp < end``.
+
+        Only partitions overlapping the range are opened. A range inside one
+        day returns read-only views of the memory-mapped files; longer ranges
+        are concatenated from those views.
+        """
+
+        schema = self.schema(symbol, dataset)
+        if schema is None:
+            raise FileNotFoundError(f"no {dataset} data for {symbol} in {self._root}")
+        names = list(schema) if columns is None else list(columns)
+        start_ns = None if start is None else to_epoch_ns(start)
+        end_ns = None if end is None else to_epoch_ns(end)
+        first = None if start_ns is None else _day_name(start_ns // DAY_NS)
+        last = None if end_ns is None else _day_name((end_ns - 1) // DAY_NS)
+        dtypes = {TIMESTAMPS: np.dtype(np.int64), **schema}
+        chunks: Dict[str, List[NDArray]] = {name: [] for name in (TIMESTAMPS, *names)}
+        root = str(self._dataset_dir(symbol, dataset))
+        for partition in self._partition_names(symbol, dataset, first, last):
+            directory = os.path.join(root, partition)
+            stamps = _map(os.path.join(directory, f"{TIMESTAMPS}.bin"), dtypes[TIMESTAMPS])
+            rows = stamps.size
+            lo = int(np.searchsorted(stamps, start_ns, side="left")) if partition == first else 0
+            hi = int(np.searchsorted(stamps, end_ns, side="left")) if partition == last else rows
+            if lo >= hi:
+                continue
+            chunks[TIMESTAMPS].append(stamps[lo:hi])
+            for name in names:
+                mapped = _map(os.path.join(directory, f"{name}.bin"), dtypes[name], rows)
+                chunks[name].append(mapped[lo:hi])
+        return {name: _join(parts, dtypes[name]) for name, parts in chunks.items()}
+
+
+__all__ = ["ColumnStore", "DAY_NS", "DEFAULT_FLUSH_ROWS", "TICKS", "TIMESTAMPS"]
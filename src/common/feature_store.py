@@ -2,56 +2,470 @@
 
 from __future__ import annotations
 
+import heapq
+import itertools
+import math
+import os
+import sys
+import uuid
 from dataclasses import dataclass
 from datetime import datetime
-from threading import RLock
-from typing import Any, Dict, Tuple
+from numbers import Real
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, List, Tuple
 
+import numpy as np
+from numpy.typing import NDArray
+
+from .clock import from_epoch_ns, to_epoch_ns
+from .indicators.incremental import INDICATOR_TYPES
+from .ring_buffer import RingBuffer
+from .srl import dump_msgpack, load_msgpack
 from .types import FeatureWindow
 
+SNAPSHOT_VERSION = 2
+SNAPSHOT_META = "meta.msgpack"
+
+
+class FeatureHistory:
+    """Bounded history of one numeric feature.
+
+    Values live in a :class:`RingBuffer` (int64 ns timestamps, float64 values),
+    so appends are O(1). Quantile and rank queries read a sorted copy of the
+    retained finite values that is rebuilt lazily: the first query after any
+    append pays one O(N log N) vectorised sort, and further queries until the
+    next append are O(1) or a binary search. Each history has its own lock, so
+    contention is limited to a single key. Timestamps are expected to be
+    appended in non-decreasing order.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self._lock = Lock()
+        self._buffer = RingBuffer(capacity, ("value",))
+        self._sorted: NDArray[np.float64] | None = None
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    @property
+    def nbytes(self) -> int:
+        return self._buffer.nbytes
+
+    def append(self, timestamp_ns: int, value: float) -> None:
+        with self._lock:
+            self._buffer.append(timestamp_ns, value)
+            self._sorted = None
+
+    def load(self, timestamps: NDArray[np.int64], values: NDArray[np.float64]) -> None:
+        """Replace the retained history with the given columns."""
+
+        with self._lock:
+            self._buffer.fill(timestamps, values.reshape(1, -1))
+            self._sorted = None
+
+    def _sorted_values(self) -> NDArray[np.float64]:
+        """Sorted finite retained values; caller holds the lock."""
+
+        if self._sorted is None:
+            retained = self._buffer.column("value")
+            self._sorted = np.sort(retained[np.isfinite(retained)])
+        return self._sorted
+
+    def snapshot(self) -> Tuple[NDArray[np.int64], NDArray[np.float64]]:
+        """Return consistent copies of the retained timestamps and values."""
+
+        with self._lock:
+            return self._buffer.timestamps().copy(), self._buffer.column("value").copy()
+
+    def values(self, n: int | None = None) -> NDArray[np.float64]:
+        """Return a read-only view of the last *n* values (all by default)."""
+
+        return self._buffer.column("value", n)
+
+    def timestamps(self, n: int | None = None) -> NDArray[np.int64]:
+        return self._buffer.timestamps(n)
+
+    def as_of(self, timestamp_ns: int) -> float | None:
+        """Return the last value recorded at or before *timestamp_ns*."""
+
+        with self._lock:
+            idx = int(np.searchsorted(self._buffer.timestamps(), timestamp_ns, side="right")) - 1
+            if idx < 0:
+                return None
+            return float(self._buffer.column("value")[idx])
+
+    def quantile(self, q: float) -> float | None:
+        """Return the *q* quantile (0..1) of retained values with linear interpolation."""
+
+        with self._lock:
+            ordered = self._sorted_values()
+            if not ordered.size:
+                return None
+            position = min(max(q, 0.0), 1.0) * (ordered.size - 1)
+            lower = int(position)
+            upper = min(lower + 1, ordered.size - 1)
+            fraction = position - lower
+            low, high = float(ordered[lower]), float(ordered[upper])
+            return low + (high - low) * fraction
+
+    def rank(self, value: float) -> float:
+        """Return the share of retained values at or below *value*."""
+
+        with self._lock:
+            ordered = self._sorted_values()
+            if not ordered.size:
+                return 0.0
+            return int(ordered.searchsorted(value, side="right")) / ordered.size
+
+
+def _fsync_dir(path: Path) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _mmap(path: Path) -> NDArray[Any]:
+    """Memory-map a snapshot column as a plain ndarray view."""
+
+    return np.load(path, mmap_mode="r").view(np.ndarray)
+
 
 @dataclass(slots=True)
 class FeatureEntry:
     """Internal representation of a feature stored in memory."""
 
     window: FeatureWindow
+    history: FeatureHistory | None = None
+    sequence: int = 0
+    # Set by purge_older_than before it re-reads ``window`` to decide on eviction.
+    evicted: bool = False
+
+
+@dataclass(slots=True)
+class PurgeStats:
+    """Outcome of one or more :meth:`FeatureStore.purge_older_than` calls."""
+
+    evicted: int = 0
+    bytes_freed: int = 0
+
+
+def _entry_nbytes(entry: FeatureEntry) -> int:
+    size = sys.getsizeof(entry) + sys.getsizeof(entry.window) + sys.getsizeof(entry.window.value)
+    if entry.history is not None:
+        size += entry.history.nbytes
+    return size
 
 
 class FeatureStore:
-    """Thread-safe in-memory store for computed features."""
+    """Thread-safe in-memory store for computed features.
+
+    Entries are sharded by timeframe. Shards are copy-on-write: adding or
+    removing a key publishes a new shard under the writer lock, while updates
+    to an existing key swap the entry's window in place. Readers therefore
+    never take a lock and ``latest_values`` only visits one timeframe.
+
+    With ``history_size`` greater than zero every numeric upsert is also
+    appended to a per-key :class:`FeatureHistory` holding the last
+    ``history_size`` values. ``snapshot_dir`` is the default location used by
+    :meth:`persist` and :meth:`load`.
+    """
+
+    def __init__(self, history_size: int = 0, snapshot_dir: Path | None = None) -> None:
+        self._lock = Lock()
+        self._shards: Dict[str, Dict[str, FeatureEntry]] = {}
+        self._history_size = history_size
+        self._snapshot_dir = snapshot_dir
+        self._indicators: Dict[Tuple[str, str], Any] = {}
+        # (timestamp_ns, sequence, timeframe, name); an item is stale once its
+        # key was removed or re-created with a new sequence number.
+        self._expiry: List[Tuple[int, int, str, str]] = []
+        self._sequence = itertools.count(1)
+        self._purge_totals = PurgeStats()
 
-    def __init__(self) -> None:
-        self._lock = RLock()
-        self._data: Dict[Tuple[str, str], FeatureEntry] = {}
+    def _entry(self, name: str, timeframe: str) -> FeatureEntry | None:
+        shard = self._shards.get(timeframe)
+        return shard.get(name) if shard is not None else None
 
     def upsert(self, feature: FeatureWindow) -> None:
-        with self._lock:
-            self._data[(feature.name, feature.timeframe)] = FeatureEntry(window=feature)
+        entry = self._entry(feature.name, feature.timeframe)
+        if entry is None:
+            with self._lock:
+                entry = self._entry(feature.name, feature.timeframe)
+                if entry is None:
+                    history = FeatureHistory(self._history_size) if self._history_size > 0 else None
+                    entry = FeatureEntry(
+                        window=feature, history=history, sequence=next(self._sequence)
+                    )
+                    self._insert(entry)
+        entry.window = feature
+        # purge_older_than marks an entry before re-reading its window, so either
+        # it sees this update and keeps the key, or this check sees the mark.
+        if entry.evicted:
+            with self._lock:
+                if self._entry(feature.name, feature.timeframe) is None:
+                    entry.evicted = False
+                    self._insert(entry)
+        if (
+            entry.history is not None
+            and isinstance(feature.value, Real)
+            and not isinstance(feature.value, bool)
+        ):
+            entry.history.append(to_epoch_ns(feature.timestamp), float(feature.value))
+
+    def _insert(self, entry: FeatureEntry) -> None:
+        """Publish *entry* in a copied shard and queue it for expiry; caller holds the lock."""
+
+        window = entry.window
+        shard = dict(self._shards.get(window.timeframe, {}))
+        shard[window.name] = entry
+        self._shards = {**self._shards, window.timeframe: shard}
+        heapq.heappush(
+            self._expiry,
+            (to_epoch_ns(window.timestamp), entry.sequence, window.timeframe, window.name),
+        )
 
     def get(self, name: str, timeframe: str) -> FeatureWindow | None:
-        with self._lock:
-            entry = self._data.get((name, timeframe))
-            return entry.window if entry else None
+        entry = self._entry(name, timeframe)
+        return entry.window if entry else None
 
     def latest_values(self, timeframe: str) -> Dict[str, Any]:
+        shard = self._shards.get(timeframe, {})
+        return {name: entry.window.value for name, entry in shard.items()}
+
+    def timeframes(self) -> List[str]:
+        return list(self._shards)
+
+    def history(self, name: str, timeframe: str) -> FeatureHistory | None:
+        """Return the retained history for a feature, if history mode is enabled."""
+
+        entry = self._entry(name, timeframe)
+        return entry.history if entry else None
+
+    def value_as_of(self, name: str, timeframe: str, timestamp: datetime) -> float | None:
+        """Return the feature value in effect at *timestamp*."""
+
+        history = self.history(name, timeframe)
+        return history.as_of(to_epoch_ns(timestamp)) if history is not None else None
+
+    def quantile(self, name: str, timeframe: str, q: float) -> float | None:
+        """Return the *q* quantile of a feature's retained history."""
+
+        history = self.history(name, timeframe)
+        return history.quantile(q) if history is not None else None
+
+    def purge_older_than(self, timestamp: datetime) -> PurgeStats:
+        """Drop features last updated before *timestamp* and return what was freed.
+
+        Keys sit in a min-heap ordered by the timestamp they had when pushed.
+        Only heap items older than the cutoff are visited: keys that were
+        updated since are pushed back with their current timestamp, the rest
+        are evicted.
+        """
+
+        cutoff = to_epoch_ns(timestamp)
+        stats = PurgeStats()
         with self._lock:
-            return {
-                name: entry.window.value
-                for (name, tf), entry in self._data.items()
-                if tf == timeframe
-            }
+            expired: Dict[str, List[str]] = {}
+            while self._expiry and self._expiry[0][0] < cutoff:
+                _, sequence, timeframe, name = heapq.heappop(self._expiry)
+                entry = self._entry(name, timeframe)
+                if entry is None or entry.sequence != sequence:
+                    continue
+                entry.evicted = True
+                current = to_epoch_ns(entry.window.timestamp)
+                if current >= cutoff:
+                    entry.evicted = False
+                    heapq.heappush(self._expiry, (current, sequence, timeframe, name))
+                    continue
+                expired.setdefault(timeframe, []).append(name)
+                stats.evicted += 1
+                stats.bytes_freed += _entry_nbytes(entry)
+            if expired:
+                shards = dict(self._shards)
+                for timeframe, names in expired.items():
+                    shard = dict(shards[timeframe])
+                    for name in names:
+                        del shard[name]
+                    if shard:
+                        shards[timeframe] = shard
+                    else:
+                        del shards[timeframe]
+                self._shards = shards
+            self._purge_totals.evicted += stats.evicted
+            self._purge_totals.bytes_freed += stats.bytes_freed
+        return stats
+
+    @property
+    def purge_totals(self) -> PurgeStats:
+        """Cumulative purge statistics since the store was created."""
+
+        return PurgeStats(
+            evicted=self._purge_totals.evicted, bytes_freed=self._purge_totals.bytes_freed
+        )
+
+    def register_indicator(self, name: str, timeframe: str, indicator: Any) -> None:
+        """Attach an incremental indicator whose state is included in snapshots.
 
-    def purge_older_than(self, timestamp: datetime) -> None:
+        Only the types in :data:`~src.common.indicators.incremental.INDICATOR_TYPES`
+        can be restored by :meth:`load`, so anything else is rejected here.
+        """
+
+        if INDICATOR_TYPES.get(type(indicator).__name__) is not type(indicator):
+            raise TypeError(
+                f"{type(indicator).__name__} is not a snapshot-capable incremental indicator"
+            )
         with self._lock:
-            keys_to_remove = [key for key, entry in self._data.items() if entry.window.timestamp < timestamp]
-            for key in keys_to_remove:
-                self._data.pop(key, None)
+            self._indicators = {**self._indicators, (name, timeframe): indicator}
+
+    def indicator(self, name: str, timeframe: str) -> Any | None:
+        return self._indicators.get((name, timeframe))
+
+    def persist(self, path: Path | None = None) -> Path:
+        """Write a snapshot of features, histories and indicator state to *path*.
+
+        The snapshot is a directory of ``.npy`` columns (latest values and the
+        concatenated histories) plus a msgpack metadata file describing keys,
+        offsets and indicator state. Each persist writes its columns under a
+        fresh generation suffix and then atomically replaces the metadata,
+        which names that generation, so a crash part-way leaves the previous
+        snapshot intact. Columns of older generations are removed afterwards.
+        """
 
-    def persist(self) -> None:
-        """TODO: Persist the feature store to disk or external database."""
+        target = self._snapshot_path(path)
+        generation = uuid.uuid4().hex
+        target.mkdir(parents=True, exist_ok=True)
+        shards = self._shards
+        features: List[Dict[str, Any]] = []
+        latest_ts: List[int] = []
+        latest_values: List[float] = []
+        history_ts: List[NDArray[np.int64]] = []
+        history_values: List[NDArray[np.float64]] = []
+        for timeframe, shard in shards.items():
+            for name, entry in shard.items():
+                window = entry.window
+                numeric = isinstance(window.value, Real) and not isinstance(window.value, bool)
+                record: Dict[str, Any] = {
+                    "name": name,
+                    "timeframe": timeframe,
+                    "naive": window.timestamp.tzinfo is None,
+                    "numeric": numeric,
+                    "history_rows": 0,
+                }
+                if not numeric:
+                    # msgpack only packs builtins: numpy scalars (np.bool_ etc.) become
+                    # plain Python values.
+                    value = window.value
+                    record["value"] = value.item() if isinstance(value, np.generic) else value
+                if entry.history is not None:
+                    rows_ts, rows_values = entry.history.snapshot()
+                    history_ts.append(rows_ts)
+                    history_values.append(rows_values)
+                    record["history_rows"] = len(rows_ts)
+                features.append(record)
+                latest_ts.append(to_epoch_ns(window.timestamp))
+                latest_values.append(float(window.value) if numeric else math.nan)
+        columns = {
+            "timestamps": np.array(latest_ts, dtype=np.int64),
+            "values": np.array(latest_values, dtype=np.float64),
+            "history_timestamps": (
+                np.concatenate(history_ts) if history_ts else np.zeros(0, dtype=np.int64)
+            ),
+            "history_values": np.concatenate(history_values) if history_values else np.zeros(0),
+        }
+        meta = {
+            "version": SNAPSHOT_VERSION,
+            "generation": generation,
+            "history_size": self._history_size,
+            "features": features,
+            "indicators": [
+                {
+                    "name": name,
+                    "timeframe": timeframe,
+                    "type": type(indicator).__name__,
+                    "state": indicator.to_state(),
+                }
+                for (name, timeframe), indicator in self._indicators.items()
+            ],
+        }
+        written = [target / f"{column}.{generation}.npy" for column in columns]
+        try:
+            for file, array in zip(written, columns.values()):
+                with file.open("wb") as fh:
+                    np.save(fh, array)
+                    fh.flush()
+                    os.fsync(fh.fileno())
+            dump_msgpack(meta, target / SNAPSHOT_META)
+            # Make the renamed metadata durable before the columns it replaces go away.
+            _fsync_dir(target)
+        except BaseException:
+            for file in written:
+                file.unlink(missing_ok=True)
+            raise
+        for stale in target.glob("*.npy"):
+            if not stale.name.endswith(f".{generation}.npy"):
+                stale.unlink(missing_ok=True)
+        return target
+
+    def load(self, path: Path | None = None) -> None:
+        """Replace the store contents with the snapshot at *path* for warm start.
+
+        Columns are read through read-only memory maps: the latest values are
+        converted once, and each key's history rows are copied straight from
+        the map into its ring buffer without an intermediate array.
+        """
+
+        source = self._snapshot_path(path)
+        meta = load_msgpack(source / SNAPSHOT_META)
+        if not meta:
+            return
+        if meta.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported feature snapshot version: {meta.get('version')}")
+        generation = meta["generation"]
+        timestamps = _mmap(source / f"timestamps.{generation}.npy").tolist()
+        values = _mmap(source / f"values.{generation}.npy").tolist()
+        history_ts = _mmap(source / f"history_timestamps.{generation}.npy")
+        history_values = _mmap(source / f"history_values.{generation}.npy")
+        shards: Dict[str, Dict[str, FeatureEntry]] = {}
+        expiry: List[Tuple[int, int, str, str]] = []
+        offset = 0
+        for idx, record in enumerate(meta["features"]):
+            moment = from_epoch_ns(timestamps[idx])
+            if record["naive"]:
+                moment = moment.replace(tzinfo=None)
+            value = values[idx] if record["numeric"] else record.get("value")
+            window = FeatureWindow(
+                name=record["name"], timeframe=record["timeframe"], timestamp=moment, value=value
+            )
+            history = FeatureHistory(self._history_size) if self._history_size > 0 else None
+            rows = int(record["history_rows"])
+            if history is not None and rows:
+                history.load(
+                    history_ts[offset : offset + rows], history_values[offset : offset + rows]
+                )
+            offset += rows
+            entry = FeatureEntry(window=window, history=history, sequence=next(self._sequence))
+            shards.setdefault(record["timeframe"], {})[record["name"]] = entry
+            expiry.append((timestamps[idx], entry.sequence, record["timeframe"], record["name"]))
+        indicators = {
+            (item["name"], item["timeframe"]): INDICATOR_TYPES[item["type"]].from_state(
+                item["state"]
+            )
+            for item in meta["indicators"]
+        }
+        heapq.heapify(expiry)
+        with self._lock:
+            self._shards = shards
+            self._expiry = expiry
+            self._indicators = indicators
 
-    def load(self) -> None:
-        """TODO: Reload persisted features for warm start."""
+    def _snapshot_path(self, path: Path | None) -> Path:
+        target = path or self._snapshot_dir
+        if target is None:
+            raise ValueError("No snapshot path configured for FeatureStore")
+        return target
 
 
-__all__ = ["FeatureStore", "FeatureEntry"]
+__all__ = ["FeatureStore", "FeatureEntry", "FeatureHistory", "PurgeStats", "SNAPSHOT_VERSION"]
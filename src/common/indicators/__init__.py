@@ -4,6 +4,14 @@ from __future__ import annotations
 
 from typing import Iterable, List, Tuple
 
+from .incremental import (
+    IncrementalADX,
+    IncrementalATR,
+    IncrementalEMA,
+    IncrementalMACD,
+    IncrementalRSI,
+)
+
 
 def _to_list(series: Iterable[float]) -> List[float]:
     return [float(value) for value in series]
@@ -89,13 +97,21 @@ def macd(series: Iterable[float], fast: int = 12, slow: int = 26, signal: int =
     values = _to_list(series)
     if not values:
         return 0.0, 0.0, 0.0
-    macd_values = []
-    for i in range(len(values)):
-        macd_values.append(ema(values[: i + 1], fast) - ema(values[: i + 1], slow))
-    macd_line = macd_values[-1]
-    signal_line = ema(macd_values, signal)
-    hist = macd_line - signal_line
-    return macd_line, signal_line, hist
-
-
-__all__ = ["ema", "rsi", "atr", "adx", "macd"]
+    tracker = IncrementalMACD(fast=fast, slow=slow, signal=signal)
+    for value in values:
+        tracker.update(value)
+    return tracker.value
+
+
+__all__ = [
+    "ema",
+    "rsi",
+    "atr",
+    "adx",
+    "macd",
+    "IncrementalEMA",
+    "IncrementalRSI",
+    "IncrementalATR",
+    "IncrementalADX",
+    "IncrementalMACD",
+]
@@ -0,0 +1,178 @@
+"""Vectorised indicator series computed with NumPy.
+
+Functions here accept whole price arrays and return full-length outputs
+aligned with the input, so element ``i`` equals the scalar indicator
+evaluated on ``series[: i + 1]``.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from numpy.typing import ArrayLike, NDArray
+
+FloatArray = NDArray[np.float64]
+
+# Largest exponent used when rescaling a block of the EMA recursion; keeps
+# intermediate values well inside float64 range for any reasonable input.
+_MAX_EXPONENT = 300.0
+
+# Rows compared per step in rolling rank computations to bound temporary memory.
+_RANK_CHUNK = 65536
+
+
+def _as_array(values: ArrayLike) -> FloatArray:
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+
+def _rolling_sum(values: FloatArray, window: int) -> FloatArray:
+    """Sum of each full trailing window; output has ``len(values) - window + 1`` rows."""
+
+    if values.size < window:
+        return np.empty(0, dtype=np.float64)
+    return sliding_window_view(values, window).sum(axis=1)
+
+
+def _true_range(high: FloatArray, low: FloatArray, close: FloatArray) -> FloatArray:
+    prev_close = close[:-1]
+    return np.maximum.reduce(
+        [high[1:] - low[1:], np.abs(high[1:] - prev_close), np.abs(low[1:] - prev_close)]
+    )
+
+
+def _ewm(values: FloatArray, alpha: float) -> FloatArray:
+    """Return ``y[i] = alpha * x[i] + (1 - alpha) * y[i - 1]`` seeded with ``x[0]``.
+
+    The recursion is evaluated block-wise: inside a block the closed form is a
+    scaled cumulative sum, and the last value of each block seeds the next.
+    """
+
+    out = np.empty_like(values)
+    size = values.size
+    if size == 0:
+        return out
+    out[0] = values[0]
+    decay = 1.0 - alpha
+    if decay <= 0.0:
+        out[1:] = values[1:]
+        return out
+    block = max(1, min(size, int(_MAX_EXPONENT / -math.log(decay))))
+    powers = decay ** np.arange(block + 1, dtype=np.float64)
+    start = 1
+    while start < size:
+        stop = min(start + block, size)
+        length = stop - start
+        scaled = np.cumsum(values[start:stop] / powers[:length])
+        out[start:stop] = powers[1 : length + 1] * out[start - 1] + alpha * powers[:length] * scaled
+        start = stop
+    return out
+
+
+def ema(series: ArrayLike, period: int) -> FloatArray:
+    """Exponential moving average for every prefix of *series*."""
+
+    return _ewm(_as_array(series), 2 / (period + 1))
+
+
+def macd(
+    series: ArrayLike, fast: int = 12, slow: int = 26, signal: int = 9
+) -> Tuple[FloatArray, FloatArray, FloatArray]:
+    """Return MACD line, signal line and histogram arrays in a single pass."""
+
+    values = _as_array(series)
+    macd_line = ema(values, fast) - ema(values, slow)
+    signal_line = _ewm(macd_line, 2 / (signal + 1))
+    return macd_line, signal_line, macd_line - signal_line
+
+
+def rsi(series: ArrayLike, period: int = 14) -> FloatArray:
+    """Relative strength index averaged over the last ``period`` changes."""
+
+    values = _as_array(series)
+    out = np.full(values.size, 50.0)
+    if values.size <= period:
+        return out
+    change = np.diff(values)
+    avg_gain = _rolling_sum(np.where(change > 0, change, 0.0), period) / period
+    avg_loss = _rolling_sum(np.where(change > 0, 0.0, -change), period) / period
+    with np.errstate(divide="ignore", invalid="ignore"):
+        value = 100 - (100 / (1 + avg_gain / avg_loss))
+    out[period:] = np.where(avg_loss == 0, 100.0, value)
+    return out
+
+
+def atr(high: ArrayLike, low: ArrayLike, close: ArrayLike, period: int = 14) -> FloatArray:
+    """Average true range; shorter histories average every available range."""
+
+    highs, lows, closes = _as_array(high), _as_array(low), _as_array(close)
+    if not highs.size == lows.size == closes.size:
+        raise ValueError("high, low and close must have the same length")
+    out = np.zeros(highs.size)
+    if highs.size < 2:
+        return out
+    trs = _true_range(highs, lows, closes)
+    warmup = min(period - 1, trs.size)
+    out[1 : warmup + 1] = np.cumsum(trs[:warmup]) / np.arange(1, warmup + 1)
+    out[period:] = _rolling_sum(trs, period) / period
+    return out
+
+
+def adx(high: ArrayLike, low: ArrayLike, close: ArrayLike, period: int = 14) -> FloatArray:
+    """Directional index computed from the last ``period`` bars."""
+
+    highs, lows, closes = _as_array(high), _as_array(low), _as_array(close)
+    if not highs.size == lows.size == closes.size:
+        raise ValueError("high, low and close must have the same length")
+    out = np.zeros(highs.size)
+    if highs.size <= period:
+        return out
+    up_move = np.diff(highs)
+    down_move = -np.diff(lows)
+    dm_plus = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
+    dm_minus = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
+    tr_avg = _rolling_sum(_true_range(highs, lows, closes), period) / period
+    with np.errstate(divide="ignore", invalid="ignore"):
+        di_plus = (_rolling_sum(dm_plus, period) / period) / tr_avg * 100
+        di_minus = (_rolling_sum(dm_minus, period) / period) / tr_avg * 100
+        dx = np.abs(di_plus - di_minus) / (di_plus + di_minus) * 100
+    valid = (tr_avg != 0) & (di_plus + di_minus != 0)
+    out[period:] = np.where(valid, dx, 0.0)
+    return out
+
+
+def relative_volume(volume_series: ArrayLike, lookback: int = 60) -> FloatArray:
+    """Share of the trailing ``lookback`` volumes at or below the latest one."""
+
+    volumes = _as_array(volume_series)
+    out = np.zeros(volumes.size)
+    if volumes.size == 0:
+        return out
+    # +inf padding never ranks at or below the latest volume, so warm-up rows
+    # share the chunked window path and only count the volumes seen so far.
+    padded = np.concatenate((np.full(lookback - 1, np.inf), volumes))
+    windows = sliding_window_view(padded, lookback)
+    seen = np.minimum(np.arange(1, volumes.size + 1), lookback)
+    for start in range(0, windows.shape[0], _RANK_CHUNK):
+        chunk = windows[start : start + _RANK_CHUNK]
+        stop = start + chunk.shape[0]
+        out[start:stop] = (chunk <= chunk[:, -1:]).sum(axis=1) / seen[start:stop]
+    return out
+
+
+def realized_volatility(return_series: ArrayLike) -> FloatArray:
+    """Population standard deviation of every prefix of *return_series*."""
+
+    values = _as_array(return_series)
+    if values.size == 0:
+        return np.zeros(0)
+    shifted = values - values.mean()
+    counts = np.arange(1, values.size + 1)
+    mean = np.cumsum(shifted) / counts
+    variance = np.cumsum(shifted * shifted) / counts - mean * mean
+    return np.sqrt(np.maximum(variance, 0.0))
+
+
+__all__ = ["ema", "macd", "rsi", "atr", "adx", "relative_volume", "realized_volatility"]
@@ -0,0 +1,274 @@
+"""Streaming counterparts of the scalar indicators.
+
+Each class consumes one bar at a time and keeps only the state needed to
+reproduce the value the matching function in :mod:`src.common.indicators`
+would return for the full history seen so far.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Deque, Dict, Type
+
+
+class IncrementalEMA:
+    """Exponential moving average seeded with the first observed value."""
+
+    __slots__ = ("period", "_k", "_value", "_seeded")
+
+    def __init__(self, period: int) -> None:
+        self.period = period
+        self._k = 2 / (period + 1)
+        self._value = 0.0
+        self._seeded = False
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def update(self, value: float) -> float:
+        value = float(value)
+        if not self._seeded:
+            self._value = value
+            self._seeded = True
+        else:
+            self._value = value * self._k + self._value * (1 - self._k)
+        return self._value
+
+    def to_state(self) -> Dict[str, Any]:
+        return {"period": self.period, "value": self._value, "seeded": self._seeded}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> IncrementalEMA:
+        indicator = cls(int(state["period"]))
+        indicator._value = float(state["value"])
+        indicator._seeded = bool(state["seeded"])
+        return indicator
+
+
+class IncrementalRSI:
+    """Relative strength index over the last ``period`` price changes."""
+
+    __slots__ = ("period", "_prev", "_count", "_gains", "_losses", "_value")
+
+    def __init__(self, period: int = 14) -> None:
+        self.period = period
+        self._prev: float | None = None
+        self._count = 0
+        self._gains: Deque[float] = deque(maxlen=period)
+        self._losses: Deque[float] = deque(maxlen=period)
+        self._value = 50.0
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def update(self, value: float) -> float:
+        value = float(value)
+        if self._prev is not None:
+            change = value - self._prev
+            if change > 0:
+                self._gains.append(change)
+                self._losses.append(0.0)
+            else:
+                self._gains.append(0.0)
+                self._losses.append(-change)
+        self._prev = value
+        self._count += 1
+        if self._count <= self.period:
+            self._value = 50.0
+            return self._value
+        avg_gain = sum(self._gains) / self.period
+        avg_loss = sum(self._losses) / self.period
+        if avg_loss == 0:
+            self._value = 100.0
+        else:
+            self._value = 100 - (100 / (1 + avg_gain / avg_loss))
+        return self._value
+
+    def to_state(self) -> Dict[str, Any]:
+        return {
+            "period": self.period,
+            "prev": self._prev,
+            "count": self._count,
+            "gains": list(self._gains),
+            "losses": list(self._losses),
+            "value": self._value,
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> IncrementalRSI:
+        indicator = cls(int(state["period"]))
+        indicator._prev = state["prev"]
+        indicator._count = int(state["count"])
+        indicator._gains.extend(state["gains"])
+        indicator._losses.extend(state["losses"])
+        indicator._value = float(state["value"])
+        return indicator
+
+
+class IncrementalATR:
+    """Average true range over the last ``period`` true ranges."""
+
+    __slots__ = ("period", "_prev_close", "_trs", "_value")
+
+    def __init__(self, period: int = 14) -> None:
+        self.period = period
+        self._prev_close: float | None = None
+        self._trs: Deque[float] = deque(maxlen=period)
+        self._value = 0.0
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def update(self, high: float, low: float, close: float) -> float:
+        high, low, close = float(high), float(low), float(close)
+        if self._prev_close is not None:
+            prev = self._prev_close
+            self._trs.append(max(high - low, abs(high - prev), abs(low - prev)))
+            if len(self._trs) < self.period:
+                self._value = sum(self._trs) / max(len(self._trs), 1)
+            else:
+                self._value = sum(self._trs) / self.period
+        self._prev_close = close
+        return self._value
+
+    def to_state(self) -> Dict[str, Any]:
+        return {
+            "period": self.period,
+            "prev_close": self._prev_close,
+            "trs": list(self._trs),
+            "value": self._value,
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> IncrementalATR:
+        indicator = cls(int(state["period"]))
+        indicator._prev_close = state["prev_close"]
+        indicator._trs.extend(state["trs"])
+        indicator._value = float(state["value"])
+        return indicator
+
+
+class IncrementalADX:
+    """Directional index over the last ``period`` bars."""
+
+    __slots__ = ("period", "_prev", "_count", "_dm_plus", "_dm_minus", "_trs", "_value")
+
+    def __init__(self, period: int = 14) -> None:
+        self.period = period
+        self._prev: tuple[float, float, float] | None = None
+        self._count = 0
+        self._dm_plus: Deque[float] = deque(maxlen=period)
+        self._dm_minus: Deque[float] = deque(maxlen=period)
+        self._trs: Deque[float] = deque(maxlen=period)
+        self._value = 0.0
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def update(self, high: float, low: float, close: float) -> float:
+        high, low, close = float(high), float(low), float(close)
+        if self._prev is not None:
+            prev_high, prev_low, prev_close = self._prev
+            up_move = high - prev_high
+            down_move = prev_low - low
+            self._dm_plus.append(up_move if up_move > down_move and up_move > 0 else 0.0)
+            self._dm_minus.append(down_move if down_move > up_move and down_move > 0 else 0.0)
+            self._trs.append(max(high - low, abs(high - prev_close), abs(low - prev_close)))
+        self._prev = (high, low, close)
+        self._count += 1
+        self._value = self._compute()
+        return self._value
+
+    def _compute(self) -> float:
+        if self._count <= self.period:
+            return 0.0
+        tr_avg = sum(self._trs) / self.period
+        if tr_avg == 0:
+            return 0.0
+        di_plus = (sum(self._dm_plus) / self.period) / tr_avg * 100
+        di_minus = (sum(self._dm_minus) / self.period) / tr_avg * 100
+        if di_plus + di_minus == 0:
+            return 0.0
+        return abs(di_plus - di_minus) / (di_plus + di_minus) * 100
+
+    def to_state(self) -> Dict[str, Any]:
+        return {
+            "period": self.period,
+            "prev": list(self._prev) if self._prev is not None else None,
+            "count": self._count,
+            "dm_plus": list(self._dm_plus),
+            "dm_minus": list(self._dm_minus),
+            "trs": list(self._trs),
+            "value": self._value,
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> IncrementalADX:
+        indicator = cls(int(state["period"]))
+        prev = state["prev"]
+        indicator._prev = (
+            (float(prev[0]), float(prev[1]), float(prev[2])) if prev is not None else None
+        )
+        indicator._count = int(state["count"])
+        indicator._dm_plus.extend(state["dm_plus"])
+        indicator._dm_minus.extend(state["dm_minus"])
+        indicator._trs.extend(state["trs"])
+        indicator._value = float(state["value"])
+        return indicator
+
+
+class IncrementalMACD:
+    """MACD line, signal line and histogram updated one price at a time."""
+
+    __slots__ = ("_fast", "_slow", "_signal")
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9) -> None:
+        self._fast = IncrementalEMA(fast)
+        self._slow = IncrementalEMA(slow)
+        self._signal = IncrementalEMA(signal)
+
+    @property
+    def value(self) -> tuple[float, float, float]:
+        macd_line = self._fast.value - self._slow.value
+        signal_line = self._signal.value
+        return macd_line, signal_line, macd_line - signal_line
+
+    def update(self, value: float) -> tuple[float, float, float]:
+        macd_line = self._fast.update(value) - self._slow.update(value)
+        signal_line = self._signal.update(macd_line)
+        return macd_line, signal_line, macd_line - signal_line
+
+    def to_state(self) -> Dict[str, Any]:
+        return {
+            "fast": self._fast.to_state(),
+            "slow": self._slow.to_state(),
+            "signal": self._signal.to_state(),
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> IncrementalMACD:
+        indicator = cls()
+        indicator._fast = IncrementalEMA.from_state(state["fast"])
+        indicator._slow = IncrementalEMA.from_state(state["slow"])
+        indicator._signal = IncrementalEMA.from_state(state["signal"])
+        return indicator
+
+
+INDICATOR_TYPES: Dict[str, Type[Any]] = {
+    cls.__name__: cls
+    for cls in (IncrementalEMA, IncrementalRSI, IncrementalATR, IncrementalADX, IncrementalMACD)
+}
+
+
+__all__ = [
+    "IncrementalEMA",
+    "IncrementalRSI",
+    "IncrementalATR",
+    "IncrementalADX",
+    "IncrementalMACD",
+    "INDICATOR_TYPES",
+]
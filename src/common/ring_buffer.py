@@ -0,0 +1,204 @@
+"""Preallocated NumPy ring buffers for recent bar and tick history."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, Sequence, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .clock import to_epoch_ns
+
+if TYPE_CHECKING:
+    from src.ingest.market_feed import MarketEvent
+
+BAR_FIELDS: Tuple[str, ...] = ("open", "high", "low", "close", "volume", "ticks")
+TICK_FIELDS: Tuple[str, ...] = ("price", "size")
+
+DEFAULT_BAR_CAPACITY = 2048
+DEFAULT_TICK_CAPACITY = 65536
+
+
+class RingBuffer:
+    """Fixed-capacity columnar buffer of timestamped float rows.
+
+    Every row is written twice, ``capacity`` slots apart, so the most recent
+    ``n`` rows of any column always form one contiguous slice. Reads are
+    read-only views into the buffer and never copy.
+    """
+
+    def __init__(self, capacity: int, fields: Sequence[str]) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self._capacity = capacity
+        self._index = {name: idx for idx, name in enumerate(fields)}
+        self._values = np.zeros((len(self._index), 2 * capacity), dtype=np.float64)
+        self._timestamps = np.zeros(2 * capacity, dtype=np.int64)
+        self._head = 0
+        self._size = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        return tuple(self._index)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self._values.nbytes + self._timestamps.nbytes)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, timestamp_ns: int, *values: float) -> None:
+        """Append one row; *values* follow the order of :attr:`fields`."""
+
+        if len(values) != self._values.shape[0]:
+            raise ValueError(f"expected {self._values.shape[0]} values, got {len(values)}")
+        head = self._head
+        mirror = head + self._capacity
+        self._timestamps[head] = self._timestamps[mirror] = timestamp_ns
+        self._values[:, head] = values
+        self._values[:, mirror] = values
+        self._head = head + 1 if head + 1 < self._capacity else 0
+        if self._size < self._capacity:
+            self._size += 1
+
+    def fill(self, timestamps: NDArray[np.int64], values: NDArray[np.float64]) -> None:
+        """Replace the contents with *timestamps* and a ``(fields, rows)`` value matrix.
+
+        Only the last ``capacity`` rows are kept.
+        """
+
+        rows = min(len(timestamps), self._capacity)
+        cap = self._capacity
+        self._timestamps[:rows] = self._timestamps[cap : cap + rows] = timestamps[
+            len(timestamps) - rows :
+        ]
+        self._values[:, :rows] = self._values[:, cap : cap + rows] = values[
+            :, values.shape[1] - rows :
+        ]
+        self._head = rows % cap
+        self._size = rows
+
+    def _window(self, n: int | None) -> slice:
+        count = self._size if n is None else max(0, min(n, self._size))
+        end = self._head + self._capacity
+        return slice(end - count, end)
+
+    def column(self, name: str, n: int | None = None) -> NDArray[np.float64]:
+        """Return the last *n* values of *name* (all stored rows by default)."""
+
+        view = self._values[self._index[name], self._window(n)]
+        view.flags.writeable = False
+        return view
+
+    def timestamps(self, n: int | None = None) -> NDArray[np.int64]:
+        """Return the last *n* timestamps in nanoseconds."""
+
+        view = self._timestamps[self._window(n)]
+        view.flags.writeable = False
+        return view
+
+    def last(self, name: str) -> float:
+        if not self._size:
+            raise IndexError("ring buffer is empty")
+        return float(self._values[self._index[name], self._head + self._capacity - 1])
+
+    def clear(self) -> None:
+        self._head = 0
+        self._size = 0
+
+
+class HistoryStore:
+    """Bounded per-symbol bar (per timeframe) and tick history."""
+
+    def __init__(
+        self,
+        bar_capacity: Dict[str, int] | None = None,
+        tick_capacity: int = DEFAULT_TICK_CAPACITY,
+    ) -> None:
+        self._bar_capacity = bar_capacity or {}
+        self._tick_capacity = tick_capacity
+        self._bars: Dict[Tuple[str, str], RingBuffer] = {}
+        self._ticks: Dict[str, RingBuffer] = {}
+
+    def bars(self, symbol: str, timeframe: str) -> RingBuffer:
+        """Return the bar buffer for ``(symbol, timeframe)``, creating it on first use."""
+
+        key = (symbol, timeframe)
+        buffer = self._bars.get(key)
+        if buffer is None:
+            capacity = self._bar_capacity.get(timeframe, DEFAULT_BAR_CAPACITY)
+            buffer = self._bars[key] = RingBuffer(capacity, BAR_FIELDS)
+        return buffer
+
+    def ticks(self, symbol: str) -> RingBuffer:
+        """Return the tick buffer for *symbol*, creating it on first use."""
+
+        buffer = self._ticks.get(symbol)
+        if buffer is None:
+            buffer = self._ticks[symbol] = RingBuffer(self._tick_capacity, TICK_FIELDS)
+        return buffer
+
+    def append_bar(
+        self,
+        symbol: str,
+        timeframe: str,
+        timestamp_ns: int,
+        open_: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float = 0.0,
+        ticks: int = 0,
+    ) -> None:
+        self.bars(symbol, timeframe).append(timestamp_ns, open_, high, low, close, volume, ticks)
+
+    def append_tick(self, symbol: str, timestamp_ns: int, price: float, size: float = 0.0) -> None:
+        self.ticks(symbol).append(timestamp_ns, price, size)
+
+    def record(self, event: MarketEvent) -> None:
+        """Store a :class:`~src.ingest.market_feed.MarketEvent`.
+
+        Payloads carrying a ``timeframe`` are treated as completed bars, payloads
+        with a ``price`` as ticks; anything else is ignored.
+        """
+
+        payload = event.payload
+        timestamp_ns = to_epoch_ns(event.timestamp)
+        if "timeframe" in payload:
+            self.append_bar(
+                event.symbol,
+                str(payload["timeframe"]),
+                timestamp_ns,
+                float(payload["open"]),
+                float(payload["high"]),
+                float(payload["low"]),
+                float(payload["close"]),
+                float(payload.get("volume", 0.0)),
+                int(payload.get("ticks", 0)),
+            )
+        elif "price" in payload:
+            self.append_tick(
+                event.symbol, timestamp_ns, float(payload["price"]), float(payload.get("size", 0.0))
+            )
+
+    @property
+    def nbytes(self) -> int:
+        """Total preallocated memory across all buffers."""
+
+        buffers = list(self._bars.values()) + list(self._ticks.values())
+        return sum(buffer.nbytes for buffer in buffers)
+
+
+__all__ = [
+    "RingBuffer",
+    "HistoryStore",
+    "BAR_FIELDS",
+    "TICK_FIELDS",
+    "DEFAULT_BAR_CAPACITY",
+    "DEFAULT_TICK_CAPACITY",
+]
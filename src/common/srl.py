@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import json
+import os
 from pathlib import Path
 from typing import Any, Dict
 
@@ -24,9 +25,19 @@ def load_json(path: Path) -> Dict[str, Any]:
 
 
 def dump_msgpack(data: Dict[str, Any], path: Path) -> None:
-    """Serialize *data* using msgpack."""
-
-    path.write_bytes(msgpack.packb(data, use_bin_type=True))
+    """Serialize *data* using msgpack.
+
+    The bytes go to a temporary sibling that is fsynced and renamed over
+    *path*, so readers never see a partially written file.
+    """
+
+    payload = msgpack.packb(data, use_bin_type=True)
+    tmp = path.with_name(f"{path.name}.tmp")
+    with tmp.open("wb") as fh:
+        fh.write(payload)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, path)
 
 
 def load_msgpack(path: Path) -> Dict[str, Any]:
@@ -3,10 +3,23 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, Iterable
+from typing import Dict, Iterable, List, MutableSequence, Tuple
 
 from .types import FeatureWindow
 
+COMPONENTS: Tuple[str, ...] = ("trend", "momentum", "volume", "orderflow")
+TREND, MOMENTUM, VOLUME, ORDERFLOW = range(len(COMPONENTS))
+FEATURE_SLOTS: Dict[str, int] = {
+    f"{component}_bias": slot for slot, component in enumerate(COMPONENTS)
+}
+DEFAULT_WEIGHTS: Dict[str, float] = {
+    "trend": 0.35,
+    "momentum": 0.25,
+    "volume": 0.2,
+    "orderflow": 0.2,
+}
+NEUTRAL = 0.5
+
 
 @dataclass(slots=True)
 class ConfluenceScore:
@@ -16,30 +29,82 @@ class ConfluenceScore:
     momentum: float
     volume: float
     orderflow: float
+    weights: Tuple[float, float, float, float] = (0.35, 0.25, 0.2, 0.2)
 
     @property
     def total(self) -> float:
-        """Return the combined score clipped between 0 and 1."""
-
-        raw = self.trend * 0.35 + self.momentum * 0.25 + self.volume * 0.2 + self.orderflow * 0.2
+        """Return the weighted score clipped between 0 and 1."""
+
+        w_trend, w_momentum, w_volume, w_orderflow = self.weights
+        raw = (
+            self.trend * w_trend
+            + self.momentum * w_momentum
+            + self.volume * w_volume
+            + self.orderflow * w_orderflow
+        )
         return max(0.0, min(1.0, raw))
 
 
 class ConfluenceEvaluator:
-    """Aggregates features into a :class:`ConfluenceScore`."""
+    """Aggregates features into a :class:`ConfluenceScore`.
+
+    :meth:`score` is the allocation-free fast path: callers keep a vector from
+    :meth:`new_vector`, write component values into the slots named by
+    :data:`FEATURE_SLOTS` and get the same total as :meth:`evaluate`.
+    """
 
     def __init__(self, weights: Dict[str, float] | None = None) -> None:
-        self._weights = weights or {"trend": 0.35, "momentum": 0.25, "volume": 0.2, "orderflow": 0.2}
+        self._weights = weights or dict(DEFAULT_WEIGHTS)
+        w_trend, w_momentum, w_volume, w_orderflow = (
+            self.weight(component) for component in COMPONENTS
+        )
+        self._slot_weights = (w_trend, w_momentum, w_volume, w_orderflow)
+
+    @property
+    def slot_weights(self) -> Tuple[float, float, float, float]:
+        """Weights ordered by slot index."""
+
+        return self._slot_weights
 
     def evaluate(self, features: Iterable[FeatureWindow]) -> ConfluenceScore:
         """Simple heuristic aggregator for early experimentation."""
 
         feature_map = {feature.name: feature.value for feature in features}
-        trend = float(feature_map.get("trend_bias", 0.5))
-        momentum = float(feature_map.get("momentum_bias", 0.5))
-        volume = float(feature_map.get("volume_bias", 0.5))
-        orderflow = float(feature_map.get("orderflow_bias", 0.5))
-        return ConfluenceScore(trend=trend, momentum=momentum, volume=volume, orderflow=orderflow)
+        trend = float(feature_map.get("trend_bias", NEUTRAL))
+        momentum = float(feature_map.get("momentum_bias", NEUTRAL))
+        volume = float(feature_map.get("volume_bias", NEUTRAL))
+        orderflow = float(feature_map.get("orderflow_bias", NEUTRAL))
+        return ConfluenceScore(
+            trend=trend,
+            momentum=momentum,
+            volume=volume,
+            orderflow=orderflow,
+            weights=self._slot_weights,
+        )
+
+    @staticmethod
+    def new_vector() -> List[float]:
+        """Return a feature vector with every slot at the neutral value."""
+
+        return [NEUTRAL] * len(COMPONENTS)
+
+    @staticmethod
+    def reset(vector: MutableSequence[float]) -> None:
+        """Set every slot of *vector* back to neutral in place."""
+
+        vector[TREND] = vector[MOMENTUM] = vector[VOLUME] = vector[ORDERFLOW] = NEUTRAL
+
+    def score(self, vector: MutableSequence[float]) -> float:
+        """Return the clipped weighted total of a slot-indexed *vector*."""
+
+        w_trend, w_momentum, w_volume, w_orderflow = self._slot_weights
+        raw = (
+            vector[TREND] * w_trend
+            + vector[MOMENTUM] * w_momentum
+            + vector[VOLUME] * w_volume
+            + vector[ORDERFLOW] * w_orderflow
+        )
+        return max(0.0, min(1.0, raw))
 
     def weight(self, component: str) -> float:
         """Return configured weight for a component."""
@@ -47,4 +112,14 @@ class ConfluenceEvaluator:
         return self._weights.get(component, 0.0)
 
 
-__all__ = ["ConfluenceScore", "ConfluenceEvaluator"]
+__all__ = [
+    "ConfluenceScore",
+    "ConfluenceEvaluator",
+    "COMPONENTS",
+    "FEATURE_SLOTS",
+    "DEFAULT_WEIGHTS",
+    "TREND",
+    "MOMENTUM",
+    "VOLUME",
+    "ORDERFLOW",
+]
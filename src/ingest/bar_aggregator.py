@@ -0,0 +1,177 @@
+"""Streaming tick-to-bar aggregation across timeframes."""
+
+from __future__ import annotations
+
+from typing import Callable, Dict, Iterable, List, Sequence
+
+from src.common.clock import TIMEFRAME_SECONDS, from_epoch_ns, to_epoch_ns
+from src.common.ring_buffer import HistoryStore
+
+from .market_feed import MarketEvent
+
+DEFAULT_TIMEFRAMES = ("M1", "M5", "H1")
+
+BarListener = Callable[[MarketEvent], None]
+
+
+class _Bar:
+    """Mutable OHLCV accumulator for the bar currently being built."""
+
+    __slots__ = ("start", "open", "high", "low", "close", "volume", "ticks")
+
+    def __init__(self) -> None:
+        self.start = -1
+        self.open = self.high = self.low = self.close = self.volume = 0.0
+        self.ticks = 0
+
+
+class BarAggregator:
+    """Build OHLCV bars for several timeframes from one tick stream.
+
+    Ticks only touch the smallest timeframe's bar. When it closes, the
+    finished bar is merged into every higher timeframe, so an H1 bar is rolled
+    up from sixty M1 bars rather than re-reading ticks. Bars close when a tick
+    arrives in a later interval or when :meth:`close_until` is called with a
+    time past their end; each close is written to *history* and passed to
+    listeners as a bar :class:`MarketEvent` stamped with the bar open time.
+    Ticks older than the bar being built are counted in :attr:`late_ticks`
+    and dropped.
+    """
+
+    def __init__(
+        self,
+        timeframes: Sequence[str] = DEFAULT_TIMEFRAMES,
+        history: HistoryStore | None = None,
+        listeners: Iterable[BarListener] = (),
+    ) -> None:
+        ordered = sorted(dict.fromkeys(timeframes), key=lambda name: TIMEFRAME_SECONDS[name])
+        if not ordered:
+            raise ValueError("at least one timeframe is required")
+        spans = [TIMEFRAME_SECONDS[name] * 1_000_000_000 for name in ordered]
+        for name, span in zip(ordered[1:], spans[1:]):
+            if span % spans[0]:
+                raise ValueError(f"{name} is not a multiple of {ordered[0]}")
+        self._timeframes = tuple(ordered)
+        self._spans = spans
+        self._base_ns = spans[0]
+        self._history = history
+        self._listeners: List[BarListener] = list(listeners)
+        self._bars: Dict[str, List[_Bar]] = {}
+        self.late_ticks = 0
+
+    @property
+    def timeframes(self) -> tuple[str, ...]:
+        return self._timeframes
+
+    def subscribe(self, listener: BarListener) -> None:
+        self._listeners.append(listener)
+
+    def on_tick(self, symbol: str, timestamp_ns: int, price: float, size: float = 0.0) -> None:
+        bars = self._bars.get(symbol)
+        if bars is None:
+            bars = self._bars[symbol] = [_Bar() for _ in self._timeframes]
+        bar = bars[0]
+        start = timestamp_ns - timestamp_ns % self._base_ns
+        if start != bar.start:
+            if start < bar.start:
+                self.late_ticks += 1
+                return
+            self._roll(symbol, bars, start)
+            bar.start = start
+            bar.open = bar.high = bar.low = bar.close = price
+            bar.volume = size
+            bar.ticks = 1
+            return
+        if price > bar.high:
+            bar.high = price
+        elif price < bar.low:
+            bar.low = price
+        bar.close = price
+        bar.volume += size
+        bar.ticks += 1
+
+    def record(self, event: MarketEvent) -> None:
+        """Feed a tick :class:`MarketEvent` carrying a ``price``; other events are ignored."""
+
+        payload = event.payload
+        if "price" in payload and "timeframe" not in payload:
+            self.on_tick(
+                event.symbol,
+                to_epoch_ns(event.timestamp),
+                float(payload["price"]),
+                float(payload.get("size", 0.0)),
+            )
+
+    def close_until(self, timestamp_ns: int) -> None:
+        """Close every bar whose interval ends at or before *timestamp_ns*.
+
+        Call it from a timer so quiet symbols still publish bars on time.
+        """
+
+        boundary = timestamp_ns - timestamp_ns % self._base_ns
+        for symbol, bars in self._bars.items():
+            if bars[0].start < boundary:
+                self._roll(symbol, bars, boundary)
+
+    def _roll(self, symbol: str, bars: List[_Bar], next_start: int) -> None:
+        """Close the base bar and any higher bar that ends before *next_start*."""
+
+        base = bars[0]
+        if base.ticks:
+            self._emit(symbol, 0, base)
+            for idx in range(1, len(bars)):
+                higher = bars[idx]
+                if higher.ticks:
+                    if base.high > higher.high:
+                        higher.high = base.high
+                    if base.low < higher.low:
+                        higher.low = base.low
+                    higher.close = base.close
+                    higher.volume += base.volume
+                    higher.ticks += base.ticks
+                else:
+                    higher.start = base.start - base.start % self._spans[idx]
+                    higher.open, higher.high, higher.low = base.open, base.high, base.low
+                    higher.close, higher.volume, higher.ticks = base.close, base.volume, base.ticks
+            # An unaligned start makes any later tick for a closed interval late.
+            base.start = next_start - 1
+            base.ticks = 0
+        for idx in range(1, len(bars)):
+            higher = bars[idx]
+            if higher.ticks and next_start >= higher.start + self._spans[idx]:
+                self._emit(symbol, idx, higher)
+                higher.ticks = 0
+
+    def _emit(self, symbol: str, index: int, bar: _Bar) -> None:
+        timeframe = self._timeframes[index]
+        if self._history is not None:
+            self._history.append_bar(
+                symbol,
+                timeframe,
+                bar.start,
+                bar.open,
+                bar.high,
+                bar.low,
+                bar.close,
+                bar.volume,
+                bar.ticks,
+            )
+        if self._listeners:
+            event = MarketEvent(
+                symbol=symbol,
+                timestamp=from_epoch_ns(bar.start),
+                payload={
+                    "timeframe": timeframe,
+                    "open": bar.open,
+                    "high": bar.high,
+                    "low": bar.low,
+                    "close": bar.close,
+                    "volume": bar.volume,
+                    "ticks": bar.ticks,
+                },
+            )
+            for listener in self._listeners:
+                listener(event)
+
+
+__all__ = ["BarAggregator", "BarListener", "DEFAULT_TIMEFRAMES"]
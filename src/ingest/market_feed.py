@@ -9,6 +9,9 @@ from typing import Any, AsyncIterator, Dict, Iterable
 
 from structlog import get_logger
 
+from src.common.column_store import ColumnStore
+from src.common.ring_buffer import HistoryStore
+
 LOGGER = get_logger(__name__)
 
 
@@ -24,8 +27,15 @@ class MarketEvent:
 class MarketFeed:
     """Async generator that yields market events from multiple sources."""
 
-    def __init__(self, symbols: Iterable[str]) -> None:
+    def __init__(
+        self,
+        symbols: Iterable[str],
+        history: HistoryStore | None = None,
+        store: ColumnStore | None = None,
+    ) -> None:
         self._symbols = list(symbols)
+        self._history = history
+        self._store = store
         self._running = False
 
     async def __aiter__(self) -> AsyncIterator[MarketEvent]:
@@ -38,12 +48,21 @@ class MarketFeed:
         while self._running:
             for symbol in self._symbols:
                 await asyncio.sleep(0.01)
-                yield MarketEvent(symbol=symbol, timestamp=datetime.utcnow(), payload={"price": 0.0})
+                event = MarketEvent(
+                    symbol=symbol, timestamp=datetime.utcnow(), payload={"price": 0.0}
+                )
+                if self._history is not None:
+                    self._history.record(event)
+                if self._store is not None:
+                    self._store.record(event)
+                yield event
 
     async def stop(self) -> None:
-        """Stop the feed loop."""
+        """Stop the feed loop and persist any buffered events."""
 
         self._running = False
+        if self._store is not None:
+            self._store.flush()
 
 
 __all__ = ["MarketFeed", "MarketEvent"]
@@ -3,7 +3,12 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Iterable, List, Tuple
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from src.common.indicators import batch
 
 
 def _to_float_list(series: Iterable[float]) -> List[float]:
@@ -26,4 +31,26 @@ def window_series(series: Iterable[float], config: WindowConfig) -> List[Tuple[L
     return windows
 
 
-__all__ = ["WindowConfig", "window_series"]
+def indicator_columns(
+    high: ArrayLike,
+    low: ArrayLike,
+    close: ArrayLike,
+    volume: ArrayLike,
+    period: int = 14,
+    lookback: int = 60,
+) -> Dict[str, np.ndarray]:
+    """Return aligned indicator columns for every bar of an OHLCV history."""
+
+    macd_line, macd_signal, macd_hist = batch.macd(close)
+    return {
+        "rsi": batch.rsi(close, period),
+        "atr": batch.atr(high, low, close, period),
+        "adx": batch.adx(high, low, close, period),
+        "macd": macd_line,
+        "macd_signal": macd_signal,
+        "macd_hist": macd_hist,
+        "rel_volume": batch.relative_volume(volume, lookback),
+    }
+
+
+__all__ = ["WindowConfig", "window_series", "indicator_columns"]
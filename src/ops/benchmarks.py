@@ -0,0 +1,549 @@
+"""Micro-benchmarks for latency-sensitive components.
+
+Run ``python -m src.ops.benchmarks <name>`` to print a benchmark's results.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+from structlog import get_logger
+
+from src.backtest.data import BAR_COLUMNS, load_bars, save_bars, synthetic_bars
+from src.backtest.engine import BacktestConfig, EventDrivenEngine
+from src.backtest.parallel import ParallelRunner, build_jobs
+from src.backtest.signals import StrategyParams
+from src.backtest.vectorized import sweep_objective
+from src.common.column_store import ColumnStore
+from src.common.feature_store import FeatureStore
+from src.common.ring_buffer import HistoryStore
+from src.common.ta_confluence import FEATURE_SLOTS, ConfluenceEvaluator
+from src.common.types import FeatureWindow, SignalCandidate
+from src.ingest.bar_aggregator import BarAggregator
+from src.optimize.walk_forward import WalkForwardRunner, WalkForwardSettings
+from src.orderflow.book_features import (
+    ASK_CODE,
+    BID_CODE,
+    BookFeatureEngine,
+    DepthUpdates,
+    load_depth_updates,
+    replay,
+    save_depth_updates,
+)
+from src.orderflow.lob_features import cumulative_volume_delta
+from src.orderflow.order_book import ASK, BID, OrderBook
+from src.orderflow.tape_buffer import TapeBuffer
+from src.orderflow.tape_features import RollingTape, TapePrint
+from src.strategy.compiler import compile_strategies
+from src.strategy.dsl import StrategyDSLParser
+from src.strategy.gates import GateBatch, MultiTimeframeGate
+from src.strategy.signal_ensemble import PLAYBOOKS, EnsembleBatch, EnsembleInputs, SignalEnsemble
+
+LOGGER = get_logger(__name__)
+
+TIMEFRAMES = ("M1", "M5", "H1", "tick")
+
+
+def _seed_store(store: FeatureStore, features_per_timeframe: int) -> List[FeatureWindow]:
+    now = datetime.utcnow()
+    windows = [
+        FeatureWindow(name=f"feature_{idx}", timeframe=timeframe, timestamp=now, value=float(idx))
+        for timeframe in TIMEFRAMES
+        for idx in range(features_per_timeframe)
+    ]
+    for window in windows:
+        store.upsert(window)
+    return windows
+
+
+def feature_store_contention(
+    reader_counts: Iterable[int] = (1, 2, 4, 8),
+    duration: float = 1.0,
+    features_per_timeframe: int = 250,
+) -> Dict[str, Dict[int, float]]:
+    """Measure read and write throughput while readers contend with one writer.
+
+    Readers alternate ``get`` and ``latest_values`` calls; a single writer
+    keeps upserting existing keys and periodically adds new ones.
+    """
+
+    results: Dict[str, Dict[int, float]] = {"reads_per_sec": {}, "writes_per_sec": {}}
+    for readers in reader_counts:
+        store = FeatureStore()
+        windows = _seed_store(store, features_per_timeframe)
+        stop = threading.Event()
+        read_counts = [0] * readers
+        write_count = [0]
+
+        def read(slot: int) -> None:
+            count = 0
+            while not stop.is_set():
+                store.get("feature_7", "M1")
+                store.latest_values(TIMEFRAMES[count % len(TIMEFRAMES)])
+                count += 2
+            read_counts[slot] = count
+
+        def write() -> None:
+            count = 0
+            now = datetime.utcnow()
+            while not stop.is_set():
+                window = windows[count % len(windows)]
+                store.upsert(FeatureWindow(window.name, window.timeframe, now, float(count)))
+                if count % 1000 == 0:
+                    store.upsert(
+                        FeatureWindow(f"new_{count}", "M1", now + timedelta(seconds=1), 0.0)
+                    )
+                count += 1
+            write_count[0] = count
+
+        threads = [threading.Thread(target=read, args=(slot,)) for slot in range(readers)]
+        threads.append(threading.Thread(target=write))
+        for thread in threads:
+            thread.start()
+        time.sleep(duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        results["reads_per_sec"][readers] = sum(read_counts) / duration
+        results["writes_per_sec"][readers] = write_count[0] / duration
+    return results
+
+
+def dsl_evaluation(
+    path: Path = Path("configs/strategies.yaml"), bars: int = 5000
+) -> Dict[str, float]:
+    """Return mean nanoseconds per bar spent evaluating each compiled strategy."""
+
+    program = compile_strategies(
+        StrategyDSLParser(path).parse(), params={"theta": 0.5, "theta1": 0.1, "cap": 2.0}
+    )
+    store = FeatureStore(history_size=256)
+    start = datetime.utcnow()
+    slots = [
+        ("close", "H1"),
+        ("ema_200", "H1"),
+        ("ema_50", "H1"),
+        ("adx", "H1"),
+        ("macd_hist", "M1"),
+        ("rsi", "M1"),
+        ("relvol", "M1"),
+        ("lob_imbalance", "live"),
+        ("imbalance", "live"),
+        ("depth_slope", "live"),
+        ("spread", "live"),
+        ("tape_burst", "live"),
+        ("aggressor_ratio", "live"),
+    ]
+    for bar in range(bars):
+        now = start + timedelta(minutes=bar)
+        for idx, (name, timeframe) in enumerate(slots):
+            store.upsert(FeatureWindow(name, timeframe, now, float((bar * (idx + 3)) % 97) / 97))
+        program.evaluate(store)
+    stats = {name: item.mean_ns for name, item in program.stats().items()}
+    stats["steps"] = float(program.step_count)
+    return stats
+
+
+def gate_batch(rows: int = 1_000_000, seed: int = 0) -> Dict[str, float]:
+    """Return rows per second and pass rate for :meth:`MultiTimeframeGate.evaluate_arrays`."""
+
+    rng = np.random.default_rng(seed)
+    price = 100.0 + rng.standard_normal(rows)
+    batch = GateBatch(
+        symbols=["XAUUSD"] * rows,
+        price=price,
+        ema_fast=price + rng.standard_normal(rows),
+        ema_slow=price,
+        adx=rng.uniform(10, 40, rows),
+        macd_hist=rng.standard_normal(rows),
+        rsi=rng.uniform(20, 80, rows),
+        rel_volume=rng.uniform(0.3, 1.5, rows),
+        orderflow=rng.uniform(-0.3, 0.3, rows),
+        ml_probability=rng.uniform(0, 1, rows),
+    )
+    gate = MultiTimeframeGate()
+    started = time.perf_counter()
+    result = gate.evaluate_arrays(batch)
+    elapsed = time.perf_counter() - started
+    return {"rows_per_sec": rows / elapsed, "pass_rate": float(result.passed.mean())}
+
+
+def confluence_allocations(iterations: int = 100_000) -> Dict[str, Dict[str, float]]:
+    """Compare the FeatureWindow confluence path with the slot-vector fast path.
+
+    Reports nanoseconds per evaluation plus the tracemalloc peak and the
+    bytes still held after the loop.
+    """
+
+    evaluator = ConfluenceEvaluator()
+    now = datetime.utcnow()
+    features = {"trend_bias": 0.7, "momentum_bias": 0.6, "volume_bias": 0.4, "orderflow_bias": 0.55}
+    vector = evaluator.new_vector()
+
+    def windows() -> float:
+        return evaluator.evaluate(
+            FeatureWindow(name, "HTF", now, value) for name, value in features.items()
+        ).total
+
+    def slots() -> float:
+        evaluator.reset(vector)
+        for name, value in features.items():
+            vector[FEATURE_SLOTS[name]] = value
+        return evaluator.score(vector)
+
+    results: Dict[str, Dict[str, float]] = {}
+    for label, func in (("feature_windows", windows), ("vector", slots)):
+        func()
+        tracemalloc.start()
+        baseline, _ = tracemalloc.get_traced_memory()
+        started = time.perf_counter_ns()
+        for _ in range(iterations):
+            func()
+        elapsed = time.perf_counter_ns() - started
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[label] = {
+            "ns_per_eval": elapsed / iterations,
+            "peak_bytes": float(peak - baseline),
+            "retained_bytes": float(current - baseline),
+        }
+    return results
+
+
+def ensemble_batch(rows: int = 100_000, seed: int = 0) -> Dict[str, float]:
+    """Compare scalar :meth:`SignalEnsemble.combine` with ``combine_batch`` over mixed symbols."""
+
+    rng = np.random.default_rng(seed)
+    symbols = sorted(PLAYBOOKS)
+    inputs = [
+        EnsembleInputs(
+            candidate=SignalCandidate(
+                symbols[idx % len(symbols)], "long", float(rng.uniform()), 3, 0.0, "mtf_gate"
+            ),
+            orderflow_score=float(rng.uniform()),
+            ml_probability=float(rng.uniform()),
+            sentiment_bias=float(rng.uniform(-1, 1)),
+            feature_overrides={
+                "relative_volume": float(rng.uniform(0, 1.5)),
+                "spread": float(rng.uniform(0, 0.001)),
+            },
+        )
+        for idx in range(rows)
+    ]
+    ensemble = SignalEnsemble()
+    started = time.perf_counter()
+    for item in inputs:
+        ensemble.combine(item)
+    scalar = time.perf_counter() - started
+    batch = EnsembleBatch.from_inputs(inputs)
+    started = time.perf_counter()
+    ensemble.combine_batch(batch)
+    vectorised = time.perf_counter() - started
+    return {"scalar_rows_per_sec": rows / scalar, "batch_rows_per_sec": rows / vectorised}
+
+
+def event_backtest(bars: int = 1_000_000, symbol: str = "XAUUSD") -> Dict[str, float]:
+    """Return bars per minute for signal precomputation plus the event loop."""
+
+    series = synthetic_bars(symbol, bars)
+    engine = EventDrivenEngine(BacktestConfig(engine="event", symbol=symbol))
+    started = time.perf_counter()
+    signals = engine.signals(series)
+    prepared = time.perf_counter()
+    result = engine.run(series, signals)
+    finished = time.perf_counter()
+    return {
+        "bars_per_minute": bars / (finished - started) * 60,
+        "signal_seconds": prepared - started,
+        "event_loop_seconds": finished - prepared,
+        "trades": result.metrics["trades"],
+    }
+
+
+def vectorized_sweep(
+    bars: int = 500_000, evaluations: int = 20, symbol: str = "XAUUSD"
+) -> Dict[str, float]:
+    """Return evaluations per second of a sweep over exit and entry parameters."""
+
+    series = synthetic_bars(symbol, bars)
+    config = BacktestConfig(
+        engine="vectorbt", symbol=symbol, params=StrategyParams(use_stops=False)
+    )
+    objective = sweep_objective(series, config)
+    objective()
+    started = time.perf_counter()
+    for idx in range(evaluations):
+        objective(max_hold_bars=30 + 10 * idx, min_confidence=0.4 + 0.01 * idx)
+    elapsed = time.perf_counter() - started
+    return {"evaluations_per_sec": evaluations / elapsed, "bars": float(bars)}
+
+
+def parallel_backtest(bars: int = 500_000, jobs_per_worker: int = 2) -> Dict[int, float]:
+    """Return jobs per second of :class:`ParallelRunner` for 1..cpu_count workers."""
+
+    results: Dict[int, float] = {}
+    cores = os.cpu_count() or 1
+    worker_counts = sorted(
+        {1, *(2**power for power in range(1, cores.bit_length()) if 2**power <= cores), cores}
+    )
+    with ParallelRunner(BacktestConfig(engine="event", symbol="XAUUSD")) as runner:
+        runner.share("XAUUSD", synthetic_bars("XAUUSD", bars))
+        for workers in worker_counts:
+            jobs = build_jobs(["XAUUSD"]) * (workers * jobs_per_worker)
+            started = time.perf_counter()
+            runner.run(jobs, workers=workers)
+            results[workers] = len(jobs) / (time.perf_counter() - started)
+    return results
+
+
+def column_store_reads(days: int = 365, symbol: str = "XAUUSD") -> Dict[str, float]:
+    """Return seconds to load *days* of M1 bars from the column store and from ``.npz``.
+
+    ``store_week`` reads one week from the middle of the range, which only
+    opens those seven day partitions.
+    """
+
+    series = synthetic_bars(symbol, days * 1440)
+    results: Dict[str, float] = {}
+    with tempfile.TemporaryDirectory(prefix="column-store-") as tmp:
+        root = Path(tmp)
+        store = ColumnStore(root / "store")
+        started = time.perf_counter()
+        store.append(
+            symbol, "M1", series.timestamps, {name: getattr(series, name) for name in BAR_COLUMNS}
+        )
+        results["store_write"] = time.perf_counter() - started
+        save_bars(series, root / "npz")
+
+        started = time.perf_counter()
+        loaded = load_bars(root / "store", symbol)
+        results["store_year"] = time.perf_counter() - started
+        week_start = datetime(2021, 1, 4) + timedelta(days=days // 2)
+        started = time.perf_counter()
+        week = load_bars(
+            root / "store", symbol, start=week_start, end=week_start + timedelta(days=7)
+        )
+        results["store_week"] = time.perf_counter() - started
+        started = time.perf_counter()
+        load_bars(root / "npz", symbol)
+        results["npz_year"] = time.perf_counter() - started
+        results["bars"] = float(len(loaded))
+        results["week_bars"] = float(len(week))
+    return results
+
+
+def bar_aggregation(ticks: int = 1_000_000, symbols: int = 5, seed: int = 0) -> Dict[str, float]:
+    """Return ticks per second through :class:`BarAggregator` into a :class:`HistoryStore`."""
+
+    rng = np.random.default_rng(seed)
+    stamps = (1_700_000_000_000_000_000 + np.cumsum(rng.integers(1, 20_000_000, ticks))).tolist()
+    prices = (2000 + np.cumsum(rng.standard_normal(ticks)) * 0.1).tolist()
+    sizes = rng.random(ticks).tolist()
+    names = [f"SYM{idx}" for idx in range(symbols)]
+    tickers = [names[idx % symbols] for idx in range(ticks)]
+    history = HistoryStore()
+    aggregator = BarAggregator(history=history)
+    on_tick = aggregator.on_tick
+    started = time.perf_counter()
+    for symbol, stamp, price, size in zip(tickers, stamps, prices, sizes):
+        on_tick(symbol, stamp, price, size)
+    elapsed = time.perf_counter() - started
+    return {
+        "ticks_per_second": ticks / elapsed,
+        "m1_bars": float(len(history.bars(names[0], "M1"))),
+    }
+
+
+def walk_forward(days: int = 3 * 365, workers: Optional[int] = None) -> Dict[str, float]:
+    """Time a 30-day window, 7-day step walk-forward over *days* of synthetic M1 bars."""
+
+    config = BacktestConfig(engine="event", symbol="XAUUSD", start=datetime(2021, 1, 4))
+    with WalkForwardRunner(config, WalkForwardSettings(), workers=workers) as runner:
+        runner.share("XAUUSD", synthetic_bars("XAUUSD", days * 1440))
+        started = time.perf_counter()
+        report = runner.run(["XAUUSD"])
+        elapsed = time.perf_counter() - started
+    windows = len(report.results)
+    return {"windows": float(windows), "seconds": elapsed, "windows_per_second": windows / elapsed}
+
+
+def order_book_updates(updates: int = 200_000, seed: int = 0) -> Dict[str, float]:
+    """Return L2 deltas per second (each with an imbalance read) and depth-slope calls/s."""
+
+    rng = np.random.default_rng(seed)
+    is_bid = rng.random(updates) < 0.5
+    offsets = rng.integers(1, 40, updates) * 0.5
+    sides = np.where(is_bid, BID, ASK).tolist()
+    prices = np.where(is_bid, 100 - offsets, 100 + offsets).tolist()
+    sizes = (
+        np.where(rng.random(updates) < 0.3, 0.0, rng.integers(1, 10, updates))
+        .astype(float)
+        .tolist()
+    )
+    book = OrderBook("BENCH")
+    update = book.update
+    started = time.perf_counter()
+    for side, price, size in zip(sides, prices, sizes):
+        update(side, price, size)
+        _ = book.imbalance
+    update_rate = updates / (time.perf_counter() - started)
+    started = time.perf_counter()
+    for _ in range(updates // 10):
+        book.depth_slope()
+    return {
+        "updates_per_second": update_rate,
+        "depth_slope_per_second": updates / 10 / (time.perf_counter() - started),
+    }
+
+
+def rolling_tape(prints: int = 500_000, seed: int = 0) -> Dict[str, float]:
+    """Return prints per second through a 5s/60s :class:`RollingTape` at ~20k prints/s bursts."""
+
+    rng = np.random.default_rng(seed)
+    stamps = np.cumsum(rng.exponential(0.05, prints)).astype(np.int64).tolist()
+    sizes = rng.gamma(1.5, 0.2, prints).tolist()
+    sides = np.where(rng.random(prints) < 0.5, "buy", "sell").tolist()
+    tape = RollingTape()
+    add = tape.add
+    started = time.perf_counter()
+    for stamp, size, side in zip(stamps, sizes, sides):
+        add(stamp, size, side)
+    elapsed = time.perf_counter() - started
+    return {
+        "prints_per_second": prints / elapsed,
+        "window_5s_prints": float(tape.window(5_000).count),
+    }
+
+
+def tape_buffer(prints: int = 1_000_000, seed: int = 0) -> Dict[str, float]:
+    """Compare memory and CVD time of :class:`TapeBuffer` with lists of :class:`TapePrint`."""
+
+    rng = np.random.default_rng(seed)
+    stamps = np.cumsum(rng.integers(0, 5, prints))
+    sizes = rng.gamma(1.5, 0.2, prints)
+    sides = np.where(rng.random(prints) < 0.5, "buy", "sell")
+
+    tracemalloc.start()
+    rows = zip(stamps.tolist(), sizes.tolist(), sides.tolist())
+    objects = [TapePrint(stamp, size, side) for stamp, size, side in rows]
+    object_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    buffer = TapeBuffer(capacity=prints)
+    buffer.extend(stamps, np.full(prints, 100.0), sizes, sides)
+
+    trades = [{"size": item.size, "side": item.side} for item in objects]
+    started = time.perf_counter()
+    cumulative_volume_delta(trades)
+    scalar = time.perf_counter() - started
+    started = time.perf_counter()
+    buffer.columns().cvd()
+    vectorised = time.perf_counter() - started
+    return {
+        "object_bytes_per_print": object_bytes / prints,
+        "buffer_bytes_per_print": buffer.nbytes / prints,
+        "cvd_speedup": scalar / vectorised,
+    }
+
+
+def lob_replay(updates: int = 500_000, seed: int = 0) -> Dict[str, float]:
+    """Record synthetic L2 deltas to a depth file and replay it through :class:`BookFeatureEngine`.
+
+    Returns updates per second with every feature refreshed after each delta.
+    """
+
+    rng = np.random.default_rng(seed)
+    is_bid = rng.random(updates) < 0.5
+    offsets = rng.integers(1, 40, updates) * 0.5
+    recorded = DepthUpdates(
+        timestamp_ms=np.cumsum(rng.integers(0, 3, updates)).astype(np.int64),
+        side=np.where(is_bid, BID_CODE, ASK_CODE).astype(np.int8),
+        price=np.where(is_bid, 100 - offsets, 100 + offsets),
+        size=np.where(rng.random(updates) < 0.3, 0.0, rng.integers(1, 10, updates)).astype(float),
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        loaded = load_depth_updates(save_depth_updates(recorded, Path(tmp) / "depth.npz"))
+    engine = BookFeatureEngine("BENCH")
+    started = time.perf_counter()
+    replay(engine, loaded)
+    elapsed = time.perf_counter() - started
+    return {"updates_per_second": updates / elapsed, "microprice_drift": engine.microprice_drift}
+
+
+def lob_inference(
+    batch_sizes: Iterable[int] = (1, 8, 64), calls: int = 200, threads: int = 1, seed: int = 0
+) -> Dict[int, Dict[str, float]]:
+    """Return p50/p99 milliseconds per batched :class:`LobInferenceService` call on CPU."""
+
+    # Imported here so the other benchmarks do not pay for loading torch.
+    import torch
+
+    from src.orderflow.lob_features import LOBSnapshot
+    from src.orderflow.lob_model import LOB_LEVELS, LobInferenceService, LobSiameseModel
+
+    torch.manual_seed(seed)
+    rng = np.random.default_rng(seed)
+    service = LobInferenceService(LobSiameseModel(), threads=threads)
+    results: Dict[int, Dict[str, float]] = {}
+    for batch in batch_sizes:
+        offsets = 0.5 * np.arange(LOB_LEVELS)
+        snapshots = {}
+        for idx in range(batch):
+            bid_sizes, ask_sizes = rng.integers(1, 10, (2, LOB_LEVELS)).astype(float)
+            snapshots[f"SYM{idx}"] = LOBSnapshot(
+                bids=np.column_stack((100 - offsets, bid_sizes)).tolist(),
+                asks=np.column_stack((100 + offsets, ask_sizes)).tolist(),
+            )
+        for _ in range(10):
+            service.predict(snapshots)
+        latencies = np.empty(calls)
+        for call in range(calls):
+            started = time.perf_counter()
+            for symbol, snapshot in snapshots.items():
+                service.submit(symbol, snapshot)
+            service.flush()
+            latencies[call] = time.perf_counter() - started
+        p50, p99 = np.percentile(latencies * 1000, [50, 99])
+        results[batch] = {"p50_ms": float(p50), "p99_ms": float(p99)}
+    return results
+
+
+BENCHMARKS: Dict[str, Callable[[], object]] = {
+    "feature_store": feature_store_contention,
+    "dsl": dsl_evaluation,
+    "gate": gate_batch,
+    "confluence": confluence_allocations,
+    "ensemble": ensemble_batch,
+    "backtest": event_backtest,
+    "sweep": vectorized_sweep,
+    "parallel": parallel_backtest,
+    "column_store": column_store_reads,
+    "bars": bar_aggregation,
+    "walk_forward": walk_forward,
+    "order_book": order_book_updates,
+    "tape": rolling_tape,
+    "tape_buffer": tape_buffer,
+    "lob_replay": lob_replay,
+    "lob_inference": lob_inference,
+}
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run a component benchmark")
+    parser.add_argument("name", choices=sorted(BENCHMARKS))
+    args = parser.parse_args(list(argv) if argv is not None else None)
+    result = BENCHMARKS[args.name]()
+    LOGGER.info("benchmark_result", name=args.name, result=result)
+    print(result)
+
+
+if __name__ == "__main__":
+    main()
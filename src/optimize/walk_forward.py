@@ -2,14 +2,36 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import argparse
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timedelta
-from typing import Iterable, List
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 
+import numpy as np
 from structlog import get_logger
 
+from src.backtest.config import BacktestConfig, PipelineConfig, load_pipeline_config
+from src.backtest.data import BarSeries
+from src.backtest.engine import select_engine
+from src.backtest.parallel import ParallelRunner, open_shared
+from src.backtest.signals import SignalFrame, StrategyParams, compute_signals
+from src.backtest.vectorized import FEATURE_PARAMS
+from src.common.clock import from_epoch_ns, to_epoch_ns
+from src.common.utils import load_yaml
+
 LOGGER = get_logger(__name__)
 
+DEFAULT_GRID: Dict[str, List[Any]] = {"min_confidence": [0.5, 0.6, 0.7], "max_hold_bars": [60, 240]}
+
+# Full-history signals and pipeline configs built by this worker process.
+_WORKER_SIGNALS: Dict[Tuple[str, str, Tuple[Any, ...]], SignalFrame] = {}
+_WORKER_PIPELINES: Dict[Tuple[str, str, Optional[str]], PipelineConfig] = {}
+
 
 @dataclass(slots=True)
 class WalkForwardResult:
@@ -17,6 +39,62 @@ class WalkForwardResult:
     window_end: datetime
     oos_win_rate: float
     profit_factor: float
+    symbol: str = ""
+    oos_end: Optional[datetime] = None
+    params: Dict[str, Any] = field(default_factory=dict)
+    in_sample_score: float = 0.0
+    oos_metrics: Dict[str, float] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class WalkForwardSettings:
+    """``configs/walkforward.yaml``: window sizes, OOS thresholds and the parameter grid."""
+
+    window_days: int = 30
+    step_days: int = 7
+    min_oos_win_rate: float = 0.75
+    max_oos_drawdown_pct: float = 5.0
+    min_profit_factor: float = 1.8
+    grid: Dict[str, List[Any]] = field(default_factory=lambda: dict(DEFAULT_GRID))
+
+    @classmethod
+    def from_file(cls, path: Path) -> WalkForwardSettings:
+        raw = load_yaml(path)
+        defaults = cls()
+        grid = raw.get("parameter_grid") or defaults.grid
+        return cls(
+            window_days=int(raw.get("window_days", defaults.window_days)),
+            step_days=int(raw.get("step_days", defaults.step_days)),
+            min_oos_win_rate=float(raw.get("min_oos_win_rate", defaults.min_oos_win_rate)),
+            max_oos_drawdown_pct=float(
+                raw.get("max_oos_drawdown_pct", defaults.max_oos_drawdown_pct)
+            ),
+            min_profit_factor=float(raw.get("min_profit_factor", defaults.min_profit_factor)),
+            grid={name: list(values) for name, values in grid.items()},
+        )
+
+
+@dataclass(slots=True)
+class WalkForwardWindow:
+    """In-sample ``[start, split)`` followed by out-of-sample ``[split, end)``."""
+
+    symbol: str
+    start: datetime
+    split: datetime
+    end: datetime
+
+
+@dataclass(slots=True)
+class WalkForwardReport:
+    results: List[WalkForwardResult]
+
+    def passed(self, settings: WalkForwardSettings) -> bool:
+        """Whether every OOS window meets the win-rate, profit-factor and drawdown limits."""
+
+        floor = -settings.max_oos_drawdown_pct / 100
+        return evaluate(
+            self.results, settings.min_oos_win_rate, settings.min_profit_factor
+        ) and all(result.oos_metrics.get("max_drawdown", 0.0) >= floor for result in self.results)
 
 
 def schedule(start: datetime, end: datetime, window_days: int, step_days: int) -> List[tuple[datetime, datetime]]:
@@ -43,4 +121,218 @@ def evaluate(results: Iterable[WalkForwardResult], win_rate_threshold: float, pr
     return True
 
 
-__all__ = ["schedule", "evaluate", "WalkForwardResult"]
+def parameter_grid(base: StrategyParams, grid: Mapping[str, Sequence[Any]]) -> List[StrategyParams]:
+    """Return *base* with every combination of the *grid* values applied."""
+
+    names = list(grid)
+    return [
+        replace(base, **dict(zip(names, values))) for values in itertools.product(*grid.values())
+    ]
+
+
+def _full_signals(shared_dir: str, series: BarSeries, params: StrategyParams) -> SignalFrame:
+    """Gate and ensemble output over the whole history, before the confidence cut.
+
+    Indicators are causal, so a window's slice of these columns equals what
+    the live pipeline saw at the time, and every window and candidate sharing
+    indicator settings reuses one computation.
+    """
+
+    key = (shared_dir, series.symbol, tuple(getattr(params, name) for name in FEATURE_PARAMS))
+    frame = _WORKER_SIGNALS.get(key)
+    if frame is None:
+        frame = _WORKER_SIGNALS[key] = compute_signals(
+            series, replace(params, min_confidence=-np.inf)
+        )
+    return frame
+
+
+def _forget_signals(shared_dir: str, symbol: str | None = None) -> None:
+    for key in [
+        key for key in _WORKER_SIGNALS if key[0] == shared_dir and symbol in (None, key[1])
+    ]:
+        del _WORKER_SIGNALS[key]
+
+
+def _pipeline(config: BacktestConfig, symbol: str) -> PipelineConfig:
+    key = (str(config.config_dir), symbol, config.routing_profile)
+    pipeline = _WORKER_PIPELINES.get(key)
+    if pipeline is None:
+        pipeline = load_pipeline_config(config.config_dir, symbol, config.routing_profile)
+        _WORKER_PIPELINES[key] = pipeline
+    return pipeline
+
+
+def _backtest(
+    shared_dir: str,
+    config: BacktestConfig,
+    series: BarSeries,
+    params: StrategyParams,
+    lo: int,
+    hi: int,
+) -> Dict[str, float]:
+    job_config = replace(config, symbol=series.symbol, params=params)
+    signals = _full_signals(shared_dir, series, params).slice(lo, hi)
+    signals = replace(signals, entry=signals.entry & (signals.confidence >= params.min_confidence))
+    engine = select_engine(job_config)(job_config, pipeline=_pipeline(config, series.symbol))
+    return engine.run(series.slice(lo, hi), signals).metrics
+
+
+def _run_window(
+    shared_dir: str,
+    config: BacktestConfig,
+    candidates: List[StrategyParams],
+    tuned: Tuple[str, ...],
+    metric: str,
+    window: WalkForwardWindow,
+) -> WalkForwardResult:
+    series = open_shared(shared_dir, window.symbol, config.data_resolution)
+    bounds = [to_epoch_ns(window.start), to_epoch_ns(window.split), to_epoch_ns(window.end)]
+    lo, split, hi = np.searchsorted(series.timestamps, bounds, side="left").tolist()
+    best, best_score = candidates[0], -np.inf
+    for params in candidates:
+        score = _backtest(shared_dir, config, series, params, lo, split)[metric]
+        if score > best_score:
+            best, best_score = params, score
+    oos = _backtest(shared_dir, config, series, best, split, hi)
+    return WalkForwardResult(
+        window_start=window.start,
+        window_end=window.split,
+        oos_win_rate=oos["win_rate"],
+        profit_factor=oos["profit_factor"],
+        symbol=window.symbol,
+        oos_end=window.end,
+        params={name: getattr(best, name) for name in tuned},
+        in_sample_score=float(best_score),
+        oos_metrics=oos,
+    )
+
+
+class WalkForwardRunner:
+    """Optimise each in-sample window and test the winner on the following step.
+
+    Windows come from :func:`schedule`; each is scored by grid search over
+    ``settings.grid`` on ``window_days`` of history and the best parameters
+    are backtested on the next ``step_days``. Windows run concurrently on a
+    process pool that memory-maps the bars shared by
+    :class:`~src.backtest.parallel.ParallelRunner`, and each worker computes
+    the full-history signals once per indicator setting, so a window only
+    slices cached columns and runs the engine.
+    """
+
+    def __init__(
+        self,
+        config: BacktestConfig,
+        settings: WalkForwardSettings | None = None,
+        metric: str = "total_return",
+        workers: int | None = None,
+        shared_dir: Path | None = None,
+    ) -> None:
+        self._config = config
+        self._settings = settings or WalkForwardSettings()
+        self._metric = metric
+        self._workers = workers or os.cpu_count() or 1
+        self._data = ParallelRunner(config, workers=self._workers, shared_dir=shared_dir)
+
+    def __enter__(self) -> WalkForwardRunner:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        # Single-worker runs fill the signal and pipeline caches in this process.
+        _forget_signals(str(self._data.shared_dir))
+        _WORKER_PIPELINES.clear()
+        self._data.close()
+
+    def share(self, symbol: str, series: BarSeries | None = None) -> None:
+        """Publish a symbol's bars (loaded from ``config.data_dir`` by default) to the workers."""
+
+        if self._data.share(symbol, series):
+            _forget_signals(str(self._data.shared_dir), symbol)
+
+    def windows(
+        self, symbol: str, start: datetime | None = None, end: datetime | None = None
+    ) -> List[WalkForwardWindow]:
+        """Return the windows of *symbol* whose in-sample span fits before *end*.
+
+        *start* and *end* default to the config period, then to the data.
+        """
+
+        self.share(symbol)
+        series = open_shared(str(self._data.shared_dir), symbol, self._config.data_resolution)
+        first, last = int(series.timestamps[0]), int(series.timestamps[-1]) + series.bar_ns
+        start = start or self._config.start or from_epoch_ns(first).replace(tzinfo=None)
+        end = end or self._config.end or from_epoch_ns(last).replace(tzinfo=None)
+        settings = self._settings
+        step = timedelta(days=settings.step_days)
+        return [
+            WalkForwardWindow(symbol, window_start, window_end, min(window_end + step, end))
+            for window_start, window_end in schedule(
+                start, end, settings.window_days, settings.step_days
+            )
+            if window_end < end
+        ]
+
+    def run(
+        self, symbols: Sequence[str], start: datetime | None = None, end: datetime | None = None
+    ) -> WalkForwardReport:
+        windows = [window for symbol in symbols for window in self.windows(symbol, start, end)]
+        if not windows:
+            return WalkForwardReport([])
+        tuned = tuple(self._settings.grid)
+        candidates = parameter_grid(self._config.params, self._settings.grid)
+        shared_dir = str(self._data.shared_dir)
+        workers = min(self._workers, len(windows))
+        LOGGER.info(
+            "walk_forward_start", windows=len(windows), candidates=len(candidates), workers=workers
+        )
+        run_window = partial(_run_window, shared_dir, self._config, candidates, tuned, self._metric)
+        if workers == 1:
+            results = [run_window(window) for window in windows]
+        else:
+            # Contiguous chunks keep a symbol's windows on one worker, its signal cache warm.
+            chunksize = max(1, len(windows) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(run_window, windows, chunksize=chunksize))
+        report = WalkForwardReport(results)
+        LOGGER.info(
+            "walk_forward_complete", windows=len(results), passed=report.passed(self._settings)
+        )
+        return report
+
+
+def cli(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Parallel walk-forward optimisation")
+    parser.add_argument("--config", default="configs/backtest.yaml")
+    parser.add_argument("--walkforward", default="configs/walkforward.yaml")
+    parser.add_argument("--symbol", action="append")
+    parser.add_argument("--data-dir")
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args(argv)
+    config_path = Path(args.config)
+    overrides: Dict[str, Any] = {"data_dir": Path(args.data_dir)} if args.data_dir else {}
+    config = BacktestConfig.from_file(config_path, symbol="", **overrides)
+    settings = WalkForwardSettings.from_file(Path(args.walkforward))
+    symbols = args.symbol or load_yaml(config_path).get("symbols", [])
+    with WalkForwardRunner(config, settings, workers=args.workers) as runner:
+        report = runner.run(symbols)
+    LOGGER.info("walk_forward_report", windows=len(report.results), passed=report.passed(settings))
+
+
+__all__ = [
+    "DEFAULT_GRID",
+    "WalkForwardReport",
+    "WalkForwardResult",
+    "WalkForwardRunner",
+    "WalkForwardSettings",
+    "WalkForwardWindow",
+    "evaluate",
+    "parameter_grid",
+    "schedule",
+]
+
+
+if __name__ == "__main__":
+    cli()
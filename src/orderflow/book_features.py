@@ -0,0 +1,259 @@
+"""Incremental microstructure features over an L2 book stream."""
+
+from __future__ import annotations
+
+import csv
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Deque, Dict, Iterable, Sequence, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src.common.clock import from_epoch_ns
+from src.common.feature_store import FeatureStore
+from src.common.types import FeatureWindow
+
+from .order_book import ASK, BID, DEFAULT_DEPTH, DEFAULT_LEVELS, OrderBook
+
+DEFAULT_HORIZON_MS = 300
+DEFAULT_IMBALANCE_THRESHOLD = 0.2
+
+# Bare names in strategy conditions (``imbalance > theta``) read this timeframe.
+FEATURE_TIMEFRAME = "live"
+
+# Side codes in recorded depth files.
+BID_CODE = 1
+ASK_CODE = -1
+
+
+class _QueueTracker:
+    """Virtual passive order at the back of one side's best level."""
+
+    __slots__ = ("price", "ahead")
+
+    def __init__(self) -> None:
+        self.price = float("nan")
+        self.ahead = 0.0
+
+
+class BookFeatureEngine:
+    """Maintain microprice drift, queue position and imbalance duration per L2 delta.
+
+    Every feature reads only the best levels and the book's running top-N
+    sums, so the cost of an update does not grow with book depth.
+
+    * ``microprice`` weights the touch prices by the opposite side's size;
+      ``microprice_drift`` is its change over the last ``horizon_ms``.
+    * ``bid_queue_position``/``ask_queue_position`` estimate how much of the
+      best-level queue is still ahead (1 = back of the queue, 0 = front) of an
+      order that joined when that price became the touch. Size removed from
+      the level is assumed to come from ahead of it; size added queues behind.
+    * ``imbalance_duration_ms`` is how long the top-N imbalance has stayed
+      beyond ``imbalance_threshold`` on the same side (0 while inside it).
+
+    :meth:`features` also emits the names the microstructure packs read:
+    ``queue_position`` and ``imbalance_supports`` for the side being quoted,
+    and the book's ``depth_slope``.
+    """
+
+    def __init__(
+        self,
+        symbol: str = "",
+        horizon_ms: int = DEFAULT_HORIZON_MS,
+        imbalance_threshold: float = DEFAULT_IMBALANCE_THRESHOLD,
+        depth: int = DEFAULT_DEPTH,
+        levels: int = DEFAULT_LEVELS,
+    ) -> None:
+        self.book = OrderBook(symbol, depth, levels)
+        self._horizon_ms = horizon_ms
+        self._threshold = imbalance_threshold
+        self._queues = {BID: _QueueTracker(), ASK: _QueueTracker()}
+        self._samples: Deque[Tuple[int, float]] = deque()
+        self._microprice = float("nan")
+        self._imbalance_side = 0
+        self._imbalance_since = 0
+        self._timestamp_ms = 0
+
+    def reset(
+        self, bids: Iterable[Sequence[float]], asks: Iterable[Sequence[float]], timestamp_ms: int
+    ) -> None:
+        """Load a full depth snapshot and restart every feature from it."""
+
+        self.book.reset(bids, asks)
+        self.book.timestamp_ms = timestamp_ms
+        self._samples.clear()
+        self._imbalance_side = 0
+        bids_queue, asks_queue = self._queues[BID], self._queues[ASK]
+        bids_queue.price, bids_queue.ahead = self.book.best_bid, self.book.best_bid_size
+        asks_queue.price, asks_queue.ahead = self.book.best_ask, self.book.best_ask_size
+        self._refresh(timestamp_ms)
+
+    def update(self, timestamp_ms: int, side: str, price: float, size: float) -> None:
+        book = self.book
+        before = book.best_bid_size if side == BID else book.best_ask_size
+        book.update(side, price, size, timestamp_ms)
+        self._track_queue(side, price, size, before)
+        self._refresh(timestamp_ms)
+
+    def _track_queue(self, side: str, price: float, size: float, touch_size_before: float) -> None:
+        book = self.book
+        queue = self._queues[side]
+        touch = book.best_bid if side == BID else book.best_ask
+        if touch != queue.price:
+            queue.price = touch
+            queue.ahead = book.best_bid_size if side == BID else book.best_ask_size
+        elif price == touch and size < touch_size_before:
+            queue.ahead = max(0.0, queue.ahead - (touch_size_before - size))
+
+    def _refresh(self, timestamp_ms: int) -> None:
+        book = self.book
+        self._timestamp_ms = timestamp_ms
+        bid_size, ask_size = book.best_bid_size, book.best_ask_size
+        total = bid_size + ask_size
+        if total > 0 and bid_size > 0 and ask_size > 0:
+            self._microprice = (book.best_bid * ask_size + book.best_ask * bid_size) / total
+        else:
+            self._microprice = book.mid
+        samples = self._samples
+        samples.append((timestamp_ms, self._microprice))
+        cutoff = timestamp_ms - self._horizon_ms
+        # Keep the newest sample at or before the cutoff as the drift reference.
+        while len(samples) > 1 and samples[1][0] <= cutoff:
+            samples.popleft()
+
+        imbalance = book.imbalance
+        side = 1 if imbalance >= self._threshold else -1 if imbalance <= -self._threshold else 0
+        if side != self._imbalance_side:
+            self._imbalance_side = side
+            self._imbalance_since = timestamp_ms
+
+    @property
+    def microprice(self) -> float:
+        return self._microprice
+
+    @property
+    def microprice_drift(self) -> float:
+        return self._microprice - self._samples[0][1] if self._samples else 0.0
+
+    def queue_position(self, side: str) -> float:
+        size = self.book.best_bid_size if side == BID else self.book.best_ask_size
+        return min(self._queues[side].ahead / size, 1.0) if size > 0 else 0.0
+
+    def imbalance_duration_ms(self, now_ms: int | None = None) -> int:
+        if not self._imbalance_side:
+            return 0
+        now = self._timestamp_ms if now_ms is None else now_ms
+        return now - self._imbalance_since
+
+    def imbalance_supports(self, side: str) -> bool:
+        """Whether the top-N imbalance leans towards *side* by at least the threshold."""
+
+        imbalance = self.book.imbalance
+        return (imbalance if side == BID else -imbalance) >= self._threshold
+
+    def features(self, now_ms: int | None = None, quote_side: str = BID) -> Dict[str, float]:
+        book = self.book
+        return {
+            "imbalance": book.imbalance,
+            "spread": book.spread,
+            "depth_slope": book.depth_slope(),
+            "microprice": self._microprice,
+            "microprice_drift": self.microprice_drift,
+            "queue_position": self.queue_position(quote_side),
+            "bid_queue_position": self.queue_position(BID),
+            "ask_queue_position": self.queue_position(ASK),
+            "imbalance_supports": float(self.imbalance_supports(quote_side)),
+            "imbalance_duration": float(self.imbalance_duration_ms(now_ms)),
+        }
+
+    def publish(
+        self, store: FeatureStore, now_ms: int | None = None, quote_side: str = BID
+    ) -> None:
+        """Upsert :meth:`features` into *store* under :data:`FEATURE_TIMEFRAME`."""
+
+        now = self._timestamp_ms if now_ms is None else now_ms
+        timestamp = from_epoch_ns(now * 1_000_000)
+        for name, value in self.features(now, quote_side).items():
+            store.upsert(FeatureWindow(name, FEATURE_TIMEFRAME, timestamp, value))
+
+
+@dataclass(slots=True)
+class DepthUpdates:
+    """Recorded L2 deltas; ``side`` is :data:`BID_CODE` or :data:`ASK_CODE`."""
+
+    timestamp_ms: NDArray[np.int64]
+    side: NDArray[np.int8]
+    price: NDArray[np.float64]
+    size: NDArray[np.float64]
+
+    def __len__(self) -> int:
+        return int(self.timestamp_ms.size)
+
+
+def save_depth_updates(updates: DepthUpdates, path: Path) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez(
+        path,
+        timestamp_ms=updates.timestamp_ms,
+        side=updates.side,
+        price=updates.price,
+        size=updates.size,
+    )
+    return path
+
+
+def load_depth_updates(path: Path) -> DepthUpdates:
+    """Read a ``.npz`` recording or a ``timestamp_ms,side,price,size`` CSV with bid/ask sides."""
+
+    if path.suffix == ".npz":
+        with np.load(path) as archive:
+            return DepthUpdates(
+                timestamp_ms=archive["timestamp_ms"].astype(np.int64),
+                side=archive["side"].astype(np.int8),
+                price=archive["price"].astype(np.float64),
+                size=archive["size"].astype(np.float64),
+            )
+    with path.open("r", encoding="utf-8", newline="") as fh:
+        rows = [
+            (
+                int(row["timestamp_ms"]),
+                BID_CODE if row["side"] == BID else ASK_CODE,
+                float(row["price"]),
+                float(row["size"]),
+            )
+            for row in csv.DictReader(fh)
+        ]
+    stamps, sides, prices, sizes = zip(*rows) if rows else ((), (), (), ())
+    return DepthUpdates(
+        timestamp_ms=np.asarray(stamps, dtype=np.int64),
+        side=np.asarray(sides, dtype=np.int8),
+        price=np.asarray(prices, dtype=np.float64),
+        size=np.asarray(sizes, dtype=np.float64),
+    )
+
+
+def replay(engine: BookFeatureEngine, updates: DepthUpdates) -> int:
+    """Feed recorded deltas through *engine*; returns the number applied."""
+
+    update = engine.update
+    sides = np.where(updates.side == BID_CODE, BID, ASK).tolist()
+    rows = zip(updates.timestamp_ms.tolist(), sides, updates.price.tolist(), updates.size.tolist())
+    for stamp, side, price, size in rows:
+        update(stamp, side, price, size)
+    return len(updates)
+
+
+__all__ = [
+    "ASK_CODE",
+    "BID_CODE",
+    "BookFeatureEngine",
+    "DEFAULT_HORIZON_MS",
+    "DEFAULT_IMBALANCE_THRESHOLD",
+    "DepthUpdates",
+    "FEATURE_TIMEFRAME",
+    "load_depth_updates",
+    "replay",
+    "save_depth_updates",
+]
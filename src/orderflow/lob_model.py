@@ -3,11 +3,17 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Tuple
+from typing import Dict, List, Mapping, Sequence, Tuple
 
+import numpy as np
 import torch
 import torch.nn as nn
 
+from .lob_features import LOBSnapshot
+
+# The attention embedding (16) spans both streams, so each side carries 8 levels.
+LOB_LEVELS = 8
+
 
 class _StreamEncoder(nn.Module):
     """Encode bid/ask streams via 1D convolutions."""
@@ -45,10 +51,68 @@ class LobSiameseModel(nn.Module):
     def predict(self, bids: torch.Tensor, asks: torch.Tensor) -> float:
         """Return a scalar probability."""
 
-        with torch.no_grad():
+        with torch.inference_mode():
             return float(self.forward(bids, asks).item())
 
 
+def encode_snapshots(snapshots: Sequence[LOBSnapshot]) -> Tuple[torch.Tensor, torch.Tensor]:
+    """Stack the top :data:`LOB_LEVELS` sizes per side into ``(batch, 1, LOB_LEVELS)`` tensors.
+
+    Missing levels are zero-padded.
+    """
+
+    bids = np.zeros((len(snapshots), 1, LOB_LEVELS), dtype=np.float32)
+    asks = np.zeros_like(bids)
+    for row, snapshot in enumerate(snapshots):
+        for side, levels in ((bids, snapshot.bids), (asks, snapshot.asks)):
+            sizes = [level[1] for level in levels[:LOB_LEVELS]]
+            side[row, 0, : len(sizes)] = sizes
+    return torch.from_numpy(bids), torch.from_numpy(asks)
+
+
+class LobInferenceService:
+    """Score pending book snapshots for many symbols in one batched forward pass.
+
+    The model is traced with :func:`torch.jit.trace` and frozen once, so a
+    call runs the TorchScript graph under :func:`torch.inference_mode` with no
+    Python module dispatch or autograd bookkeeping. *threads* sets the
+    intra-op thread count; it is process-wide in PyTorch.
+    """
+
+    def __init__(self, model: LobSiameseModel, threads: int | None = None) -> None:
+        if threads is not None:
+            torch.set_num_threads(threads)
+        model.eval()
+        example = encode_snapshots([LOBSnapshot(bids=[], asks=[])] * 2)
+        with torch.inference_mode():
+            self._module = torch.jit.freeze(torch.jit.trace(model, example))
+        self._pending: Dict[str, LOBSnapshot] = {}
+
+    def submit(self, symbol: str, snapshot: LOBSnapshot) -> None:
+        """Queue *snapshot* for the next :meth:`flush`; a newer one replaces it."""
+
+        self._pending[symbol] = snapshot
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def flush(self) -> Dict[str, float]:
+        """Score every pending snapshot and return probabilities by symbol."""
+
+        pending, self._pending = self._pending, {}
+        return self.predict(pending)
+
+    def predict(self, snapshots: Mapping[str, LOBSnapshot]) -> Dict[str, float]:
+        if not snapshots:
+            return {}
+        symbols: List[str] = list(snapshots)
+        bids, asks = encode_snapshots([snapshots[symbol] for symbol in symbols])
+        with torch.inference_mode():
+            probabilities = self._module(bids, asks).reshape(-1).tolist()
+        return dict(zip(symbols, probabilities))
+
+
 @dataclass(slots=True)
 class LobModelConfig:
     """Configuration placeholder for future hyper-parameters."""
@@ -57,4 +121,10 @@ class LobModelConfig:
     dropout: float = 0.1
 
 
-__all__ = ["LobSiameseModel", "LobModelConfig"]
+__all__ = [
+    "LOB_LEVELS",
+    "LobInferenceService",
+    "LobModelConfig",
+    "LobSiameseModel",
+    "encode_snapshots",
+]
@@ -0,0 +1,217 @@
+"""Array-backed L2 order book with incremental depth updates."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Iterable, List, Sequence, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .lob_features import LOBSnapshot
+
+BID = "bid"
+ASK = "ask"
+
+DEFAULT_DEPTH = 20
+DEFAULT_LEVELS = 5
+
+
+class _BookSide:
+    """Sorted price levels of one side plus the cached top-``levels`` size sum.
+
+    Prices are stored as sort keys (bids negated) so both sides keep the best
+    level at index 0 and share one insert/delete path.
+    """
+
+    __slots__ = ("keys", "sizes", "count", "top", "_sign", "_depth", "_levels")
+
+    def __init__(self, sign: float, depth: int, levels: int) -> None:
+        self.keys = np.empty(depth, dtype=np.float64)
+        self.sizes = np.empty(depth, dtype=np.float64)
+        self.count = 0
+        self.top = 0.0
+        self._sign = sign
+        self._depth = depth
+        self._levels = levels
+
+    def prices(self, n: int | None = None) -> NDArray[np.float64]:
+        count = self.count if n is None else min(n, self.count)
+        return self.keys[:count] * self._sign
+
+    def update(self, price: float, size: float) -> None:
+        """Set the size at *price*; zero removes the level."""
+
+        key = price * self._sign
+        count = self.count
+        keys, sizes = self.keys, self.sizes
+        # bisect over a <=depth array beats np.searchsorted's per-call overhead.
+        idx = bisect_left(keys, key, 0, count)
+        if idx < count and keys[idx] == key:
+            if size > 0:
+                sizes[idx] = size
+            else:
+                keys[idx : count - 1] = keys[idx + 1 : count]
+                sizes[idx : count - 1] = sizes[idx + 1 : count]
+                count -= 1
+                self.count = count
+        elif size <= 0 or idx >= self._depth:
+            return
+        else:
+            if count == self._depth:
+                count -= 1
+            keys[idx + 1 : count + 1] = keys[idx:count]
+            sizes[idx + 1 : count + 1] = sizes[idx:count]
+            keys[idx] = key
+            sizes[idx] = size
+            count += 1
+            self.count = count
+        if idx < self._levels:
+            # Re-summing the top levels is O(levels) and, unlike running +=/-=
+            # adjustments, never accumulates floating-point error.
+            self.top = float(sizes[: min(count, self._levels)].sum())
+
+    def reset(self, levels: Iterable[Sequence[float]]) -> None:
+        rows = sorted(
+            ((price * self._sign, size) for price, size, *_ in levels if size > 0),
+            key=lambda row: row[0],
+        )[: self._depth]
+        count = len(rows)
+        if count:
+            self.keys[:count], self.sizes[:count] = zip(*rows)
+        self.count = count
+        self.top = float(self.sizes[: min(count, self._levels)].sum())
+
+
+class OrderBook:
+    """Fixed-depth L2 book for one symbol.
+
+    Each side holds at most ``depth`` levels in preallocated NumPy arrays,
+    best first; deltas beyond the tracked depth are ignored. Running sums of
+    the top ``levels`` sizes are re-summed only when a delta lands in them, so
+    :attr:`imbalance` is O(1), and :meth:`depth_slope` is a vectorised fit over ``2 * levels``
+    points. Both match :func:`~src.orderflow.lob_features.order_imbalance` and
+    :func:`~src.orderflow.lob_features.depth_slope` on the equivalent snapshot.
+    """
+
+    def __init__(
+        self, symbol: str = "", depth: int = DEFAULT_DEPTH, levels: int = DEFAULT_LEVELS
+    ) -> None:
+        if not 0 < levels <= depth:
+            raise ValueError("levels must be between 1 and depth")
+        self.symbol = symbol
+        self._levels = levels
+        self._bids = _BookSide(-1.0, depth, levels)
+        self._asks = _BookSide(1.0, depth, levels)
+        self.timestamp_ms = 0
+
+    @classmethod
+    def from_snapshot(
+        cls,
+        snapshot: LOBSnapshot,
+        symbol: str = "",
+        depth: int = DEFAULT_DEPTH,
+        levels: int = DEFAULT_LEVELS,
+    ) -> OrderBook:
+        book = cls(symbol, depth, levels)
+        book.reset(snapshot.bids, snapshot.asks)
+        return book
+
+    @property
+    def levels(self) -> int:
+        return self._levels
+
+    def reset(self, bids: Iterable[Sequence[float]], asks: Iterable[Sequence[float]]) -> None:
+        """Replace both sides with ``[price, size]`` levels in any order."""
+
+        self._bids.reset(bids)
+        self._asks.reset(asks)
+
+    def update(self, side: str, price: float, size: float, timestamp_ms: int | None = None) -> None:
+        """Apply one L2 delta: insert or resize the level at *price*; *size* 0 deletes it."""
+
+        if side == BID:
+            self._bids.update(price, size)
+        elif side == ASK:
+            self._asks.update(price, size)
+        else:
+            raise ValueError(f"unknown book side {side!r}")
+        if timestamp_ms is not None:
+            self.timestamp_ms = timestamp_ms
+
+    def apply(self, deltas: Iterable[Tuple[str, float, float]]) -> None:
+        for side, price, size in deltas:
+            self.update(side, price, size)
+
+    @property
+    def best_bid(self) -> float:
+        return float(-self._bids.keys[0]) if self._bids.count else float("nan")
+
+    @property
+    def best_ask(self) -> float:
+        return float(self._asks.keys[0]) if self._asks.count else float("nan")
+
+    @property
+    def best_bid_size(self) -> float:
+        return float(self._bids.sizes[0]) if self._bids.count else 0.0
+
+    @property
+    def best_ask_size(self) -> float:
+        return float(self._asks.sizes[0]) if self._asks.count else 0.0
+
+    @property
+    def mid(self) -> float:
+        return (self.best_bid + self.best_ask) / 2
+
+    @property
+    def spread(self) -> float:
+        return self.best_ask - self.best_bid
+
+    @property
+    def bid_volume(self) -> float:
+        """Total size of the top ``levels`` bids."""
+
+        return self._bids.top
+
+    @property
+    def ask_volume(self) -> float:
+        return self._asks.top
+
+    @property
+    def imbalance(self) -> float:
+        bid, ask = self._bids.top, self._asks.top
+        return (bid - ask) / max(bid + ask, 1e-9)
+
+    def depth_slope(self) -> float:
+        """Least-squares slope of size against price over the top ``levels`` per side."""
+
+        bids, asks, levels = self._bids, self._asks, self._levels
+        n_bids, n_asks = min(bids.count, levels), min(asks.count, levels)
+        if n_bids + n_asks < 2:
+            return 0.0
+        prices = np.concatenate((bids.prices(n_bids), asks.prices(n_asks)))
+        volumes = np.concatenate((bids.sizes[:n_bids], asks.sizes[:n_asks]))
+        centred = prices - prices.mean()
+        denominator = float(centred @ centred)
+        if denominator == 0:
+            return 0.0
+        return float(centred @ (volumes - volumes.mean())) / denominator
+
+    def bids(self, n: int | None = None) -> Tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """Return ``(prices, sizes)`` of the best *n* bids (all tracked levels by default)."""
+
+        count = self._bids.count if n is None else min(n, self._bids.count)
+        return self._bids.prices(count), self._bids.sizes[:count].copy()
+
+    def asks(self, n: int | None = None) -> Tuple[NDArray[np.float64], NDArray[np.float64]]:
+        count = self._asks.count if n is None else min(n, self._asks.count)
+        return self._asks.prices(count), self._asks.sizes[:count].copy()
+
+    def snapshot(self) -> LOBSnapshot:
+        def rows(prices: NDArray[np.float64], sizes: NDArray[np.float64]) -> List[List[float]]:
+            return [[price, size] for price, size in zip(prices.tolist(), sizes.tolist())]
+
+        return LOBSnapshot(bids=rows(*self.bids()), asks=rows(*self.asks()))
+
+
+__all__ = ["ASK", "BID", "DEFAULT_DEPTH", "DEFAULT_LEVELS", "OrderBook"]
@@ -0,0 +1,196 @@
+"""Columnar trade tape with vectorised features over time ranges."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable, Tuple
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from .tape_features import TapePrint
+
+BUY = 1
+SELL = -1
+
+DEFAULT_CAPACITY = 4096
+
+
+@dataclass(slots=True)
+class TapeColumns:
+    """Read-only views of a range of prints; ``side`` is +1 for buys and -1 for sells."""
+
+    timestamp_ms: NDArray[np.int64]
+    price: NDArray[np.float64]
+    size: NDArray[np.float64]
+    side: NDArray[np.int8]
+
+    def __len__(self) -> int:
+        return int(self.timestamp_ms.size)
+
+    def cvd(self) -> float:
+        """Net aggressive volume: buy size minus sell size."""
+
+        return float(self.size @ self.side)
+
+    def vwap(self) -> float:
+        volume = float(self.size.sum())
+        return float(self.price @ self.size) / volume if volume > 0 else float("nan")
+
+    def trades_per_second(self) -> float:
+        """Same definition as :func:`~src.orderflow.tape_features.trades_per_second`."""
+
+        count = len(self)
+        if not count:
+            return 0.0
+        duration = (int(self.timestamp_ms[-1]) - int(self.timestamp_ms[0])) / 1000
+        return count / duration if duration > 0 else float(count)
+
+    def average_trade_size(self) -> float:
+        return float(self.size.mean()) if len(self) else 0.0
+
+    def aggressor_ratio(self) -> float:
+        total = float(self.size.sum())
+        if total == 0:
+            return 0.5
+        return float(self.size[self.side > 0].sum()) / total
+
+
+class TapeBuffer:
+    """Append-only struct-of-arrays tape for one symbol.
+
+    Prints are stored as ``int64`` millisecond timestamps, ``float64`` price
+    and size and an ``int8`` side: 25 bytes per print against well over 100
+    for a :class:`~src.orderflow.tape_features.TapePrint` in a list. Capacity
+    doubles as needed. Timestamps must be non-decreasing, so any time range
+    maps to a contiguous slice found by binary search.
+    """
+
+    def __init__(self, symbol: str = "", capacity: int = DEFAULT_CAPACITY) -> None:
+        self.symbol = symbol
+        self._timestamps = np.empty(capacity, dtype=np.int64)
+        self._prices = np.empty(capacity, dtype=np.float64)
+        self._sizes = np.empty(capacity, dtype=np.float64)
+        self._sides = np.empty(capacity, dtype=np.int8)
+        self._size = 0
+
+    @classmethod
+    def from_prints(
+        cls, prints: Iterable[TapePrint], symbol: str = "", price: float = float("nan")
+    ) -> TapeBuffer:
+        """Pack :class:`TapePrint` objects, which carry no price, using *price* for every row."""
+
+        rows = [
+            (item.timestamp_ms, item.size, BUY if item.side == "buy" else SELL) for item in prints
+        ]
+        buffer = cls(symbol, capacity=max(len(rows), 1))
+        if rows:
+            stamps, sizes, sides = zip(*rows)
+            buffer.extend(stamps, np.full(len(rows), price), sizes, sides)
+        return buffer
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by stored prints (excluding spare capacity)."""
+
+        return self._size * (8 + 8 + 8 + 1)
+
+    def _reserve(self, rows: int) -> None:
+        needed = self._size + rows
+        capacity = self._timestamps.size
+        if needed <= capacity:
+            return
+        capacity = max(needed, 2 * capacity)
+        for name in ("_timestamps", "_prices", "_sizes", "_sides"):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[: self._size] = old[: self._size]
+            setattr(self, name, new)
+
+    def append(self, timestamp_ms: int, price: float, size: float, side: str) -> None:
+        size_ = self._size
+        if size_ and timestamp_ms < self._timestamps[size_ - 1]:
+            raise ValueError("tape timestamps must be non-decreasing")
+        if size_ == self._timestamps.size:
+            self._reserve(1)
+        self._timestamps[size_] = timestamp_ms
+        self._prices[size_] = price
+        self._sizes[size_] = size
+        self._sides[size_] = BUY if side == "buy" else SELL
+        self._size = size_ + 1
+
+    def extend(
+        self, timestamp_ms: ArrayLike, price: ArrayLike, size: ArrayLike, side: ArrayLike
+    ) -> None:
+        """Append columns at once; *side* holds +1/-1 codes or ``"buy"``/``"sell"`` strings."""
+
+        stamps = np.asarray(timestamp_ms, dtype=np.int64)
+        if not stamps.size:
+            return
+        sides = np.asarray(side)
+        if sides.dtype.kind in "US":
+            sides = np.where(sides == "buy", BUY, SELL)
+        start = self._size
+        if np.any(stamps[1:] < stamps[:-1]) or (start and stamps[0] < self._timestamps[start - 1]):
+            raise ValueError("tape timestamps must be non-decreasing")
+        self._reserve(stamps.size)
+        end = start + stamps.size
+        self._timestamps[start:end] = stamps
+        self._prices[start:end] = price
+        self._sizes[start:end] = size
+        self._sides[start:end] = sides
+        self._size = end
+
+    def rows(self, start_ms: int | None = None, end_ms: int | None = None) -> Tuple[int, int]:
+        """Row bounds of prints with ``start_ms <= timestamp < end_ms``."""
+
+        stamps = self._timestamps[: self._size]
+        lo = 0 if start_ms is None else int(stamps.searchsorted(start_ms, side="left"))
+        hi = self._size if end_ms is None else int(stamps.searchsorted(end_ms, side="left"))
+        return lo, max(lo, hi)
+
+    def columns(self, start_ms: int | None = None, end_ms: int | None = None) -> TapeColumns:
+        lo, hi = self.rows(start_ms, end_ms)
+        views = [
+            array[lo:hi] for array in (self._timestamps, self._prices, self._sizes, self._sides)
+        ]
+        for view in views:
+            view.flags.writeable = False
+        return TapeColumns(*views)
+
+    def last(self, window_ms: int) -> TapeColumns:
+        """Prints within ``window_ms`` of the newest one (``timestamp > newest - window_ms``)."""
+
+        if not self._size:
+            return self.columns()
+        return self.columns(int(self._timestamps[self._size - 1]) - window_ms + 1)
+
+    def cvd_series(
+        self, start_ms: int | None = None, end_ms: int | None = None
+    ) -> NDArray[np.float64]:
+        """Running cumulative volume delta after each print of the range."""
+
+        view = self.columns(start_ms, end_ms)
+        return np.cumsum(view.size * view.side)
+
+    def trailing_counts(self, window_ms: int) -> NDArray[np.intp]:
+        """Prints in the ``window_ms`` ending at (and including) each print."""
+
+        stamps = self._timestamps[: self._size]
+        return np.arange(1, self._size + 1) - stamps.searchsorted(stamps - window_ms, side="right")
+
+    def bursts(self, window_ms: int, min_prints: int) -> NDArray[np.intp]:
+        """Rows where the trailing ``window_ms`` print count first reaches *min_prints*.
+
+        Each returned row starts a burst that lasts while the count stays at or
+        above the threshold.
+        """
+
+        active = self.trailing_counts(window_ms) >= min_prints
+        return np.flatnonzero(active & ~np.concatenate(([False], active[:-1])))
+
+
+__all__ = ["BUY", "SELL", "DEFAULT_CAPACITY", "TapeBuffer", "TapeColumns"]
@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
+from collections import deque
 from dataclasses import dataclass
-from typing import Iterable
+from typing import Deque, Dict, Iterable, Sequence, Tuple
 
 
 @dataclass(slots=True)
@@ -18,35 +19,152 @@ class TapePrint:
 def trades_per_second(prints: Iterable[TapePrint]) -> float:
     """Compute trade velocity for the provided prints."""
 
-    prints_list = list(prints)
-    if not prints_list:
+    count = 0
+    first = last = 0
+    for print_ in prints:
+        if not count:
+            first = print_.timestamp_ms
+        last = print_.timestamp_ms
+        count += 1
+    if not count:
         return 0.0
-    duration = (prints_list[-1].timestamp_ms - prints_list[0].timestamp_ms) / 1000
+    duration = (last - first) / 1000
     if duration <= 0:
-        return float(len(prints_list))
-    return float(len(prints_list) / duration)
+        return float(count)
+    return float(count / duration)
 
 
 def average_trade_size(prints: Iterable[TapePrint]) -> float:
     """Return average trade size."""
 
-    prints_list = list(prints)
-    if not prints_list:
+    count = 0
+    total = 0.0
+    for print_ in prints:
+        count += 1
+        total += print_.size
+    if not count:
         return 0.0
-    return float(sum(print_.size for print_ in prints_list) / len(prints_list))
+    return float(total / count)
 
 
 def aggressor_ratio(prints: Iterable[TapePrint]) -> float:
     """Share of aggressive buy volume."""
 
-    prints_list = list(prints)
-    if not prints_list:
-        return 0.5
-    buy_volume = sum(print_.size for print_ in prints_list if print_.side == "buy")
-    total_volume = sum(print_.size for print_ in prints_list)
+    buy_volume = total_volume = 0.0
+    for print_ in prints:
+        total_volume += print_.size
+        if print_.side == "buy":
+            buy_volume += print_.size
     if total_volume == 0:
         return 0.5
     return float(buy_volume / total_volume)
 
 
-__all__ = ["TapePrint", "trades_per_second", "average_trade_size", "aggressor_ratio"]
+# Trailing windows used by the tape_burst/aggressor_ratio (5s) and tape_tps (60s) features.
+DEFAULT_WINDOWS_MS: Tuple[int, ...] = (5_000, 60_000)
+
+
+class TapeWindow:
+    """Running tape statistics over the prints of the last ``window_ms``.
+
+    A print stays in the window while ``timestamp_ms > now - window_ms``, where
+    ``now`` is the newest print (or the time passed to :meth:`evict`). Count,
+    volume and buy volume are adjusted as prints enter and leave, so every
+    feature is O(1) and updates are amortised O(1).
+    """
+
+    __slots__ = ("window_ms", "_prints", "count", "volume", "buy_volume")
+
+    def __init__(self, window_ms: int) -> None:
+        if window_ms <= 0:
+            raise ValueError("window_ms must be positive")
+        self.window_ms = window_ms
+        self._prints: Deque[Tuple[int, float, bool]] = deque()
+        self.count = 0
+        self.volume = 0.0
+        self.buy_volume = 0.0
+
+    def add(self, timestamp_ms: int, size: float, is_buy: bool) -> None:
+        self._prints.append((timestamp_ms, size, is_buy))
+        self.count += 1
+        self.volume += size
+        if is_buy:
+            self.buy_volume += size
+        self.evict(timestamp_ms)
+
+    def evict(self, now_ms: int) -> None:
+        """Drop prints that are ``window_ms`` or more older than *now_ms*."""
+
+        prints = self._prints
+        cutoff = now_ms - self.window_ms
+        while prints and prints[0][0] <= cutoff:
+            _, size, is_buy = prints.popleft()
+            self.count -= 1
+            self.volume -= size
+            if is_buy:
+                self.buy_volume -= size
+        if not prints:
+            # Start from exact zeros so subtraction error cannot accumulate.
+            self.volume = self.buy_volume = 0.0
+
+    def trades_per_second(self) -> float:
+        """Same definition as :func:`trades_per_second` applied to the window's prints."""
+
+        if not self.count:
+            return 0.0
+        duration = (self._prints[-1][0] - self._prints[0][0]) / 1000
+        if duration <= 0:
+            return float(self.count)
+        return self.count / duration
+
+    def average_trade_size(self) -> float:
+        return self.volume / self.count if self.count else 0.0
+
+    def aggressor_ratio(self) -> float:
+        if not self.count or self.volume <= 0:
+            return 0.5
+        return self.buy_volume / self.volume
+
+
+class RollingTape:
+    """Tape features for several trailing windows, fed one print at a time."""
+
+    def __init__(self, windows_ms: Sequence[int] = DEFAULT_WINDOWS_MS) -> None:
+        self._windows = {window_ms: TapeWindow(window_ms) for window_ms in windows_ms}
+        self._all = tuple(self._windows.values())
+
+    def add(self, timestamp_ms: int, size: float, side: str) -> None:
+        is_buy = side == "buy"
+        for window in self._all:
+            window.add(timestamp_ms, size, is_buy)
+
+    def add_print(self, print_: TapePrint) -> None:
+        self.add(print_.timestamp_ms, print_.size, print_.side)
+
+    def evict(self, now_ms: int) -> None:
+        """Age every window to *now_ms* without a new print."""
+
+        for window in self._all:
+            window.evict(now_ms)
+
+    def window(self, window_ms: int) -> TapeWindow:
+        return self._windows[window_ms]
+
+    def features(self, window_ms: int) -> Dict[str, float]:
+        window = self._windows[window_ms]
+        return {
+            "trades_per_second": window.trades_per_second(),
+            "average_trade_size": window.average_trade_size(),
+            "aggressor_ratio": window.aggressor_ratio(),
+        }
+
+
+__all__ = [
+    "DEFAULT_WINDOWS_MS",
+    "RollingTape",
+    "TapePrint",
+    "TapeWindow",
+    "trades_per_second",
+    "average_trade_size",
+    "aggressor_ratio",
+]
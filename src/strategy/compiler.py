@@ -0,0 +1,563 @@
+"""Compile Strategy DSL trigger/filter expressions into evaluable programs.
+
+Expressions are parsed once into a small AST and lowered into a linear list
+of closures shared by every strategy in a :class:`CompiledProgram`, so a
+sub-expression such as ``ema(H1,200)`` is computed once per evaluation no
+matter how many strategies reference it.
+
+Feature references resolve to :class:`~src.common.feature_store.FeatureStore`
+slots ``(name, timeframe)``:
+
+* ``fn(TF)`` reads ``(fn, TF)``, e.g. ``close(H1)`` -> ``("close", "H1")``;
+* ``fn(TF, a, b)`` reads ``(fn_a_b, TF)``, e.g. ``ema(H1,200)`` -> ``("ema_200", "H1")``;
+* ``fn(a)`` without a timeframe and bare names such as ``lob_imbalance`` or
+  ``news.hard`` read ``(name, "live")`` unless the name is a strategy parameter.
+
+``qNN`` on the right of a comparison is the NN-th percentile of the left-hand
+feature's history, and ``crosses_up``/``crosses_down`` compare the last two
+values of feature history. Missing features evaluate to ``None``, which
+propagates through arithmetic, comparisons and ``not`` and makes the
+enclosing condition false. ``and``/``or`` use three-valued logic: they
+return ``None`` when a missing operand could change the result, so
+``not (a and b)`` with ``a`` missing is only true when ``b`` is false.
+"""
+
+from __future__ import annotations
+
+import operator
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Sequence, Tuple
+
+from structlog import get_logger
+
+from src.common.feature_store import FeatureStore
+from src.strategy.dsl import StrategyDefinition
+
+LOGGER = get_logger(__name__)
+
+DEFAULT_TIMEFRAME = "live"
+TIMEFRAME_PATTERN = re.compile(r"^(?:[MHDW]\d+|tick|live)$")
+QUANTILE_PATTERN = re.compile(r"^q(\d{1,2})$")
+
+_TOKEN_PATTERN = re.compile(
+    r"\s*(?:(?P<number>\d+(?:\.\d+)?)|(?P<name>[A-Za-z_][A-Za-z0-9_.]*)|(?P<op>==|!=|>=|<=|[<>+\-*/(),]))"
+)
+_KEYWORDS = {"and", "or", "not", "true", "false", "crosses_up", "crosses_down"}
+_COMPARISONS: Dict[str, Callable[[Any, Any], bool]] = {
+    ">": operator.gt,
+    "<": operator.lt,
+    ">=": operator.ge,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+_ARITHMETIC: Dict[str, Callable[[Any, Any], Any]] = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.truediv,
+}
+
+
+# --------------------------------------------------------------------------- AST
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class Const:
+    value: Any
+
+    # ``True == 1.0`` and both hash alike; compare types too so CSE keeps them apart.
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, Const)
+            and type(other.value) is type(self.value)
+            and other.value == self.value
+        )
+
+    def __hash__(self) -> int:
+        return hash((type(self.value), self.value))
+
+
+@dataclass(frozen=True, slots=True)
+class Slot:
+    name: str
+    timeframe: str
+
+
+@dataclass(frozen=True, slots=True)
+class Quantile:
+    slot: Slot
+    q: float
+
+
+@dataclass(frozen=True, slots=True)
+class BinOp:
+    op: str
+    left: Node
+    right: Node
+
+
+@dataclass(frozen=True, slots=True)
+class Compare:
+    op: str
+    left: Node
+    right: Node
+
+
+@dataclass(frozen=True, slots=True)
+class Cross:
+    direction: str
+    left: Node
+    right: Node
+
+
+@dataclass(frozen=True, slots=True)
+class Logical:
+    op: str
+    operands: Tuple[Node, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class Negate:
+    operand: Node
+
+
+Node = Const | Slot | Quantile | BinOp | Compare | Cross | Logical | Negate
+
+
+# ------------------------------------------------------------------------ parser
+
+
+def _tokenize(text: str) -> List[Tuple[str, str]]:
+    tokens: List[Tuple[str, str]] = []
+    position = 0
+    text = text.strip()
+    while position < len(text):
+        match = _TOKEN_PATTERN.match(text, position)
+        if match is None or match.end() == position:
+            raise ValueError(f"Unexpected character in expression {text!r} at {position}")
+        kind = match.lastgroup or "op"
+        value = match.group(kind)
+        if kind == "name" and value in _KEYWORDS:
+            kind = "keyword"
+        tokens.append((kind, value))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser producing :data:`Node` trees."""
+
+    def __init__(self, text: str, params: Mapping[str, Any]) -> None:
+        self._text = text
+        self._tokens = _tokenize(text)
+        self._pos = 0
+        self._params = params
+
+    def parse(self) -> Node:
+        node = self._or()
+        if self._pos != len(self._tokens):
+            raise ValueError(f"Unexpected token {self._tokens[self._pos][1]!r} in {self._text!r}")
+        return node
+
+    def _peek(self) -> Tuple[str, str] | None:
+        return self._tokens[self._pos] if self._pos < len(self._tokens) else None
+
+    def _accept(self, *values: str) -> str | None:
+        token = self._peek()
+        if token is not None and token[1] in values:
+            self._pos += 1
+            return token[1]
+        return None
+
+    def _expect(self, value: str) -> None:
+        if self._accept(value) is None:
+            raise ValueError(f"Expected {value!r} in {self._text!r}")
+
+    def _or(self) -> Node:
+        operands = [self._and()]
+        while self._accept("or"):
+            operands.append(self._and())
+        return operands[0] if len(operands) == 1 else Logical("or", tuple(operands))
+
+    def _and(self) -> Node:
+        operands = [self._not()]
+        while self._accept("and"):
+            operands.append(self._not())
+        return operands[0] if len(operands) == 1 else Logical("and", tuple(operands))
+
+    def _not(self) -> Node:
+        if self._accept("not"):
+            return Negate(self._not())
+        return self._comparison()
+
+    def _comparison(self) -> Node:
+        left = self._arith()
+        op = self._accept(*_COMPARISONS, "crosses_up", "crosses_down")
+        if op is None:
+            return left
+        right = self._arith()
+        if isinstance(right, Quantile):
+            if not isinstance(left, Slot):
+                raise ValueError(
+                    f"Quantile comparisons need a feature on the left in {self._text!r}"
+                )
+            right = Quantile(slot=left, q=right.q)
+        if op in ("crosses_up", "crosses_down"):
+            return Cross(op, left, right)
+        return Compare(op, left, right)
+
+    def _arith(self) -> Node:
+        node = self._term()
+        while (op := self._accept("+", "-")) is not None:
+            node = BinOp(op, node, self._term())
+        return node
+
+    def _term(self) -> Node:
+        node = self._unary()
+        while (op := self._accept("*", "/")) is not None:
+            node = BinOp(op, node, self._unary())
+        return node
+
+    def _unary(self) -> Node:
+        if self._accept("-"):
+            return BinOp("-", Const(0.0), self._unary())
+        return self._atom()
+
+    def _atom(self) -> Node:
+        token = self._peek()
+        if token is None:
+            raise ValueError(f"Unexpected end of expression {self._text!r}")
+        kind, value = token
+        self._pos += 1
+        if kind == "number":
+            return Const(float(value))
+        if value in ("true", "false"):
+            return Const(value == "true")
+        if value == "(":
+            node = self._or()
+            self._expect(")")
+            return node
+        if kind != "name":
+            raise ValueError(f"Unexpected token {value!r} in {self._text!r}")
+        if self._accept("("):
+            return self._call(value)
+        quantile = QUANTILE_PATTERN.match(value)
+        if quantile is not None:
+            return Quantile(slot=Slot("", ""), q=int(quantile.group(1)) / 100)
+        if value in self._params:
+            return Const(self._params[value])
+        return Slot(value, DEFAULT_TIMEFRAME)
+
+    def _call(self, function: str) -> Node:
+        args: List[str] = []
+        if not self._accept(")"):
+            while True:
+                token = self._peek()
+                if token is None or token[0] not in ("name", "number"):
+                    raise ValueError(f"Function arguments must be literals in {self._text!r}")
+                args.append(token[1])
+                self._pos += 1
+                if self._accept(")"):
+                    break
+                self._expect(",")
+        timeframe = DEFAULT_TIMEFRAME
+        if args and TIMEFRAME_PATTERN.match(args[0]):
+            timeframe = args.pop(0)
+        return Slot("_".join([function, *args]), timeframe)
+
+
+def parse_expression(text: str, params: Mapping[str, Any] | None = None) -> Node:
+    """Parse a DSL expression into an AST node."""
+
+    return _Parser(text, params or {}).parse()
+
+
+# ---------------------------------------------------------------------- lowering
+
+Step = Callable[[List[Any], FeatureStore], Any]
+
+
+def _previous(store: FeatureStore, slot: Slot) -> float | None:
+    history = store.history(slot.name, slot.timeframe)
+    if history is None or len(history) < 2:
+        return None
+    return float(history.values(2)[0])
+
+
+@dataclass(slots=True)
+class EvaluationStats:
+    """Accumulated evaluation cost for one strategy."""
+
+    calls: int = 0
+    total_ns: int = 0
+
+    @property
+    def mean_ns(self) -> float:
+        return self.total_ns / self.calls if self.calls else 0.0
+
+
+@dataclass(slots=True)
+class _CompiledStrategy:
+    name: str
+    steps: Tuple[int, ...]
+    trigger: Tuple[str, Tuple[int, ...]]
+    filters: Tuple[str, Tuple[int, ...]]
+    stats: EvaluationStats = field(default_factory=EvaluationStats)
+
+
+def _holds(mode: str, indices: Tuple[int, ...], values: List[Any]) -> bool:
+    if mode == "any":
+        return any(values[idx] for idx in indices)
+    return all(values[idx] for idx in indices)
+
+
+class _Unset:
+    __slots__ = ()
+
+
+_UNSET = _Unset()
+
+
+class CompiledProgram:
+    """Shared step list plus per-strategy entry points."""
+
+    def __init__(self, steps: Sequence[Step], strategies: Sequence[_CompiledStrategy]) -> None:
+        self._steps = list(steps)
+        self._strategies = list(strategies)
+
+    @property
+    def step_count(self) -> int:
+        return len(self._steps)
+
+    @property
+    def strategies(self) -> List[str]:
+        return [strategy.name for strategy in self._strategies]
+
+    def evaluate(self, store: FeatureStore) -> Dict[str, bool]:
+        """Return whether each strategy's trigger and filters hold for *store*."""
+
+        steps = self._steps
+        values: List[Any] = [_UNSET] * len(steps)
+        results: Dict[str, bool] = {}
+        clock = time.perf_counter_ns
+        for strategy in self._strategies:
+            started = clock()
+            for idx in strategy.steps:
+                if values[idx] is _UNSET:
+                    values[idx] = steps[idx](values, store)
+            trigger_mode, trigger = strategy.trigger
+            filter_mode, filters = strategy.filters
+            results[strategy.name] = _holds(trigger_mode, trigger, values) and _holds(
+                filter_mode, filters, values
+            )
+            strategy.stats.calls += 1
+            strategy.stats.total_ns += clock() - started
+        return results
+
+    def stats(self) -> Dict[str, EvaluationStats]:
+        """Return evaluation cost per strategy.
+
+        Shared sub-expressions are charged to the first strategy that needs them.
+        """
+
+        return {strategy.name: strategy.stats for strategy in self._strategies}
+
+    def report(self) -> None:
+        for name, stats in self.stats().items():
+            LOGGER.info(
+                "dsl_evaluation_cost", strategy=name, calls=stats.calls, mean_ns=stats.mean_ns
+            )
+
+
+class StrategyCompiler:
+    """Lower strategy definitions into a single :class:`CompiledProgram`."""
+
+    def __init__(self, params: Mapping[str, Any] | None = None) -> None:
+        self._params = dict(params or {})
+        self._steps: List[Step] = []
+        self._index: Dict[Node, int] = {}
+
+    def compile(self, definitions: Iterable[StrategyDefinition]) -> CompiledProgram:
+        strategies = [self._compile_strategy(definition) for definition in definitions]
+        LOGGER.debug("dsl_compiled", strategies=len(strategies), steps=len(self._steps))
+        return CompiledProgram(self._steps, strategies)
+
+    def compile_expression(
+        self, text: str, params: Mapping[str, Any] | None = None
+    ) -> Callable[[FeatureStore], Any]:
+        """Compile one expression, such as an exit ``stop``, into a callable over a store.
+
+        Steps are shared with anything else this compiler has lowered.
+        """
+
+        order: List[int] = []
+        root = self._lower(parse_expression(text, {**self._params, **(params or {})}), order, set())
+        steps = self._steps
+
+        def evaluate(store: FeatureStore) -> Any:
+            values: List[Any] = [_UNSET] * len(steps)
+            for idx in order:
+                values[idx] = steps[idx](values, store)
+            return values[root]
+
+        return evaluate
+
+    def _compile_strategy(self, definition: StrategyDefinition) -> _CompiledStrategy:
+        params = {**self._params, **definition.raw.get("params", {})}
+        order: List[int] = []
+        seen: set[int] = set()
+        trigger = self._compile_block(definition.raw.get("trigger"), params, order, seen)
+        filters = self._compile_block(definition.raw.get("filters"), params, order, seen)
+        return _CompiledStrategy(
+            name=definition.name, steps=tuple(order), trigger=trigger, filters=filters
+        )
+
+    def _compile_block(
+        self, block: Any, params: Mapping[str, Any], order: List[int], seen: set[int]
+    ) -> Tuple[str, Tuple[int, ...]]:
+        if not block:
+            return "all", ()
+        if (
+            not isinstance(block, dict)
+            or len(block) != 1
+            or next(iter(block)) not in ("all", "any")
+        ):
+            raise ValueError(
+                f"Condition block must be {{all: [...]}} or {{any: [...]}}, got {block!r}"
+            )
+        mode, expressions = next(iter(block.items()))
+        indices = tuple(
+            self._lower(parse_expression(str(text), params), order, seen)
+            for text in expressions or []
+        )
+        return mode, indices
+
+    def _lower(self, node: Node, order: List[int], seen: set[int]) -> int:
+        children: Tuple[Node, ...] = ()
+        if isinstance(node, (BinOp, Compare, Cross)):
+            children = (node.left, node.right)
+        elif isinstance(node, Logical):
+            children = node.operands
+        elif isinstance(node, Negate):
+            children = (node.operand,)
+        child_indices = [self._lower(child, order, seen) for child in children]
+        idx = self._index.get(node)
+        if idx is None:
+            idx = len(self._steps)
+            self._steps.append(self._build(node, child_indices))
+            self._index[node] = idx
+        if idx not in seen:
+            seen.add(idx)
+            order.append(idx)
+        return idx
+
+    def _build(self, node: Node, children: List[int]) -> Step:
+        if isinstance(node, Const):
+            value = node.value
+            return lambda values, store: value
+        if isinstance(node, Slot):
+            name, timeframe = node.name, node.timeframe
+
+            def load(values: List[Any], store: FeatureStore) -> Any:
+                window = store.get(name, timeframe)
+                return window.value if window is not None else None
+
+            return load
+        if isinstance(node, Quantile):
+            slot, q = node.slot, node.q
+            return lambda values, store: store.quantile(slot.name, slot.timeframe, q)
+        if isinstance(node, (BinOp, Compare)):
+            func = _ARITHMETIC[node.op] if isinstance(node, BinOp) else _COMPARISONS[node.op]
+            left, right = children
+            as_bool = isinstance(node, Compare)
+
+            def apply(values: List[Any], store: FeatureStore) -> Any:
+                lhs, rhs = values[left], values[right]
+                if lhs is None or rhs is None:
+                    return None
+                try:
+                    result = func(lhs, rhs)
+                except (TypeError, ZeroDivisionError):
+                    return None
+                return bool(result) if as_bool else result
+
+            return apply
+        if isinstance(node, Cross):
+            return self._build_cross(node, children)
+        if isinstance(node, Logical):
+            indices = tuple(children)
+            # Kleene logic: a deciding operand wins, otherwise a missing one yields None.
+            decisive = node.op == "or"
+
+            def combine(values: List[Any], store: FeatureStore) -> bool | None:
+                missing = False
+                for idx in indices:
+                    value = values[idx]
+                    if value is None:
+                        missing = True
+                    elif bool(value) is decisive:
+                        return decisive
+                return None if missing else not decisive
+
+            return combine
+        if isinstance(node, Negate):
+            (operand,) = children
+            return lambda values, store: None if values[operand] is None else not values[operand]
+        raise TypeError(f"Unsupported node {node!r}")
+
+    def _build_cross(self, node: Cross, children: List[int]) -> Step:
+        for side in (node.left, node.right):
+            if not isinstance(side, (Slot, Const)):
+                raise ValueError("crosses_up/crosses_down operands must be features or constants")
+        left_node, right_node = node.left, node.right
+        left, right = children
+        upward = node.direction == "crosses_up"
+
+        def previous(side: Node, store: FeatureStore) -> Any:
+            return side.value if isinstance(side, Const) else _previous(store, side)
+
+        def cross(values: List[Any], store: FeatureStore) -> bool | None:
+            current_left, current_right = values[left], values[right]
+            prev_left, prev_right = previous(left_node, store), previous(right_node, store)
+            if (
+                current_left is None
+                or current_right is None
+                or prev_left is None
+                or prev_right is None
+            ):
+                return None
+            if upward:
+                return bool(prev_left <= prev_right and current_left > current_right)
+            return bool(prev_left >= prev_right and current_left < current_right)
+
+        return cross
+
+
+def compile_strategies(
+    definitions: Iterable[StrategyDefinition], params: Mapping[str, Any] | None = None
+) -> CompiledProgram:
+    """Compile *definitions* into one program with shared sub-expressions."""
+
+    return StrategyCompiler(params).compile(definitions)
+
+
+def compile_expression(
+    text: str, params: Mapping[str, Any] | None = None
+) -> Callable[[FeatureStore], Any]:
+    """Compile a standalone expression such as an exit ``stop`` into a callable."""
+
+    return StrategyCompiler(params).compile_expression(text)
+
+
+__all__ = [
+    "CompiledProgram",
+    "EvaluationStats",
+    "StrategyCompiler",
+    "compile_expression",
+    "compile_strategies",
+    "parse_expression",
+    "DEFAULT_TIMEFRAME",
+]
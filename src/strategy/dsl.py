@@ -2,17 +2,32 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
+import threading
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Tuple
+
+from structlog import get_logger
+
+from src.common.srl import dump_msgpack, load_msgpack
 
 try:  # pragma: no cover - optional dependency
     import yaml
 except Exception:  # pragma: no cover - fallback when PyYAML unavailable
     yaml = None  # type: ignore[assignment]
 
+LOGGER = get_logger(__name__)
+
 REQUIRED_FIELDS = {"name", "regime_allow", "features", "trigger", "filters", "entry", "exit", "risk", "routing"}
+STRATEGY_SUFFIXES = (".yaml", ".yml", ".json")
+
+
+def _yaml_loader() -> Any:
+    """Prefer libyaml's C loader, falling back to the pure-Python one."""
+
+    return getattr(yaml, "CSafeLoader", None) or yaml.SafeLoader
 
 
 @dataclass(slots=True)
@@ -26,15 +41,83 @@ class StrategyDefinition:
         return self.raw
 
 
+@dataclass(slots=True)
+class _ParseCacheEntry:
+    mtime_ns: int
+    size: int
+    digest: str
+    definitions: Tuple[StrategyDefinition, ...]
+
+
+_PARSE_CACHE: Dict[Path, _ParseCacheEntry] = {}
+_PARSE_CACHE_LOCK = threading.Lock()
+
+
 class StrategyDSLParser:
-    """Parse YAML or JSON DSL files into validated strategy definitions."""
+    """Parse YAML or JSON DSL files into validated strategy definitions.
+
+    Results are cached in memory keyed on the file's path, mtime and content
+    hash. With ``cache_dir`` set, validated definitions are also stored there
+    as msgpack named by content hash, so a restart skips YAML parsing for
+    unchanged files. Unreadable cache entries are discarded and rebuilt.
+    """
 
-    def __init__(self, path: Path) -> None:
+    def __init__(self, path: Path, cache_dir: Path | None = None) -> None:
         self._path = path
+        self._cache_dir = cache_dir
 
     def parse(self) -> List[StrategyDefinition]:
-        text = self._path.read_text(encoding="utf-8")
-        document = self._load_document(text)
+        key = self._path.resolve()
+        stat = key.stat()
+        with _PARSE_CACHE_LOCK:
+            cached = _PARSE_CACHE.get(key)
+        if cached is not None and (cached.mtime_ns, cached.size) == (
+            stat.st_mtime_ns,
+            stat.st_size,
+        ):
+            return list(cached.definitions)
+        data = key.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        if cached is not None and cached.digest == digest:
+            definitions = cached.definitions
+        else:
+            definitions = self._load_definitions(digest, data)
+        with _PARSE_CACHE_LOCK:
+            _PARSE_CACHE[key] = _ParseCacheEntry(
+                stat.st_mtime_ns, stat.st_size, digest, definitions
+            )
+        return list(definitions)
+
+    def _load_definitions(self, digest: str, data: bytes) -> Tuple[StrategyDefinition, ...]:
+        """Validated definitions for *data*, from the disk cache when it holds a usable entry."""
+
+        cache_file = self._cache_dir / f"{digest}.msgpack" if self._cache_dir is not None else None
+        if cache_file is not None and cache_file.exists():
+            try:
+                raws = load_msgpack(cache_file)["definitions"]
+                return tuple(StrategyDefinition(name=raw["name"], raw=raw) for raw in raws)
+            except (KeyError, TypeError, ValueError) as exc:
+                LOGGER.warning("dsl_cache_discarded", path=str(cache_file), error=str(exc))
+                cache_file.unlink(missing_ok=True)
+        definitions = tuple(self._parse_document(self._load_document(data.decode("utf-8"))))
+        if cache_file is not None:
+            self._store_cached(cache_file, definitions)
+        return definitions
+
+    def _store_cached(self, cache_file: Path, definitions: Tuple[StrategyDefinition, ...]) -> None:
+        raws = [definition.raw for definition in definitions]
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            dump_msgpack({"definitions": raws}, cache_file)
+            # Documents msgpack cannot read back (e.g. integer map keys) are not cached.
+            if load_msgpack(cache_file).get("definitions") == raws:
+                return
+        except (OSError, TypeError, ValueError):
+            pass
+        LOGGER.debug("dsl_cache_skip", path=str(self._path), reason="definitions do not round-trip")
+        cache_file.unlink(missing_ok=True)
+
+    def _parse_document(self, document: Any) -> List[StrategyDefinition]:
         if not isinstance(document, dict):
             raise ValueError("Strategy DSL root must be a mapping")
         strategies = document.get("strategies", [])
@@ -44,10 +127,15 @@ class StrategyDSLParser:
 
     def _load_document(self, text: str) -> Dict[str, Any]:
         if yaml is not None:
-            return yaml.safe_load(text)  # type: ignore[return-value]
+            try:
+                return yaml.load(text, Loader=_yaml_loader())  # type: ignore[no-any-return]
+            except yaml.YAMLError as exc:
+                raise ValueError(f"Invalid strategy YAML in {self._path}: {exc}") from exc
         return json.loads(text)
 
-    def _validate(self, strategy: Dict[str, Any]) -> StrategyDefinition:
+    def _validate(self, strategy: Any) -> StrategyDefinition:
+        if not isinstance(strategy, dict):
+            raise ValueError(f"Strategy entries must be mappings, got {strategy!r}")
         missing = REQUIRED_FIELDS - strategy.keys()
         if missing:
             raise ValueError(f"Strategy missing fields: {sorted(missing)}")
@@ -57,4 +145,98 @@ class StrategyDSLParser:
         return StrategyDefinition(name=name, raw=strategy)
 
 
-__all__ = ["StrategyDSLParser", "StrategyDefinition"]
+class StrategyRegistry:
+    """Hot-reloadable view of the main strategy file plus a drop-in directory.
+
+    :meth:`refresh` only stats files and re-parses the ones whose metadata
+    changed, then publishes a new immutable tuple of definitions in one
+    assignment, so readers on the trading loop never wait on a reload.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        drop_dir: Path | None = None,
+        cache_dir: Path | None = None,
+        on_change: Callable[[Tuple[StrategyDefinition, ...]], None] | None = None,
+    ) -> None:
+        self._path = path
+        self._drop_dir = drop_dir
+        self._cache_dir = cache_dir
+        self._on_change = on_change
+        self._files: Dict[Path, Tuple[int, int, Tuple[StrategyDefinition, ...]]] = {}
+        self._definitions: Tuple[StrategyDefinition, ...] = ()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def definitions(self) -> Tuple[StrategyDefinition, ...]:
+        return self._definitions
+
+    def _sources(self) -> List[Path]:
+        sources = [self._path]
+        if self._drop_dir is not None and self._drop_dir.is_dir():
+            sources.extend(
+                sorted(p for p in self._drop_dir.iterdir() if p.suffix in STRATEGY_SUFFIXES)
+            )
+        return sources
+
+    def refresh(self) -> List[Path]:
+        """Reload changed files and return the paths that were added, changed or removed."""
+
+        changed: List[Path] = []
+        files: Dict[Path, Tuple[int, int, Tuple[StrategyDefinition, ...]]] = {}
+        for source in self._sources():
+            previous = self._files.get(source)
+            try:
+                stat = source.stat()
+                if previous is not None and previous[:2] == (stat.st_mtime_ns, stat.st_size):
+                    files[source] = previous
+                    continue
+                definitions = tuple(StrategyDSLParser(source, cache_dir=self._cache_dir).parse())
+            except FileNotFoundError:
+                # Deleted after listing: reported as removed below.
+                continue
+            except (OSError, ValueError) as exc:
+                LOGGER.warning("strategy_reload_failed", path=str(source), error=str(exc))
+                if previous is not None:
+                    files[source] = previous
+                continue
+            files[source] = (stat.st_mtime_ns, stat.st_size, definitions)
+            changed.append(source)
+        changed.extend(source for source in self._files if source not in files)
+        self._files = files
+        if changed:
+            self._definitions = tuple(
+                definition for entry in files.values() for definition in entry[2]
+            )
+            LOGGER.info("strategies_reloaded", changed=[str(path) for path in changed])
+            if self._on_change is not None:
+                self._on_change(self._definitions)
+        return changed
+
+    def start(self, interval: float = 1.0) -> None:
+        """Poll for changes on a daemon thread every *interval* seconds."""
+
+        if self._thread is not None:
+            return
+        self._stop.clear()
+
+        def poll() -> None:
+            while not self._stop.wait(interval):
+                try:
+                    self.refresh()
+                except Exception:  # keep hot-reload alive; the next poll retries
+                    LOGGER.exception("strategy_poll_failed")
+
+        self._thread = threading.Thread(target=poll, name="strategy-registry", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+__all__ = ["StrategyDSLParser", "StrategyDefinition", "StrategyRegistry"]
@@ -4,10 +4,14 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, Optional
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence
 
-from src.common.ta_confluence import ConfluenceEvaluator
-from src.common.types import Direction, FeatureWindow, SignalCandidate
+import numpy as np
+from numpy.typing import NDArray
+
+from src.common.ta_confluence import FEATURE_SLOTS, ConfluenceEvaluator
+from src.common.types import Direction, SignalCandidate
 
 
 @dataclass(slots=True)
@@ -23,12 +27,159 @@ class GateInputs:
     created_at: datetime = field(default_factory=datetime.utcnow)
 
 
+CONFLUENCE_FEATURES = tuple(FEATURE_SLOTS)
+
+
+@lru_cache(maxsize=None)
+def _confluence_slot(scope: str) -> Optional[int]:
+    """Slot fed by ``timeframe_features[scope]["bias"]``.
+
+    Timeframe features are scored under ``f"{scope.lower()}_{name}"``, so only
+    a ``bias`` entry in a scope named after a confluence component can match.
+    """
+
+    return FEATURE_SLOTS.get(f"{scope.lower()}_bias")
+
+
+def _fill_confluence(vector: List[float], timeframe_features: Dict[str, Dict[str, float]]) -> None:
+    for scope, scope_features in timeframe_features.items():
+        slot = _confluence_slot(scope)
+        if slot is not None and "bias" in scope_features:
+            vector[slot] = float(scope_features["bias"])
+
+
+def _column(
+    values: Optional[Sequence[float]], size: int, default: float | NDArray[np.float64]
+) -> NDArray[np.float64]:
+    if values is None:
+        return np.broadcast_to(np.asarray(default, dtype=np.float64), (size,)).copy()
+    column = np.ascontiguousarray(values, dtype=np.float64)
+    if column.shape != (size,):
+        raise ValueError(f"expected {size} rows, got shape {column.shape}")
+    return column
+
+
+@dataclass(slots=True)
+class GateBatch:
+    """Struct-of-arrays gate inputs, one row per symbol/bar.
+
+    Omitted columns take the same defaults :meth:`MultiTimeframeGate.evaluate`
+    applies to missing keys; ``ml_probability`` uses NaN for "no model".
+    """
+
+    symbols: Sequence[str]
+    price: NDArray[np.float64]
+    ema_fast: Optional[NDArray[np.float64]] = None
+    ema_slow: Optional[NDArray[np.float64]] = None
+    adx: Optional[NDArray[np.float64]] = None
+    macd_hist: Optional[NDArray[np.float64]] = None
+    rsi: Optional[NDArray[np.float64]] = None
+    rel_volume: Optional[NDArray[np.float64]] = None
+    orderflow: Optional[NDArray[np.float64]] = None
+    swing_low: Optional[NDArray[np.float64]] = None
+    swing_high: Optional[NDArray[np.float64]] = None
+    trend_bias: Optional[NDArray[np.float64]] = None
+    momentum_bias: Optional[NDArray[np.float64]] = None
+    volume_bias: Optional[NDArray[np.float64]] = None
+    orderflow_bias: Optional[NDArray[np.float64]] = None
+    ml_probability: Optional[NDArray[np.float64]] = None
+    created_at: Optional[Sequence[datetime]] = None
+
+    def __post_init__(self) -> None:
+        size = len(self.symbols)
+        self.price = _column(self.price, size, 0.0)
+        self.ema_fast = _column(self.ema_fast, size, self.price)
+        self.ema_slow = _column(self.ema_slow, size, self.price)
+        self.adx = _column(self.adx, size, 15.0)
+        self.macd_hist = _column(self.macd_hist, size, 0.0)
+        self.rsi = _column(self.rsi, size, 50.0)
+        self.rel_volume = _column(self.rel_volume, size, 0.5)
+        self.orderflow = _column(self.orderflow, size, 0.0)
+        self.swing_low = _column(self.swing_low, size, self.price)
+        self.swing_high = _column(self.swing_high, size, self.price)
+        self.trend_bias = _column(self.trend_bias, size, 0.5)
+        self.momentum_bias = _column(self.momentum_bias, size, 0.5)
+        self.volume_bias = _column(self.volume_bias, size, 0.5)
+        self.orderflow_bias = _column(self.orderflow_bias, size, 0.5)
+        self.ml_probability = _column(self.ml_probability, size, np.nan)
+        if self.created_at is not None and len(self.created_at) != size:
+            raise ValueError(f"expected {size} timestamps, got {len(self.created_at)}")
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    @classmethod
+    def from_inputs(cls, rows: Sequence[GateInputs]) -> GateBatch:
+        """Pack scalar :class:`GateInputs` into columns."""
+
+        size = len(rows)
+        columns = {
+            name: np.empty(size, dtype=np.float64)
+            for name in (
+                "price",
+                "ema_fast",
+                "ema_slow",
+                "adx",
+                "macd_hist",
+                "rsi",
+                "rel_volume",
+                "orderflow",
+                "swing_low",
+                "swing_high",
+                "ml_probability",
+                *CONFLUENCE_FEATURES,
+            )
+        }
+        for idx, inputs in enumerate(rows):
+            htf = inputs.timeframe_features.get("HTF", {})
+            ltf = inputs.timeframe_features.get("LTF", {})
+            mid = inputs.timeframe_features.get("MTF", {})
+            price = inputs.price
+            columns["price"][idx] = price
+            columns["ema_fast"][idx] = htf.get("ema_fast", price)
+            columns["ema_slow"][idx] = htf.get("ema_slow", price)
+            columns["adx"][idx] = htf.get("adx", 15.0)
+            columns["macd_hist"][idx] = ltf.get("macd_hist", 0.0)
+            columns["rsi"][idx] = ltf.get("rsi", 50.0)
+            columns["rel_volume"][idx] = inputs.volume_features.get("rel_volume", 0.5)
+            columns["orderflow"][idx] = inputs.orderflow_features.get("imbalance", 0.0)
+            columns["swing_low"][idx] = mid.get("swing_low", price)
+            columns["swing_high"][idx] = mid.get("swing_high", price)
+            ml_probability = inputs.ml_probability
+            columns["ml_probability"][idx] = np.nan if ml_probability is None else ml_probability
+            confluence = ConfluenceEvaluator.new_vector()
+            _fill_confluence(confluence, inputs.timeframe_features)
+            for key, slot in FEATURE_SLOTS.items():
+                columns[key][idx] = confluence[slot]
+        return cls(
+            symbols=[inputs.symbol for inputs in rows],
+            created_at=[inputs.created_at for inputs in rows],
+            **columns,
+        )
+
+
+@dataclass(slots=True)
+class GateBatchResult:
+    """Column results of :meth:`MultiTimeframeGate.evaluate_arrays`."""
+
+    passed: NDArray[np.bool_]
+    long: NDArray[np.bool_]
+    confidence: NDArray[np.float64]
+    invalidation: NDArray[np.float64]
+
+    @property
+    def indices(self) -> NDArray[np.intp]:
+        return np.flatnonzero(self.passed)
+
+
 class MultiTimeframeGate:
     """Combine technical, volume, order-flow, and ML cues into signal candidates."""
 
-    def __init__(self, ttl: int = 3) -> None:
-        self._confluence = ConfluenceEvaluator()
+    def __init__(self, ttl: int = 3, weights: Optional[Dict[str, float]] = None) -> None:
+        self._confluence = ConfluenceEvaluator(weights)
         self._ttl = ttl
+        # Reused by every scalar evaluation; a gate is driven by one loop at a time.
+        self._vector = self._confluence.new_vector()
 
     def evaluate(self, inputs: GateInputs) -> Optional[SignalCandidate]:
         """Return a :class:`SignalCandidate` if confluence criteria align."""
@@ -60,14 +211,10 @@ class MultiTimeframeGate:
         if (direction == "long" and orderflow_bias < -0.1) or (direction == "short" and orderflow_bias > 0.1):
             return None
 
-        features = [
-            FeatureWindow(name=f"{scope.lower()}_{name}", timeframe=scope, timestamp=inputs.created_at, value=value)
-            for scope, scope_features in inputs.timeframe_features.items()
-            for name, value in scope_features.items()
-        ]
-        confluence_score = self._confluence.evaluate(features)
-
-        confidence = confluence_score.total
+        vector = self._vector
+        self._confluence.reset(vector)
+        _fill_confluence(vector, inputs.timeframe_features)
+        confidence = self._confluence.score(vector)
         if inputs.ml_probability is not None:
             confidence = (confidence + float(inputs.ml_probability)) / 2
 
@@ -90,5 +237,65 @@ class MultiTimeframeGate:
             metadata=metadata,
         )
 
+    def evaluate_arrays(self, batch: GateBatch) -> GateBatchResult:
+        """Apply the gate rules to every row of *batch* at once.
+
+        Produces the same decisions and confidences as calling
+        :meth:`evaluate` row by row, without building any candidates.
+        """
+
+        long = batch.ema_fast >= batch.ema_slow
+        short = ~long
+        reject = batch.adx < 18
+        reject |= (long & (batch.macd_hist <= 0)) | (short & (batch.macd_hist >= 0))
+        reject |= (long & (batch.rsi < 40)) | (short & (batch.rsi > 60))
+        reject |= batch.rel_volume < 0.6
+        reject |= (long & (batch.orderflow < -0.1)) | (short & (batch.orderflow > 0.1))
+        passed = ~reject
+
+        w_trend, w_momentum, w_volume, w_orderflow = self._confluence.slot_weights
+        raw = (
+            batch.trend_bias * w_trend
+            + batch.momentum_bias * w_momentum
+            + batch.volume_bias * w_volume
+            + batch.orderflow_bias * w_orderflow
+        )
+        confidence = np.clip(raw, 0.0, 1.0)
+        ml = batch.ml_probability
+        confidence = np.where(np.isnan(ml), confidence, (confidence + ml) / 2)
+        np.minimum(confidence, 1.0, out=confidence)
+        invalidation = np.where(long, batch.swing_low, batch.swing_high)
+        return GateBatchResult(
+            passed=passed, long=long, confidence=confidence, invalidation=invalidation
+        )
+
+    def evaluate_batch(self, batch: GateBatch) -> List[SignalCandidate]:
+        """Return candidates for the rows of *batch* that pass the gate."""
+
+        result = self.evaluate_arrays(batch)
+        candidates: List[SignalCandidate] = []
+        for idx in result.indices.tolist():
+            direction: Direction = "long" if result.long[idx] else "short"
+            created_at = (
+                batch.created_at[idx] if batch.created_at is not None else datetime.utcnow()
+            )
+            candidates.append(
+                SignalCandidate(
+                    symbol=batch.symbols[idx],
+                    direction=direction,
+                    confidence=float(result.confidence[idx]),
+                    ttl=self._ttl,
+                    invalidation=float(result.invalidation[idx]),
+                    strategy="mtf_gate",
+                    metadata={
+                        "created_at": created_at,
+                        "adx": float(batch.adx[idx]),
+                        "rel_volume": float(batch.rel_volume[idx]),
+                        "orderflow_bias": float(batch.orderflow[idx]),
+                    },
+                )
+            )
+        return candidates
+
 
-__all__ = ["MultiTimeframeGate", "GateInputs"]
+__all__ = ["MultiTimeframeGate", "GateInputs", "GateBatch", "GateBatchResult"]
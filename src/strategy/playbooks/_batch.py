@@ -0,0 +1,63 @@
+"""Helpers shared by the vectorised playbook scorers.
+
+Each playbook's ``score_batch(confidence, features)`` mirrors its scalar
+``score`` over whole columns. Features are read through :func:`column`, so a
+NaN cell or a missing column falls back to the same default that ``score``
+uses for an absent key, and rows score exactly as the scalar path would.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Callable, Dict, Mapping
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src.common.types import SignalCandidate
+
+FloatArray = NDArray[np.float64]
+FeatureColumns = Mapping[str, FloatArray]
+ScalarScorer = Callable[[SignalCandidate, Dict[str, float]], float]
+BatchScorer = Callable[[FloatArray, FeatureColumns], FloatArray]
+
+
+def column(features: FeatureColumns, name: str, default: float, size: int) -> FloatArray:
+    """Return feature *name* as a float column, with NaN and absent columns set to *default*."""
+
+    values = features.get(name)
+    if values is None:
+        return np.full(size, default, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    return np.where(np.isnan(values), default, values)
+
+
+def clip_unit(values: FloatArray) -> FloatArray:
+    return np.clip(values, 0.0, 1.0)
+
+
+def row_wise(score: ScalarScorer) -> BatchScorer:
+    """Adapt a scalar ``score(candidate, features)`` to the batch signature.
+
+    Used for playbooks without a ``score_batch``; NaN feature cells are left
+    out of the per-row dict so the scalar defaults apply.
+    """
+
+    def score_batch(confidence: FloatArray, features: FeatureColumns) -> FloatArray:
+        candidate = SignalCandidate("", "long", 0.0, 0, 0.0, "")
+        columns = {
+            name: np.asarray(values, dtype=np.float64).tolist() for name, values in features.items()
+        }
+        result = np.empty(len(confidence), dtype=np.float64)
+        for idx, value in enumerate(np.asarray(confidence, dtype=np.float64).tolist()):
+            candidate.confidence = value
+            row = {
+                name: cells[idx] for name, cells in columns.items() if not math.isnan(cells[idx])
+            }
+            result[idx] = score(candidate, row)
+        return result
+
+    return score_batch
+
+
+__all__ = ["BatchScorer", "FeatureColumns", "FloatArray", "clip_unit", "column", "row_wise"]
@@ -4,7 +4,10 @@ from __future__ import annotations
 
 from typing import Dict
 
+import numpy as np
+
 from src.common.types import SignalCandidate
+from src.strategy.playbooks._batch import FeatureColumns, FloatArray, clip_unit, column
 
 
 def score(candidate: SignalCandidate, features: Dict[str, float]) -> float:
@@ -21,4 +24,17 @@ def score(candidate: SignalCandidate, features: Dict[str, float]) -> float:
     return max(0.0, min(1.0, base + adjustment))
 
 
-__all__ = ["score"]
+def score_batch(confidence: FloatArray, features: FeatureColumns) -> FloatArray:
+    """Column form of :func:`score`; sentiment, spread and regime default to 0, 0.0005 and range."""
+
+    size = len(confidence)
+    sentiment = column(features, "sentiment", 0.0, size)
+    spread = column(features, "spread", 0.0005, size)
+    regime = column(features, "regime", 0.0, size)
+    adjustment = sentiment * 0.1
+    adjustment = np.where(regime == 0, adjustment - 0.05, adjustment)
+    adjustment -= np.minimum(spread * 10, 0.15)
+    return clip_unit(confidence + adjustment)
+
+
+__all__ = ["score", "score_batch"]
@@ -4,7 +4,10 @@ from __future__ import annotations
 
 from typing import Dict
 
+import numpy as np
+
 from src.common.types import SignalCandidate
+from src.strategy.playbooks._batch import FeatureColumns, FloatArray, clip_unit, column
 
 
 def score(candidate: SignalCandidate, features: Dict[str, float]) -> float:
@@ -18,4 +21,15 @@ def score(candidate: SignalCandidate, features: Dict[str, float]) -> float:
     return max(0.0, min(1.0, base + adjustment))
 
 
-__all__ = ["score"]
+def score_batch(confidence: FloatArray, features: FeatureColumns) -> FloatArray:
+    """Column form of :func:`score`; missing spread and range score read as 0.0001 and 0.5."""
+
+    size = len(confidence)
+    spread = column(features, "spread", 0.0001, size)
+    range_score = column(features, "range_score", 0.5, size)
+    adjustment = 0.1 * (range_score - 0.5)
+    adjustment -= np.minimum(spread * 1000, 0.1)
+    return clip_unit(confidence + adjustment)
+
+
+__all__ = ["score", "score_batch"]
@@ -4,7 +4,10 @@ from __future__ import annotations
 
 from typing import Dict
 
+import numpy as np
+
 from src.common.types import SignalCandidate
+from src.strategy.playbooks._batch import FeatureColumns, FloatArray, clip_unit, column
 
 
 def score(candidate: SignalCandidate, features: Dict[str, float]) -> float:
@@ -19,4 +22,15 @@ def score(candidate: SignalCandidate, features: Dict[str, float]) -> float:
     return max(0.0, min(1.0, base + adjustment))
 
 
-__all__ = ["score"]
+def score_batch(confidence: FloatArray, features: FeatureColumns) -> FloatArray:
+    """Column form of :func:`score`, treating missing volatility as 1.0 and news halt as off."""
+
+    size = len(confidence)
+    volatility = column(features, "volatility", 1.0, size)
+    news_halt = column(features, "news_halt", 0.0, size)
+    adjustment = np.where(volatility > 2.0, -0.1, 0.05)
+    adjustment = np.where(news_halt != 0, -1.0, adjustment)
+    return clip_unit(confidence + adjustment)
+
+
+__all__ = ["score", "score_batch"]
@@ -4,7 +4,10 @@ from __future__ import annotations
 
 from typing import Dict
 
+import numpy as np
+
 from src.common.types import SignalCandidate
+from src.strategy.playbooks._batch import FeatureColumns, FloatArray, clip_unit, column
 
 
 def score(candidate: SignalCandidate, features: Dict[str, float]) -> float:
@@ -20,4 +23,17 @@ def score(candidate: SignalCandidate, features: Dict[str, float]) -> float:
     return max(0.0, min(1.0, base + adjustment))
 
 
-__all__ = ["score"]
+def score_batch(confidence: FloatArray, features: FeatureColumns) -> FloatArray:
+    """Column form of :func:`score`: no ORB break, 0.5 tape aggression, zero slippage by default."""
+
+    size = len(confidence)
+    orb_break = column(features, "orb_break", 0.0, size)
+    tape_aggression = column(features, "tape_aggression", 0.5, size)
+    slippage = column(features, "slippage", 0.0, size)
+    adjustment = np.where(orb_break > 0, 0.05, -0.05)
+    adjustment += np.where(tape_aggression > 0.6, 0.1, 0.0)
+    adjustment -= np.minimum(slippage / 2, 0.1)
+    return clip_unit(confidence + adjustment)
+
+
+__all__ = ["score", "score_batch"]
@@ -4,7 +4,10 @@ from __future__ import annotations
 
 from typing import Dict
 
+import numpy as np
+
 from src.common.types import SignalCandidate
+from src.strategy.playbooks._batch import FeatureColumns, FloatArray, clip_unit, column
 
 
 def score(candidate: SignalCandidate, features: Dict[str, float]) -> float:
@@ -20,4 +23,16 @@ def score(candidate: SignalCandidate, features: Dict[str, float]) -> float:
     return max(0.0, min(1.0, base + score_adjustment))
 
 
-__all__ = ["score"]
+def score_batch(confidence: FloatArray, features: FeatureColumns) -> FloatArray:
+    """Column form of :func:`score`; relative volume defaults to 0.5, session and news risk to 0."""
+
+    size = len(confidence)
+    rel_volume = column(features, "relative_volume", 0.5, size)
+    session = column(features, "session_overlap", 0.0, size)
+    news_risk = column(features, "news_risk", 0.0, size)
+    adjustment = np.where((rel_volume > 0.7) & (session > 0), 0.1, -0.1)
+    adjustment = np.where(news_risk > 0, adjustment - 0.2, adjustment)
+    return clip_unit(confidence + adjustment)
+
+
+__all__ = ["score", "score_batch"]
@@ -3,13 +3,16 @@
 from __future__ import annotations
 
 import argparse
-from dataclasses import dataclass
-from typing import Dict, Iterable, Optional
+from dataclasses import dataclass, field
+from types import ModuleType
+from typing import Dict, Iterable, List, Optional, Sequence
 
+import numpy as np
 from structlog import get_logger
 
 from src.common.types import SignalCandidate
 from src.strategy.playbooks import btcusd, eurusd, gbpjpy, us100, xauusd
+from src.strategy.playbooks._batch import BatchScorer, FeatureColumns, FloatArray, row_wise
 
 LOGGER = get_logger(__name__)
 
@@ -21,6 +24,11 @@ PLAYBOOKS = {
     "EURUSD": eurusd,
 }
 
+BATCH_SCORERS: Dict[str, BatchScorer] = {
+    symbol: getattr(module, "score_batch", None) or row_wise(module.score)
+    for symbol, module in PLAYBOOKS.items()
+}
+
 
 @dataclass(slots=True)
 class EnsembleInputs:
@@ -33,6 +41,48 @@ class EnsembleInputs:
     feature_overrides: Dict[str, float]
 
 
+@dataclass(slots=True)
+class EnsembleBatch:
+    """Struct-of-arrays ensemble inputs, one row per candidate.
+
+    ``ml_probability`` uses NaN for "no model"; ``features`` maps playbook
+    feature names to columns where NaN means "not provided".
+    """
+
+    symbols: Sequence[str]
+    confidence: FloatArray
+    orderflow_score: FloatArray
+    ml_probability: FloatArray
+    sentiment_bias: FloatArray
+    features: FeatureColumns = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    @classmethod
+    def from_inputs(cls, rows: Sequence[EnsembleInputs]) -> EnsembleBatch:
+        size = len(rows)
+        names = sorted({name for inputs in rows for name in inputs.feature_overrides})
+        features = {name: np.full(size, np.nan) for name in names}
+        for idx, inputs in enumerate(rows):
+            for name, value in inputs.feature_overrides.items():
+                features[name][idx] = value
+        return cls(
+            symbols=[inputs.candidate.symbol for inputs in rows],
+            confidence=np.array([inputs.candidate.confidence for inputs in rows], dtype=np.float64),
+            orderflow_score=np.array([inputs.orderflow_score for inputs in rows], dtype=np.float64),
+            ml_probability=np.array(
+                [
+                    np.nan if inputs.ml_probability is None else inputs.ml_probability
+                    for inputs in rows
+                ],
+                dtype=np.float64,
+            ),
+            sentiment_bias=np.array([inputs.sentiment_bias for inputs in rows], dtype=np.float64),
+            features=features,
+        )
+
+
 class SignalEnsemble:
     """Combine multiple signals into a final confidence and position size factor."""
 
@@ -46,6 +96,8 @@ class SignalEnsemble:
             "ml": weight_ml / total,
             "sentiment": weight_sentiment / total,
         }
+        self._modules: Dict[str, Optional[ModuleType]] = {}
+        self._scorers: Dict[str, Optional[BatchScorer]] = {}
 
     def combine(self, inputs: EnsembleInputs) -> SignalCandidate:
         """Blend scores and return an updated candidate."""
@@ -55,31 +107,91 @@ class SignalEnsemble:
         ml_component = (inputs.ml_probability or inputs.candidate.confidence) * self._weights["ml"]
         sentiment_component = (inputs.sentiment_bias + 1) / 2 * self._weights["sentiment"]
         combined_confidence = base + orderflow_component + ml_component + sentiment_component
-        adjusted_confidence = self._apply_playbook(inputs.candidate, inputs.feature_overrides, combined_confidence)
-        return SignalCandidate(
+        combined = SignalCandidate(
             symbol=inputs.candidate.symbol,
             direction=inputs.candidate.direction,
-            confidence=max(0.0, min(1.0, adjusted_confidence)),
+            confidence=combined_confidence,
             ttl=inputs.candidate.ttl,
             invalidation=inputs.candidate.invalidation,
             strategy=inputs.candidate.strategy,
             metadata=inputs.candidate.metadata,
         )
-
-    def _apply_playbook(self, candidate: SignalCandidate, features: Dict[str, float], confidence: float) -> float:
-        module = PLAYBOOKS.get(candidate.symbol.upper())
-        if module is None:
-            return confidence
-        adjusted_candidate = SignalCandidate(
-            symbol=candidate.symbol,
-            direction=candidate.direction,
-            confidence=confidence,
-            ttl=candidate.ttl,
-            invalidation=candidate.invalidation,
-            strategy=candidate.strategy,
-            metadata=candidate.metadata,
+        # Playbooks score the blended candidate; the same object is then clipped and returned.
+        adjusted_confidence = self._apply_playbook(combined, inputs.feature_overrides)
+        combined.confidence = max(0.0, min(1.0, adjusted_confidence))
+        return combined
+
+    def combine_batch(self, batch: EnsembleBatch) -> FloatArray:
+        """Return final confidences for every row of *batch*.
+
+        Matches :meth:`combine` row by row. Rows are grouped by symbol and each
+        group is scored by its playbook's ``score_batch`` in one call.
+        """
+
+        weights = self._weights
+        ml = batch.ml_probability
+        ml = np.where(np.isnan(ml) | (ml == 0), batch.confidence, ml)
+        confidence = (
+            batch.confidence * weights["ta"]
+            + batch.orderflow_score * weights["orderflow"]
+            + ml * weights["ml"]
+            + (batch.sentiment_bias + 1) / 2 * weights["sentiment"]
         )
-        return module.score(adjusted_candidate, features)
+        symbols = set(batch.symbols)
+        groups: Dict[str, List[int]] = {}
+        if len(symbols) == 1:
+            groups[symbols.pop()] = list(range(len(confidence)))
+        else:
+            for idx, symbol in enumerate(batch.symbols):
+                groups.setdefault(symbol, []).append(idx)
+        for symbol, rows in groups.items():
+            scorer = self._scorer(symbol)
+            if scorer is None:
+                continue
+            if len(rows) == len(confidence):
+                confidence = np.asarray(scorer(confidence, batch.features), dtype=np.float64)
+                continue
+            index = np.asarray(rows)
+            features = {name: values[index] for name, values in batch.features.items()}
+            confidence[index] = scorer(confidence[index], features)
+        return np.clip(confidence, 0.0, 1.0)
+
+    def combine_many(self, rows: Sequence[EnsembleInputs]) -> List[SignalCandidate]:
+        """Batch counterpart of :meth:`combine` for a list of inputs."""
+
+        confidences = self.combine_batch(EnsembleBatch.from_inputs(rows)).tolist()
+        return [
+            SignalCandidate(
+                symbol=inputs.candidate.symbol,
+                direction=inputs.candidate.direction,
+                confidence=confidence,
+                ttl=inputs.candidate.ttl,
+                invalidation=inputs.candidate.invalidation,
+                strategy=inputs.candidate.strategy,
+                metadata=inputs.candidate.metadata,
+            )
+            for inputs, confidence in zip(rows, confidences)
+        ]
+
+    def _module(self, symbol: str) -> Optional[ModuleType]:
+        try:
+            return self._modules[symbol]
+        except KeyError:
+            module = self._modules[symbol] = PLAYBOOKS.get(symbol.upper())
+            return module
+
+    def _scorer(self, symbol: str) -> Optional[BatchScorer]:
+        try:
+            return self._scorers[symbol]
+        except KeyError:
+            scorer = self._scorers[symbol] = BATCH_SCORERS.get(symbol.upper())
+            return scorer
+
+    def _apply_playbook(self, candidate: SignalCandidate, features: Dict[str, float]) -> float:
+        module = self._module(candidate.symbol)
+        if module is None:
+            return candidate.confidence
+        return module.score(candidate, features)
 
 
 def run_mode(mode: str) -> None:
@@ -0,0 +1,63 @@
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+
+from src.backtest.data import load_bars, save_bars, synthetic_bars
+from src.backtest.engine import BacktestConfig, run_backtest
+from src.backtest.parallel import _WORKER_SERIES, ParallelRunner, build_jobs, open_shared
+from src.backtest.signals import StrategyParams
+
+
+def test_parallel_runner_matches_serial_backtests(tmp_path: Path) -> None:
+    for seed, symbol in enumerate(("XAUUSD", "EURUSD")):
+        save_bars(synthetic_bars(symbol, 60000, start=datetime(2020, 2, 1), seed=seed), tmp_path)
+    config = BacktestConfig(engine="vectorbt", symbol="", data_dir=tmp_path)
+    param_sets = [
+        ("stops", StrategyParams()),
+        ("hold_60", StrategyParams(use_stops=False, max_hold_bars=60)),
+    ]
+    jobs = build_jobs(["XAUUSD", "EURUSD"], ["full", "2020-pandemic"], param_sets)
+
+    with ParallelRunner(config, workers=2) as runner:
+        report = runner.run(jobs)
+
+    assert len(report.results) == 8
+    for item in report.results:
+        job = item.job
+        series = load_bars(tmp_path, job.symbol)
+        if job.scenario != "full":
+            series = series.between(datetime(2020, 2, 15), datetime(2020, 5, 1))
+        assert item.metrics == run_backtest(
+            replace(config, symbol=job.symbol, params=job.params), series
+        )
+    by_symbol = report.summary("symbol")
+    assert by_symbol["XAUUSD"]["jobs"] == 4
+    assert by_symbol["EURUSD"]["trades"] == sum(
+        item.metrics["trades"] for item in report.results if item.job.symbol == "EURUSD"
+    )
+
+
+def test_shared_series_cache_follows_reshare_and_close(tmp_path: Path) -> None:
+    shared = tmp_path / "shared"
+    config = BacktestConfig(engine="vectorbt", symbol="", data_dir=tmp_path)
+    first = synthetic_bars("XAUUSD", 1000, start=datetime(2020, 2, 3), seed=0)
+    second = synthetic_bars("XAUUSD", 1000, start=datetime(2020, 2, 3), seed=1)
+    with ParallelRunner(config, workers=1, shared_dir=shared) as runner:
+        runner.share("XAUUSD", first)
+        assert open_shared(str(shared), "XAUUSD", "M1").close.tolist() == first.close.tolist()
+    assert not [key for key in _WORKER_SERIES if key[0] == str(shared)]
+
+    with ParallelRunner(config, workers=1, shared_dir=shared) as runner:
+        opened = open_shared(str(shared), "XAUUSD", "M1")
+        runner.share("XAUUSD", second)
+        assert open_shared(str(shared), "XAUUSD", "M1").close.tolist() == second.close.tolist()
+        assert opened.close.tolist() == first.close.tolist()
+
+
+def test_share_keeps_an_explicit_empty_series(tmp_path: Path) -> None:
+    save_bars(synthetic_bars("XAUUSD", 100, start=datetime(2020, 2, 3)), tmp_path)
+    config = BacktestConfig(engine="vectorbt", symbol="", data_dir=tmp_path)
+    empty = synthetic_bars("XAUUSD", 100, start=datetime(2020, 2, 3)).slice(0, 0)
+    with ParallelRunner(config, workers=1, shared_dir=tmp_path / "shared") as runner:
+        runner.share("XAUUSD", empty)
+        assert open_shared(str(tmp_path / "shared"), "XAUUSD", "M1").timestamps.size == 0
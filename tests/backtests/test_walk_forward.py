@@ -0,0 +1,77 @@
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from src.backtest.data import BarSeries, load_bars, save_bars, synthetic_bars
+from src.backtest.engine import BacktestConfig, select_engine
+from src.backtest.signals import StrategyParams, compute_signals
+from src.common.clock import to_epoch_ns
+from src.optimize.walk_forward import (
+    _WORKER_PIPELINES,
+    _WORKER_SIGNALS,
+    WalkForwardRunner,
+    WalkForwardSettings,
+    parameter_grid,
+)
+
+
+def _window_metrics(
+    config: BacktestConfig,
+    series: BarSeries,
+    params: StrategyParams,
+    start: datetime,
+    end: datetime,
+) -> dict[str, float]:
+    lo, hi = np.searchsorted(series.timestamps, [to_epoch_ns(start), to_epoch_ns(end)]).tolist()
+    signals = compute_signals(series, params).slice(lo, hi)
+    job = replace(config, symbol=series.symbol, params=params)
+    return select_engine(job)(job).run(series.slice(lo, hi), signals).metrics
+
+
+def test_walk_forward_runner_optimises_in_sample_and_tests_next_step(tmp_path: Path) -> None:
+    save_bars(
+        synthetic_bars("XAUUSD", 30 * 1440, start=datetime(2021, 1, 4), trend=6e-5, seed=1),
+        tmp_path,
+    )
+    config = BacktestConfig(
+        engine="vectorbt", symbol="", data_dir=tmp_path, params=StrategyParams(use_stops=False)
+    )
+    grid = {"min_confidence": [0.5, 0.7], "max_hold_bars": [60, 240]}
+    settings = WalkForwardSettings(window_days=14, step_days=7, grid=grid)
+
+    with WalkForwardRunner(config, settings, workers=2) as runner:
+        windows = runner.windows("XAUUSD")
+        report = runner.run(["XAUUSD"])
+
+    spans = [(window.start.day, window.split.day, window.end.day) for window in windows]
+    assert spans == [(4, 18, 25), (11, 25, 1), (18, 1, 3)]
+    assert len(report.results) == 3
+    series = load_bars(tmp_path, "XAUUSD")
+    candidates = parameter_grid(config.params, grid)
+    for window, result in zip(windows, report.results):
+        in_sample = [
+            _window_metrics(config, series, params, window.start, window.split)["total_return"]
+            for params in candidates
+        ]
+        assert result.in_sample_score == max(in_sample)
+        best = replace(config.params, **result.params)
+        assert result.oos_metrics == _window_metrics(config, series, best, window.split, window.end)
+        assert result.oos_win_rate == result.oos_metrics["win_rate"]
+    assert report.passed(
+        replace(settings, min_oos_win_rate=0.0, min_profit_factor=0.0, max_oos_drawdown_pct=100.0)
+    )
+
+
+def test_walk_forward_runner_releases_cached_signals(tmp_path: Path) -> None:
+    save_bars(synthetic_bars("XAUUSD", 20 * 1440, start=datetime(2021, 1, 4), seed=2), tmp_path)
+    config = BacktestConfig(engine="vectorbt", symbol="", data_dir=tmp_path)
+    settings = WalkForwardSettings(window_days=7, step_days=7, grid={"max_hold_bars": [60]})
+    shared_dir = str(tmp_path / "shared")
+    with WalkForwardRunner(config, settings, workers=1, shared_dir=tmp_path / "shared") as runner:
+        assert runner.run(["XAUUSD"]).results
+        assert any(key[0] == shared_dir for key in _WORKER_SIGNALS)
+        assert [key[0] for key in _WORKER_PIPELINES] == [str(config.config_dir)]
+    assert not any(key[0] == shared_dir for key in _WORKER_SIGNALS)
+    assert not _WORKER_PIPELINES
@@ -0,0 +1,60 @@
+import numpy as np
+
+from src.common.ring_buffer import HistoryStore
+from src.ingest.bar_aggregator import BarAggregator
+
+MINUTE = 60_000_000_000
+
+
+def _ticks(count: int, seed: int = 0) -> tuple[np.ndarray, ...]:
+    rng = np.random.default_rng(seed)
+    stamps = np.cumsum(rng.integers(1, 20_000_000_000, count))
+    prices = 100 + np.cumsum(rng.standard_normal(count))
+    sizes = rng.random(count)
+    return stamps, prices, sizes
+
+
+def test_bar_aggregator_rolls_higher_timeframes_from_ticks() -> None:
+    stamps, prices, sizes = _ticks(5000)
+    history = HistoryStore()
+    events = []
+    aggregator = BarAggregator(("H1", "M1", "M5"), history=history, listeners=[events.append])
+    for stamp, price, size in zip(stamps.tolist(), prices.tolist(), sizes.tolist()):
+        aggregator.on_tick("XAUUSD", stamp, price, size)
+    aggregator.close_until(int(stamps[-1]) + 3_600_000_000_000)
+    assert aggregator.timeframes == ("M1", "M5", "H1")
+
+    for timeframe, minutes in (("M1", 1), ("M5", 5), ("H1", 60)):
+        buckets = stamps // (minutes * MINUTE)
+        starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        bars = history.bars("XAUUSD", timeframe)
+        assert bars.timestamps().tolist() == (buckets[starts] * minutes * MINUTE).tolist()
+        assert np.allclose(bars.column("open"), prices[starts])
+        assert np.allclose(bars.column("high"), np.maximum.reduceat(prices, starts))
+        assert np.allclose(bars.column("low"), np.minimum.reduceat(prices, starts))
+        assert np.allclose(bars.column("close"), prices[np.r_[starts[1:] - 1, prices.size - 1]])
+        assert np.allclose(bars.column("volume"), np.add.reduceat(sizes, starts))
+        assert bars.column("ticks").sum() == stamps.size
+
+    replayed = HistoryStore()
+    for event in events:
+        replayed.record(event)
+    expected = history.bars("XAUUSD", "H1").column("close").tolist()
+    assert replayed.bars("XAUUSD", "H1").column("close").tolist() == expected
+
+
+def test_bar_aggregator_closes_on_timer_and_drops_late_ticks() -> None:
+    history = HistoryStore()
+    aggregator = BarAggregator(("M1", "M5"), history=history)
+    aggregator.on_tick("EURUSD", 10 * MINUTE + 1, 1.10, 1.0)
+    aggregator.on_tick("EURUSD", 10 * MINUTE + 2, 1.12, 1.0)
+    aggregator.close_until(11 * MINUTE)
+    assert history.bars("EURUSD", "M1").column("close").tolist() == [1.12]
+    assert len(history.bars("EURUSD", "M5")) == 0
+
+    aggregator.on_tick("EURUSD", 10 * MINUTE + 3, 1.50, 1.0)
+    assert aggregator.late_ticks == 1
+    aggregator.close_until(15 * MINUTE)
+    m5 = history.bars("EURUSD", "M5")
+    assert m5.timestamps().tolist() == [10 * MINUTE]
+    assert m5.column("high").tolist() == [1.12]
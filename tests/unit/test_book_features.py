@@ -0,0 +1,93 @@
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.common.feature_store import FeatureStore
+from src.common.types import FeatureWindow
+from src.orderflow.book_features import (
+    ASK_CODE,
+    BID_CODE,
+    BookFeatureEngine,
+    DepthUpdates,
+    load_depth_updates,
+    replay,
+    save_depth_updates,
+)
+from src.strategy.compiler import compile_strategies
+from src.strategy.dsl import StrategyDSLParser
+
+PACKS = ("maker_edge_micro_mm", "microstructure_imbalance_impulse")
+
+
+def test_book_features_track_microprice_queue_and_imbalance() -> None:
+    engine = BookFeatureEngine("EURUSD", horizon_ms=300, imbalance_threshold=0.2, levels=2)
+    engine.reset(
+        bids=[[99.0, 10.0], [98.0, 10.0]], asks=[[101.0, 10.0], [102.0, 10.0]], timestamp_ms=0
+    )
+    assert engine.microprice == 100.0
+    assert engine.queue_position("bid") == 1.0
+
+    engine.update(100, "bid", 99.0, 15.0)
+    assert engine.queue_position("bid") == pytest.approx(10 / 15)
+    assert engine.microprice == pytest.approx((99 * 10 + 101 * 15) / 25)
+    engine.update(200, "bid", 99.0, 12.0)
+    assert engine.queue_position("bid") == pytest.approx(7 / 12)
+    assert engine.imbalance_duration_ms() == 0
+
+    engine.update(250, "ask", 102.0, 0.0)
+    imbalance = engine.features()["imbalance"]
+    assert imbalance == pytest.approx((22 - 10) / 32)
+    engine.update(400, "bid", 99.5, 3.0)
+    assert engine.queue_position("bid") == 1.0
+    assert engine.imbalance_duration_ms(now_ms=650) == 400
+    # 300ms horizon at t=400: the reference is the sample at t=100.
+    drift = engine.microprice - (99 * 10 + 101 * 15) / 25
+    assert engine.microprice_drift == pytest.approx(drift)
+    engine.update(450, "bid", 99.5, 0.0)
+    engine.update(460, "bid", 98.0, 0.0)
+    assert engine.imbalance_duration_ms() == 0
+
+
+def test_depth_recordings_round_trip_and_replay(tmp_path: Path) -> None:
+    updates = DepthUpdates(
+        timestamp_ms=np.array([1, 2, 3], dtype=np.int64),
+        side=np.array([BID_CODE, ASK_CODE, BID_CODE], dtype=np.int8),
+        price=np.array([99.0, 101.0, 99.5]),
+        size=np.array([5.0, 4.0, 1.0]),
+    )
+    npz = save_depth_updates(updates, tmp_path / "depth.npz")
+    csv_path = tmp_path / "depth.csv"
+    csv_path.write_text(
+        "timestamp_ms,side,price,size\n1,bid,99,5\n2,ask,101,4\n3,bid,99.5,1\n", encoding="utf-8"
+    )
+    for path in (npz, csv_path):
+        loaded = load_depth_updates(path)
+        assert loaded.side.tolist() == updates.side.tolist()
+        engine = BookFeatureEngine()
+        assert replay(engine, loaded) == 3
+        assert engine.book.best_bid == 99.5
+        assert engine.features()["spread"] == 1.5
+
+
+def test_published_features_drive_the_microstructure_packs() -> None:
+    definitions = [
+        d for d in StrategyDSLParser(Path("configs/strategies.yaml")).parse() if d.name in PACKS
+    ]
+    program = compile_strategies(definitions, params={"theta": 0.2, "T": 100, "tight_cap": 2.0})
+    engine = BookFeatureEngine(levels=2)
+    engine.reset(
+        bids=[[99.5, 50.0], [90.0, 1.0]], asks=[[100.5, 1.0], [101.0, 30.0]], timestamp_ms=0
+    )
+    engine.update(400, "bid", 99.5, 60.0)
+    features = engine.features()
+    assert features["queue_position"] == features["bid_queue_position"]
+    assert features["depth_slope"] == engine.book.depth_slope() > 0.2
+
+    store = FeatureStore()
+    store.upsert(FeatureWindow("inventory_within_limits", "live", datetime(2024, 1, 2), True))
+    engine.publish(store)
+    assert program.evaluate(store) == {name: True for name in PACKS}
+    engine.publish(store, quote_side="ask")
+    assert program.evaluate(store)["maker_edge_micro_mm"] is False
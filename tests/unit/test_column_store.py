@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import BinaryIO
+
+import numpy as np
+import pytest
+from numpy.typing import ArrayLike, DTypeLike
+
+from src.backtest.data import load_bars, synthetic_bars
+from src.common.column_store import ColumnStore
+from src.ingest.market_feed import MarketEvent
+
+
+def _write(store: ColumnStore, bars: int = 3 * 1440) -> None:
+    series = synthetic_bars("XAUUSD", bars, start=datetime(2024, 1, 1))
+    for rows in (slice(0, 1000), slice(1000, None)):
+        columns = {"close": series.close[rows], "volume": series.volume[rows]}
+        store.append("XAUUSD", "M1", series.timestamps[rows], columns)
+
+
+def test_column_store_partitions_by_day_and_prunes_ranges(tmp_path: Path) -> None:
+    store = ColumnStore(tmp_path)
+    _write(store)
+    assert [str(day) for day in store.partitions("XAUUSD", "M1")] == [
+        "2024-01-01",
+        "2024-01-02",
+        "2024-01-03",
+    ]
+
+    reader = ColumnStore(tmp_path)
+    full = reader.read("XAUUSD", "M1")
+    assert full["timestamps"].size == 3 * 1440
+    assert np.all(np.diff(full["timestamps"]) > 0)
+
+    start = datetime(2024, 1, 2, 6)
+    window = reader.read("XAUUSD", "M1", start, start + timedelta(hours=2), columns=["close"])
+    assert set(window) == {"timestamps", "close"}
+    assert window["close"].size == 120
+    assert window["close"].tolist() == full["close"][1440 + 360 : 1440 + 480].tolist()
+    assert not window["close"].flags.writeable
+
+
+def test_column_store_rejects_out_of_order_rows_and_repairs_torn_writes(tmp_path: Path) -> None:
+    store = ColumnStore(tmp_path)
+    _write(store, bars=100)
+    with pytest.raises(ValueError):
+        store.append("XAUUSD", "M1", [0], {"close": [1.0], "volume": [1.0]})
+
+    partition = tmp_path / "XAUUSD" / "M1" / "20240101"
+    with (partition / "close.bin").open("ab") as fh:
+        fh.write(b"\x00" * 12)
+    assert ColumnStore(tmp_path).read("XAUUSD", "M1")["close"].size == 100
+
+    last = int(store.read("XAUUSD", "M1")["timestamps"][-1])
+    ColumnStore(tmp_path).append(
+        "XAUUSD", "M1", [last + 60_000_000_000], {"close": [5.0], "volume": [1.0]}
+    )
+    assert ColumnStore(tmp_path).read("XAUUSD", "M1")["close"][-1] == 5.0
+
+
+def test_column_store_records_feed_events_and_backs_load_bars(tmp_path: Path) -> None:
+    store = ColumnStore(tmp_path, flush_rows=2)
+    now = datetime(2024, 1, 2, 9, 30)
+    for idx in range(3):
+        bar = {
+            "timeframe": "M1",
+            "open": 1.0,
+            "high": 2.0,
+            "low": 0.5,
+            "close": 1.0 + idx,
+            "volume": 10.0,
+        }
+        store.record(
+            MarketEvent(symbol="XAUUSD", timestamp=now + timedelta(minutes=idx), payload=bar)
+        )
+        store.record(
+            MarketEvent(
+                symbol="XAUUSD", timestamp=now + timedelta(minutes=idx), payload={"price": 2050.0}
+            )
+        )
+    store.flush()
+    assert store.read("XAUUSD", "ticks")["price"].tolist() == [2050.0] * 3
+
+    series = load_bars(tmp_path, "XAUUSD", "M1", start=now + timedelta(minutes=1))
+    assert series.close.tolist() == [2.0, 3.0]
+    assert series.bar_ns == 60_000_000_000
+
+
+def test_column_store_repairs_a_failed_append_in_the_same_process(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    store = ColumnStore(tmp_path)
+    stamps = np.arange(4, dtype=np.int64) * 60_000_000_000
+    store.append("XAUUSD", "M1", stamps[:2], {"close": [1.0, 2.0], "volume": [10.0, 20.0]})
+
+    real_tofile = np.ndarray.tofile
+    calls = []
+
+    class FailingArray(np.ndarray):
+        def tofile(self, fh: BinaryIO) -> None:
+            calls.append(1)
+            if len(calls) == 2:
+                raise OSError("disk full")
+            real_tofile(self, fh)
+
+    def failing(values: ArrayLike, dtype: DTypeLike = None) -> np.ndarray:
+        return np.asarray(values, dtype).view(FailingArray)
+
+    monkeypatch.setattr(np, "ascontiguousarray", failing)
+    with pytest.raises(OSError):
+        store.append("XAUUSD", "M1", stamps[2:], {"close": [-1.0, -1.0], "volume": [-1.0, -1.0]})
+    monkeypatch.undo()
+
+    store.append("XAUUSD", "M1", stamps[2:], {"close": [3.0, 4.0], "volume": [30.0, 40.0]})
+    rows = store.read("XAUUSD", "M1")
+    assert rows["close"].tolist() == [1.0, 2.0, 3.0, 4.0]
+    assert rows["volume"].tolist() == [10.0, 20.0, 30.0, 40.0]
+    assert rows["timestamps"].tolist() == stamps.tolist()
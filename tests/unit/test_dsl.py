@@ -1,6 +1,26 @@
+import threading
+import time
+from datetime import datetime, timedelta
 from pathlib import Path
 
-from src.strategy.dsl import StrategyDSLParser
+from src.common.feature_store import FeatureStore
+from src.common.types import FeatureWindow
+from src.strategy import dsl
+from src.strategy.compiler import (
+    Compare,
+    Const,
+    Quantile,
+    Slot,
+    compile_expression,
+    compile_strategies,
+    parse_expression,
+)
+from src.strategy.dsl import StrategyDefinition, StrategyDSLParser, StrategyRegistry
+
+_DROP_TEMPLATE = (
+    '{"strategies": [{"name": "%s", "regime_allow": [], "features": [], "trigger": {"all": []}, '
+    '"filters": {"all": []}, "entry": {}, "exit": {}, "risk": {}, "routing": {}}]}'
+)
 
 
 def test_strategy_dsl_parser_loads(tmp_path: Path) -> None:
@@ -12,3 +32,156 @@ def test_strategy_dsl_parser_loads(tmp_path: Path) -> None:
     parser = StrategyDSLParser(path)
     result = parser.parse()
     assert result[0].name == "test"
+
+
+def test_registry_reloads_only_changed_drop_files(tmp_path: Path) -> None:
+    main = tmp_path / "strategies.yaml"
+    main.write_text(_DROP_TEMPLATE % "base")
+    drops = tmp_path / "strategies.d"
+    drops.mkdir()
+    (drops / "a.yaml").write_text(_DROP_TEMPLATE % "alpha")
+    cache = tmp_path / "cache"
+    registry = StrategyRegistry(main, drop_dir=drops, cache_dir=cache)
+    assert len(registry.refresh()) == 2
+    assert [d.name for d in registry.definitions] == ["base", "alpha"]
+    assert len(list(cache.glob("*.msgpack"))) == 2
+    assert registry.refresh() == []
+
+    (drops / "b.yaml").write_text(_DROP_TEMPLATE % "beta")
+    (drops / "a.yaml").unlink()
+    assert sorted(p.name for p in registry.refresh()) == ["a.yaml", "b.yaml"]
+    assert [d.name for d in registry.definitions] == ["base", "beta"]
+    assert StrategyDSLParser(drops / "b.yaml", cache_dir=cache).parse()[0].name == "beta"
+
+
+def test_compiled_program_evaluates_shipped_packs() -> None:
+    definitions = StrategyDSLParser(Path("configs/strategies.yaml")).parse()
+    program = compile_strategies(definitions, params={"theta1": 0.1, "theta": 0.5, "cap": 2.0})
+    store = FeatureStore(history_size=32)
+    now = datetime(2024, 1, 2, 14, 0)
+
+    def put(name: str, timeframe: str, *values: object) -> None:
+        for offset, value in enumerate(values):
+            store.upsert(FeatureWindow(name, timeframe, now + timedelta(minutes=offset), value))
+
+    put("close", "H1", 2050.0)
+    put("ema_200", "H1", 2000.0)
+    put("ema_50", "H1", 2020.0)
+    put("adx", "H1", 25.0)
+    put("macd_hist", "M1", -0.2, 0.3)
+    put("rsi", "M1", 55.0)
+    put("relvol", "M1", 0.2, 0.3, 0.4, 0.9)
+    put("lob_imbalance", "live", 0.3)
+    put("news.hard", "live", False)
+
+    results = program.evaluate(store)
+    assert results["htf_trend_pullback"] is True
+    assert results["momentum_ignition"] is False
+    assert program.stats()["htf_trend_pullback"].calls == 1
+
+    put("macd_hist", "M1", 0.5)
+    assert program.evaluate(store)["htf_trend_pullback"] is False
+
+
+def test_shared_subexpressions_compile_once() -> None:
+    raw = {field: {} for field in ("entry", "exit", "risk", "routing")}
+    definitions = [
+        StrategyDefinition(name=f"pack_{i}", raw={**raw, "trigger": {"all": ["ema(H1,200) > 0"]}})
+        for i in range(5)
+    ]
+    program = compile_strategies(definitions)
+    assert program.step_count == 3
+    stop = compile_expression("k1 * atr(M1)", params={"k1": 1.5})
+    store = FeatureStore()
+    store.upsert(FeatureWindow("atr", "M1", datetime(2024, 1, 2), 2.0))
+    assert stop(store) == 3.0
+    assert parse_expression("relvol(M1) > q70") == Compare(
+        ">", Slot("relvol", "M1"), Quantile(Slot("relvol", "M1"), 0.7)
+    )
+
+
+def test_missing_features_propagate_through_logic() -> None:
+    store = FeatureStore()
+    store.upsert(FeatureWindow("b", "live", datetime(2024, 1, 2), 1.0))
+    assert compile_expression("not (a > 0 and b > 0)")(store) is None
+    assert compile_expression("not (a > 0 and b > 5)")(store) is True
+    assert compile_expression("a > 0 or b > 0")(store) is True
+    assert compile_expression("a > 0 or b > 5")(store) is None
+    raw = {field: {} for field in ("entry", "exit", "risk", "routing")}
+    definitions = [
+        StrategyDefinition(
+            name="guard", raw={**raw, "trigger": {"all": ["not (a > 0 and b > 0)"]}}
+        ),
+    ]
+    assert compile_strategies(definitions).evaluate(store) == {"guard": False}
+
+
+def test_constants_of_different_types_are_not_merged() -> None:
+    raw = {field: {} for field in ("entry", "exit", "risk", "routing")}
+    definitions = [
+        StrategyDefinition(name="flag", raw={**raw, "trigger": {"all": ["true"]}}),
+        StrategyDefinition(name="one", raw={**raw, "trigger": {"all": ["1"]}}),
+    ]
+    assert compile_strategies(definitions).step_count == 2
+    assert Const(True) != Const(1.0) and Const(1.0) == Const(1.0)
+
+
+def test_registry_skips_bad_and_vanished_drop_files(tmp_path: Path) -> None:
+    main = tmp_path / "strategies.yaml"
+    main.write_text(_DROP_TEMPLATE % "base")
+    drops = tmp_path / "strategies.d"
+    drops.mkdir()
+    (drops / "broken.yaml").write_text("strategies: [unclosed\n")
+    (drops / "scalar.yaml").write_text("strategies: [1]\n")
+    registry = StrategyRegistry(main, drop_dir=drops)
+    assert registry.refresh() == [main]
+    assert [d.name for d in registry.definitions] == ["base"]
+
+    sources = registry._sources
+    registry._sources = lambda: [*sources(), drops / "vanished.yaml"]  # type: ignore[method-assign]
+    assert registry.refresh() == []
+
+
+def test_registry_poll_thread_survives_bad_drop_file(tmp_path: Path) -> None:
+    main = tmp_path / "strategies.yaml"
+    main.write_text(_DROP_TEMPLATE % "base")
+    drops = tmp_path / "strategies.d"
+    drops.mkdir()
+    reloaded = threading.Event()
+    registry = StrategyRegistry(main, drop_dir=drops, on_change=lambda definitions: reloaded.set())
+    registry.refresh()
+    reloaded.clear()
+    registry.start(interval=0.01)
+    try:
+        (drops / "broken.yaml").write_text("strategies: [unclosed\n")
+        time.sleep(0.05)
+        assert registry._thread is not None and registry._thread.is_alive()
+        (drops / "good.yaml").write_text(_DROP_TEMPLATE % "gamma")
+        assert reloaded.wait(2.0)
+        assert [d.name for d in registry.definitions] == ["base", "gamma"]
+    finally:
+        registry.stop()
+
+
+def test_parse_recovers_from_unusable_disk_cache(tmp_path: Path) -> None:
+    cache = tmp_path / "cache"
+    source = tmp_path / "int_keys.yaml"
+    source.write_text(
+        "strategies:\n  - {name: ints, regime_allow: [], features: [], trigger: {}, filters: {},\n"
+        "     entry: {}, exit: {}, risk: {}, routing: {}, params: {1: 2}}\n"
+    )
+    for _ in range(2):
+        dsl._PARSE_CACHE.clear()
+        assert StrategyDSLParser(source, cache_dir=cache).parse()[0].raw["params"] == {1: 2}
+    assert not list(cache.glob("*.msgpack"))
+
+    source.write_text(_DROP_TEMPLATE % "alpha")
+    dsl._PARSE_CACHE.clear()
+    StrategyDSLParser(source, cache_dir=cache).parse()
+    (cached,) = cache.glob("*.msgpack")
+    cached.write_bytes(cached.read_bytes()[:10])
+    dsl._PARSE_CACHE.clear()
+    assert StrategyDSLParser(source, cache_dir=cache).parse()[0].name == "alpha"
+    dsl._PARSE_CACHE.clear()
+    assert StrategyDSLParser(source, cache_dir=cache).parse()[0].name == "alpha"
+    assert cached.stat().st_size > 10
@@ -0,0 +1,154 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.common import indicators
+from src.common.feature_store import FeatureEntry, FeatureStore
+from src.common.types import FeatureWindow
+
+START = datetime(2024, 1, 2, 9, 0)
+
+
+def _window(name: str, minute: int, value: float, timeframe: str = "M1") -> FeatureWindow:
+    return FeatureWindow(
+        name=name, timeframe=timeframe, timestamp=START + timedelta(minutes=minute), value=value
+    )
+
+
+def test_history_mode_supports_as_of_and_quantiles() -> None:
+    store = FeatureStore(history_size=50)
+    values = [float((i * 37) % 101) for i in range(120)]
+    for minute, value in enumerate(values):
+        store.upsert(_window("relvol", minute, value))
+    history = store.history("relvol", "M1")
+    assert history is not None and len(history) == 50
+    retained = np.array(values[-50:])
+    assert history.values().tolist() == retained.tolist()
+    assert store.quantile("relvol", "M1", 0.7) == np.quantile(retained, 0.7)
+    assert history.rank(float(np.median(retained))) == np.mean(retained <= np.median(retained))
+    assert (
+        store.value_as_of("relvol", "M1", START + timedelta(minutes=100, seconds=30)) == values[100]
+    )
+    assert store.value_as_of("relvol", "M1", START) is None
+    assert store.get("relvol", "M1").value == values[-1]
+
+
+def test_history_disabled_by_default() -> None:
+    store = FeatureStore()
+    store.upsert(_window("rsi", 0, 55.0))
+    assert store.history("rsi", "M1") is None
+    assert store.quantile("rsi", "M1", 0.5) is None
+
+
+def test_latest_values_reads_single_timeframe_shard() -> None:
+    store = FeatureStore()
+    store.upsert(_window("rsi", 0, 55.0))
+    store.upsert(_window("adx", 0, 22.0, timeframe="H1"))
+    snapshot = store.latest_values("M1")
+    store.upsert(_window("rsi", 1, 60.0))
+    store.upsert(_window("macd_hist", 1, 0.2))
+    assert snapshot == {"rsi": 55.0}
+    assert store.latest_values("M1") == {"rsi": 60.0, "macd_hist": 0.2}
+    assert store.latest_values("H1") == {"adx": 22.0}
+    store.purge_older_than(START + timedelta(minutes=1))
+    assert store.timeframes() == ["M1"]
+
+
+def test_persist_and_load_round_trip(tmp_path: Path) -> None:
+    store = FeatureStore(history_size=8, snapshot_dir=tmp_path / "features")
+    for minute in range(12):
+        store.upsert(_window("ema_200", minute, 2000.0 + minute, timeframe="H1"))
+    store.upsert(FeatureWindow(name="session", timeframe="live", timestamp=START, value="london"))
+    ema = indicators.IncrementalEMA(period=20)
+    for value in range(30):
+        ema.update(float(value))
+    store.register_indicator("ema_20", "M1", ema)
+    store.persist()
+
+    restored = FeatureStore(history_size=8, snapshot_dir=tmp_path / "features")
+    restored.load()
+    assert restored.get("ema_200", "H1") == store.get("ema_200", "H1")
+    assert restored.get("session", "live").value == "london"
+    assert (
+        restored.history("ema_200", "H1").values().tolist()
+        == store.history("ema_200", "H1").values().tolist()
+    )
+    assert restored.quantile("ema_200", "H1", 0.5) == store.quantile("ema_200", "H1", 0.5)
+    warm = restored.indicator("ema_20", "M1")
+    assert warm.update(30.0) == ema.update(30.0)
+
+
+def test_purge_evicts_only_stale_keys_and_reports_stats() -> None:
+    store = FeatureStore(history_size=4)
+    store.upsert(_window("rsi", 0, 50.0))
+    store.upsert(_window("adx", 0, 20.0, timeframe="H1"))
+    store.upsert(_window("rsi", 10, 55.0))
+    stats = store.purge_older_than(START + timedelta(minutes=5))
+    assert stats.evicted == 1 and stats.bytes_freed > 0
+    assert store.get("adx", "H1") is None
+    assert store.get("rsi", "M1").value == 55.0
+    assert store.purge_older_than(START + timedelta(minutes=5)).evicted == 0
+    store.upsert(_window("adx", 20, 25.0, timeframe="H1"))
+    assert store.purge_older_than(START + timedelta(minutes=15)).evicted == 1
+    assert store.purge_totals.evicted == 2
+    assert store.latest_values("H1") == {"adx": 25.0}
+
+
+def test_update_racing_a_purge_keeps_the_key() -> None:
+    store = FeatureStore(history_size=4)
+    store.upsert(_window("rsi", 0, 50.0))
+    lookup = store._entry
+
+    def purge_after_lookup(name: str, timeframe: str) -> FeatureEntry:
+        # Detach the entry after upsert found it but before it writes the new window.
+        entry = lookup(name, timeframe)
+        store._entry = lookup
+        assert store.purge_older_than(START + timedelta(minutes=5)).evicted == 1
+        return entry
+
+    store._entry = purge_after_lookup
+    store.upsert(_window("rsi", 10, 55.0))
+    assert store.get("rsi", "M1").value == 55.0
+    assert store.history("rsi", "M1").as_of(10**20) == 55.0
+    assert store.purge_older_than(START + timedelta(minutes=5)).evicted == 0
+    assert store.purge_older_than(START + timedelta(minutes=15)).evicted == 1
+
+
+def test_interrupted_persist_keeps_previous_snapshot(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    store = FeatureStore(history_size=4, snapshot_dir=tmp_path)
+    store.upsert(_window("rsi", 0, 50.0))
+    store.persist()
+    store.upsert(_window("rsi", 1, 55.0))
+    store.persist()
+    assert len(list(tmp_path.glob("*.npy"))) == 4
+
+    store.upsert(_window("rsi", 2, 60.0))
+    monkeypatch.setattr("src.common.feature_store.dump_msgpack", _crash)
+    with pytest.raises(OSError):
+        store.persist()
+    assert len(list(tmp_path.glob("*.npy"))) == 4
+    restored = FeatureStore(history_size=4, snapshot_dir=tmp_path)
+    restored.load()
+    assert restored.get("rsi", "M1").value == 55.0
+    assert restored.history("rsi", "M1").values().tolist() == [50.0, 55.0]
+
+
+def test_persist_converts_numpy_scalars_and_rejects_unknown_indicators(tmp_path: Path) -> None:
+    store = FeatureStore(snapshot_dir=tmp_path)
+    store.upsert(
+        FeatureWindow(name="news.hard", timeframe="live", timestamp=START, value=np.bool_(True))
+    )
+    store.persist()
+    restored = FeatureStore(snapshot_dir=tmp_path)
+    restored.load()
+    assert restored.get("news.hard", "live").value is True
+    with pytest.raises(TypeError):
+        store.register_indicator("custom", "M1", object())
+
+
+def _crash(*_: object) -> None:
+    raise OSError("disk full")
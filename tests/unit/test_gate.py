@@ -1,6 +1,10 @@
 from datetime import datetime
 
-from src.strategy.gates import GateInputs, MultiTimeframeGate
+import numpy as np
+
+from src.common.ta_confluence import FEATURE_SLOTS, ConfluenceEvaluator
+from src.common.types import FeatureWindow
+from src.strategy.gates import GateBatch, GateInputs, MultiTimeframeGate
 
 
 def test_multi_timeframe_gate_generates_candidate() -> None:
@@ -21,3 +25,47 @@ def test_multi_timeframe_gate_generates_candidate() -> None:
     candidate = gate.evaluate(inputs)
     assert candidate is not None
     assert 0 <= candidate.confidence <= 1
+
+
+def test_evaluate_batch_matches_scalar_gate() -> None:
+    gate = MultiTimeframeGate(ttl=2)
+    rng = np.random.default_rng(7)
+    created_at = datetime(2024, 1, 2, 14, 0)
+    rows = []
+    for idx in range(400):
+        price = 100.0 + rng.normal()
+        rows.append(
+            GateInputs(
+                symbol=f"SYM{idx % 5}",
+                price=price,
+                timeframe_features={
+                    "HTF": {
+                        "ema_fast": price + rng.normal(),
+                        "ema_slow": price,
+                        "adx": rng.uniform(10, 40),
+                    },
+                    "LTF": {"macd_hist": rng.normal(), "rsi": rng.uniform(20, 80)},
+                    "MTF": {"swing_low": price - 1.0, "swing_high": price + 1.0},
+                    "TREND": {"bias": rng.uniform(0, 1)},
+                },
+                volume_features={"rel_volume": rng.uniform(0.3, 1.5)},
+                orderflow_features={"imbalance": rng.uniform(-0.3, 0.3)},
+                ml_probability=None if idx % 3 == 0 else float(rng.uniform()),
+                created_at=created_at,
+            )
+        )
+    expected = [candidate for candidate in map(gate.evaluate, rows) if candidate is not None]
+    assert expected
+    assert gate.evaluate_batch(GateBatch.from_inputs(rows)) == expected
+
+
+def test_confluence_vector_honors_configured_weights() -> None:
+    evaluator = ConfluenceEvaluator(
+        {"trend": 1.0, "momentum": 0.0, "volume": 0.0, "orderflow": 0.0}
+    )
+    vector = evaluator.new_vector()
+    vector[FEATURE_SLOTS["trend_bias"]] = 0.9
+    windows = [FeatureWindow("trend_bias", "HTF", datetime(2024, 1, 2), 0.9)]
+    assert evaluator.score(vector) == evaluator.evaluate(windows).total == 0.9
+    evaluator.reset(vector)
+    assert vector == [0.5] * 4
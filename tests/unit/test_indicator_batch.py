@@ -0,0 +1,65 @@
+from typing import Callable
+
+import numpy as np
+import pytest
+
+from src.common import indicators, volume_volatility
+from src.common.indicators import batch
+
+
+@pytest.fixture(name="bars")
+def bars_fixture() -> dict[str, np.ndarray]:
+    rng = np.random.default_rng(7)
+    close = 2000 + np.cumsum(rng.normal(0, 1.5, 400))
+    close[120:140] = close[119]
+    high = close + rng.uniform(0.1, 2.0, close.size)
+    low = close - rng.uniform(0.1, 2.0, close.size)
+    volume = rng.integers(1, 50, close.size).astype(float)
+    return {"high": high, "low": low, "close": close, "volume": volume}
+
+
+def _prefix_values(func: Callable[..., float], *series: np.ndarray, **kwargs: float) -> np.ndarray:
+    size = series[0].size
+    return np.array([func(*(s[: i + 1] for s in series), **kwargs) for i in range(size)])
+
+
+def test_ema_parity(bars: dict[str, np.ndarray]) -> None:
+    expected = _prefix_values(indicators.ema, bars["close"], period=20)
+    assert np.allclose(batch.ema(bars["close"], 20), expected, rtol=1e-10)
+
+
+def test_rsi_parity(bars: dict[str, np.ndarray]) -> None:
+    expected = _prefix_values(indicators.rsi, bars["close"], period=14)
+    assert np.allclose(batch.rsi(bars["close"], 14), expected, rtol=1e-10)
+
+
+def test_atr_parity(bars: dict[str, np.ndarray]) -> None:
+    expected = _prefix_values(indicators.atr, bars["high"], bars["low"], bars["close"], period=14)
+    assert np.allclose(
+        batch.atr(bars["high"], bars["low"], bars["close"], 14), expected, rtol=1e-10
+    )
+
+
+def test_adx_parity(bars: dict[str, np.ndarray]) -> None:
+    expected = _prefix_values(indicators.adx, bars["high"], bars["low"], bars["close"], period=14)
+    assert np.allclose(
+        batch.adx(bars["high"], bars["low"], bars["close"], 14), expected, rtol=1e-10
+    )
+
+
+def test_relative_volume_parity(bars: dict[str, np.ndarray]) -> None:
+    expected = _prefix_values(volume_volatility.relative_volume, bars["volume"], lookback=60)
+    assert np.array_equal(batch.relative_volume(bars["volume"], 60), expected)
+
+
+def test_realized_volatility_parity(bars: dict[str, np.ndarray]) -> None:
+    returns = np.diff(np.log(bars["close"]))
+    expected = _prefix_values(volume_volatility.realized_volatility, returns)
+    assert np.allclose(batch.realized_volatility(returns), expected, rtol=1e-8, atol=1e-12)
+
+
+def test_short_series_match_scalar_defaults() -> None:
+    short = np.array([1.0, 2.0, 3.0])
+    assert np.array_equal(batch.rsi(short, 14), np.full(3, 50.0))
+    assert np.array_equal(batch.adx(short, short, short, 14), np.zeros(3))
+    assert batch.macd(np.array([]))[0].size == 0
@@ -1,4 +1,7 @@
+import numpy as np
+
 from src.common import indicators
+from src.common.indicators import batch
 
 
 def test_ema_basic() -> None:
@@ -12,3 +15,37 @@ def test_macd_returns_tuple() -> None:
     assert isinstance(macd_line, float)
     assert isinstance(signal_line, float)
     assert isinstance(hist, float)
+
+
+def _bars(count: int) -> tuple[list[float], list[float], list[float]]:
+    closes = [100 + ((i * 7) % 11) - ((i * 3) % 5) + i * 0.1 for i in range(count)]
+    highs = [close + 0.5 + (i % 3) * 0.25 for i, close in enumerate(closes)]
+    lows = [close - 0.5 - (i % 4) * 0.2 for i, close in enumerate(closes)]
+    return highs, lows, closes
+
+
+def test_incremental_indicators_match_batch_recompute() -> None:
+    highs, lows, closes = _bars(60)
+    ema = indicators.IncrementalEMA(period=10)
+    rsi = indicators.IncrementalRSI(period=14)
+    atr = indicators.IncrementalATR(period=14)
+    adx = indicators.IncrementalADX(period=14)
+    for i in range(len(closes)):
+        assert ema.update(closes[i]) == indicators.ema(closes[: i + 1], period=10)
+        assert rsi.update(closes[i]) == indicators.rsi(closes[: i + 1], period=14)
+        assert atr.update(highs[i], lows[i], closes[i]) == indicators.atr(
+            highs[: i + 1], lows[: i + 1], closes[: i + 1], period=14
+        )
+        assert adx.update(highs[i], lows[i], closes[i]) == indicators.adx(
+            highs[: i + 1], lows[: i + 1], closes[: i + 1], period=14
+        )
+
+
+def test_macd_batch_and_streaming_match_scalar() -> None:
+    _, _, closes = _bars(300)
+    macd_line, signal_line, hist = batch.macd(closes)
+    tracker = indicators.IncrementalMACD()
+    for i in range(len(closes)):
+        expected = indicators.macd(closes[: i + 1])
+        assert tracker.update(closes[i]) == expected
+        assert np.allclose([macd_line[i], signal_line[i], hist[i]], expected, rtol=1e-9, atol=1e-9)
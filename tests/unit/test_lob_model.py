@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from src.orderflow.lob_features import LOBSnapshot  # noqa: E402
+from src.orderflow.lob_model import (  # noqa: E402
+    LOB_LEVELS,
+    LobInferenceService,
+    LobSiameseModel,
+    encode_snapshots,
+)
+
+
+def _snapshots(count: int, seed: int) -> dict[str, LOBSnapshot]:
+    rng = np.random.default_rng(seed)
+    offsets = 0.5 * np.arange(LOB_LEVELS)
+    snapshots = {}
+    for idx in range(count):
+        bid_sizes, ask_sizes = rng.gamma(2.0, 3.0, (2, LOB_LEVELS))
+        levels = int(rng.integers(1, LOB_LEVELS + 1))
+        snapshots[f"SYM{idx}"] = LOBSnapshot(
+            bids=np.column_stack((100 - offsets, bid_sizes))[:levels].tolist(),
+            asks=np.column_stack((100 + offsets, ask_sizes)).tolist(),
+        )
+    return snapshots
+
+
+@pytest.mark.parametrize("batch", [1, 8, 64])
+def test_batched_service_matches_single_predictions(batch: int) -> None:
+    torch.manual_seed(0)
+    model = LobSiameseModel()
+    service = LobInferenceService(model, threads=1)
+    snapshots = _snapshots(batch, seed=batch)
+    for symbol, snapshot in snapshots.items():
+        service.submit(symbol, snapshot)
+    assert service.pending == batch
+    probabilities = service.flush()
+    assert service.pending == 0 and list(probabilities) == list(snapshots)
+    for symbol, snapshot in snapshots.items():
+        bids, asks = encode_snapshots([snapshot])
+        assert probabilities[symbol] == pytest.approx(model.predict(bids, asks), abs=1e-6)
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from src.orderflow.lob_features import LOBSnapshot, depth_slope, order_imbalance
+from src.orderflow.order_book import OrderBook
+
+
+def test_order_book_deltas_match_snapshot_features() -> None:
+    rng = np.random.default_rng(0)
+    book = OrderBook("BTCUSD", depth=20, levels=5)
+    levels = {"bid": {}, "ask": {}}
+    for step in range(5000):
+        side = "bid" if rng.random() < 0.5 else "ask"
+        offset = int(rng.integers(1, 16)) * 0.5
+        price = 100.0 - offset if side == "bid" else 100.0 + offset
+        size = 0.0 if rng.random() < 0.3 else float(rng.integers(1, 10))
+        book.update(side, price, size)
+        if size:
+            levels[side][price] = size
+        else:
+            levels[side].pop(price, None)
+        if step % 50 == 0:
+            snapshot = LOBSnapshot(
+                bids=[[price, size] for price, size in sorted(levels["bid"].items(), reverse=True)],
+                asks=[[price, size] for price, size in sorted(levels["ask"].items())],
+            )
+            assert book.snapshot() == snapshot
+            assert book.imbalance == pytest.approx(order_imbalance(snapshot), abs=1e-12)
+            assert book.depth_slope() == pytest.approx(depth_slope(snapshot), abs=1e-9)
+            if snapshot.bids and snapshot.asks:
+                assert book.spread == snapshot.asks[0][0] - snapshot.bids[0][0]
+
+
+def test_order_book_keeps_best_levels_when_full() -> None:
+    book = OrderBook(depth=3, levels=3)
+    book.reset(bids=[[99.0, 1.0], [98.0, 2.0], [97.0, 3.0]], asks=[[101.0, 1.0]])
+    book.update("bid", 99.5, 4.0)
+    assert book.bids()[0].tolist() == [99.5, 99.0, 98.0]
+    assert book.bid_volume == 7.0
+    book.update("bid", 96.0, 5.0)
+    assert book.bid_volume == 7.0
+    book.update("bid", 99.5, 0.0)
+    assert book.bid_volume == 3.0
+    assert book.best_bid == 99.0
+    with pytest.raises(ValueError):
+        book.update("buy", 1.0, 1.0)
+
+
+def test_order_book_volumes_stay_exact_with_fractional_sizes() -> None:
+    rng = np.random.default_rng(3)
+    book = OrderBook(depth=10, levels=5)
+    for _ in range(20_000):
+        side = "bid" if rng.random() < 0.5 else "ask"
+        offset = int(rng.integers(1, 15)) * 0.5
+        size = 0.0 if rng.random() < 0.3 else float(rng.random() * 3)
+        book.update(side, 100 - offset if side == "bid" else 100 + offset, size)
+    assert book.bid_volume == float(book.bids(5)[1].sum())
+    assert book.ask_volume == float(book.asks(5)[1].sum())
+
+    for price in book.bids()[0].tolist():
+        book.update("bid", price, 0.0)
+    for price in book.asks()[0].tolist():
+        book.update("ask", price, 0.0)
+    assert book.bid_volume == 0.0 and book.ask_volume == 0.0
+    assert book.imbalance == 0.0
@@ -0,0 +1,45 @@
+import math
+
+import numpy as np
+import pytest
+
+from src.common.types import SignalCandidate
+from src.strategy.playbooks import btcusd, eurusd, gbpjpy, us100, xauusd
+
+COLUMNS = {
+    "relative_volume": (0.0, 1.5),
+    "session_overlap": (-1.0, 1.0),
+    "news_risk": (-1.0, 1.0),
+    "orb_break": (-1.0, 1.0),
+    "tape_aggression": (0.0, 1.0),
+    "slippage": (0.0, 0.5),
+    "sentiment": (-1.0, 1.0),
+    "spread": (0.0, 0.02),
+    "volatility": (0.0, 4.0),
+    "news_halt": (-1.0, 1.0),
+    "range_score": (0.0, 1.0),
+}
+
+
+@pytest.mark.parametrize("module", [xauusd, us100, btcusd, gbpjpy, eurusd])
+def test_score_batch_matches_scalar_score(module: object) -> None:
+    rng = np.random.default_rng(11)
+    size = 2000
+    confidence = rng.uniform(0.0, 1.0, size)
+    features = {name: rng.uniform(low, high, size) for name, (low, high) in COLUMNS.items()}
+    features["regime"] = rng.integers(0, 3, size).astype(np.float64)
+    features["news_halt"][rng.uniform(size=size) < 0.7] = 0.0
+    for values in features.values():
+        values[rng.uniform(size=size) < 0.2] = np.nan
+
+    batch = module.score_batch(confidence, features)
+
+    candidate = SignalCandidate("SYM", "long", 0.0, 1, 0.0, "test")
+    for idx in range(size):
+        candidate.confidence = float(confidence[idx])
+        row = {
+            name: float(values[idx])
+            for name, values in features.items()
+            if not math.isnan(values[idx])
+        }
+        assert batch[idx] == module.score(candidate, row)
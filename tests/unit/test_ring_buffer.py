@@ -0,0 +1,40 @@
+from datetime import datetime
+
+import numpy as np
+
+from src.common.indicators import batch
+from src.common.ring_buffer import HistoryStore, RingBuffer
+from src.ingest.market_feed import MarketEvent
+
+
+def test_ring_buffer_keeps_latest_rows_contiguous() -> None:
+    buffer = RingBuffer(capacity=4, fields=("close",))
+    for i in range(10):
+        buffer.append(i, float(i))
+    closes = buffer.column("close")
+    assert closes.tolist() == [6.0, 7.0, 8.0, 9.0]
+    assert buffer.timestamps(2).tolist() == [8, 9]
+    assert closes.flags.c_contiguous
+    assert np.shares_memory(np.ascontiguousarray(closes, dtype=np.float64), closes)
+    assert batch.ema(buffer.column("close", 3), 2).size == 3
+
+
+def test_history_store_records_bar_and_tick_events() -> None:
+    store = HistoryStore(bar_capacity={"M1": 8}, tick_capacity=16)
+    now = datetime(2024, 1, 2, 9, 30)
+    store.record(
+        MarketEvent(symbol="XAUUSD", timestamp=now, payload={"price": 2050.5, "size": 2.0})
+    )
+    bar = {
+        "timeframe": "M1",
+        "open": 1.0,
+        "high": 2.0,
+        "low": 0.5,
+        "close": 1.5,
+        "volume": 10.0,
+        "ticks": 4,
+    }
+    store.record(MarketEvent(symbol="XAUUSD", timestamp=now, payload=bar))
+    assert store.ticks("XAUUSD").last("price") == 2050.5
+    assert store.bars("XAUUSD", "M1").column("close").tolist() == [1.5]
+    assert store.bars("XAUUSD", "M1").capacity == 8
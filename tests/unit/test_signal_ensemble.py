@@ -0,0 +1,57 @@
+import numpy as np
+
+from src.common.types import SignalCandidate
+from src.strategy.signal_ensemble import EnsembleBatch, EnsembleInputs, SignalEnsemble
+
+FEATURES = (
+    "relative_volume",
+    "session_overlap",
+    "news_risk",
+    "orb_break",
+    "tape_aggression",
+    "slippage",
+    "sentiment",
+    "spread",
+    "regime",
+    "volatility",
+    "news_halt",
+    "range_score",
+)
+
+
+def _random_inputs(count: int, seed: int = 3) -> list[EnsembleInputs]:
+    rng = np.random.default_rng(seed)
+    symbols = ["XAUUSD", "us100", "BTCUSD", "GBPJPY", "EURUSD", "USDCAD"]
+    rows = []
+    for idx in range(count):
+        overrides = {
+            name: float(rng.uniform(-0.2, 2.5)) for name in FEATURES if rng.uniform() < 0.6
+        }
+        if "regime" in overrides:
+            overrides["regime"] = float(rng.integers(0, 2))
+        candidate = SignalCandidate(
+            symbols[idx % len(symbols)], "long", float(rng.uniform()), 3, 1.0, "mtf_gate"
+        )
+        ml_probability = [None, 0.0, float(rng.uniform())][idx % 3]
+        rows.append(
+            EnsembleInputs(
+                candidate,
+                float(rng.uniform()),
+                ml_probability,
+                float(rng.uniform(-1, 1)),
+                overrides,
+            )
+        )
+    return rows
+
+
+def test_combine_batch_matches_scalar_combine() -> None:
+    ensemble = SignalEnsemble()
+    rows = _random_inputs(600)
+    expected = [ensemble.combine(inputs) for inputs in rows]
+    assert ensemble.combine_many(rows) == expected
+    single = [inputs for inputs in rows if inputs.candidate.symbol == "XAUUSD"]
+    batch = EnsembleBatch.from_inputs(single)
+    assert ensemble.combine_batch(batch).tolist() == [
+        ensemble.combine(inputs).confidence for inputs in single
+    ]
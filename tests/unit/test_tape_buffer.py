@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from src.orderflow.lob_features import cumulative_volume_delta
+from src.orderflow.tape_buffer import TapeBuffer
+from src.orderflow.tape_features import (
+    TapePrint,
+    aggressor_ratio,
+    average_trade_size,
+    trades_per_second,
+)
+
+
+def _tape(count: int = 2000, seed: int = 0) -> tuple[np.ndarray, ...]:
+    rng = np.random.default_rng(seed)
+    stamps = np.cumsum(rng.integers(0, 50, count))
+    prices = 100 + np.cumsum(rng.standard_normal(count)) * 0.01
+    sizes = rng.integers(1, 20, count).astype(float)
+    sides = np.where(rng.random(count) < 0.5, "buy", "sell")
+    return stamps, prices, sizes, sides
+
+
+def test_tape_buffer_features_match_per_print_functions() -> None:
+    stamps, prices, sizes, sides = _tape()
+    buffer = TapeBuffer("BTCUSD", capacity=16)
+    buffer.extend(stamps[:1000], prices[:1000], sizes[:1000], sides[:1000])
+    for row in range(1000, stamps.size):
+        buffer.append(int(stamps[row]), float(prices[row]), float(sizes[row]), str(sides[row]))
+    assert len(buffer) == stamps.size
+
+    start, end = int(stamps[300]), int(stamps[1700])
+    rows = (stamps >= start) & (stamps < end)
+    selected = zip(stamps[rows], sizes[rows], sides[rows])
+    prints = [TapePrint(int(stamp), float(size), str(side)) for stamp, size, side in selected]
+    view = buffer.columns(start, end)
+    assert len(view) == len(prints)
+    assert view.cvd() == cumulative_volume_delta([{"size": p.size, "side": p.side} for p in prints])
+    assert view.vwap() == pytest.approx(float(prices[rows] @ sizes[rows] / sizes[rows].sum()))
+    assert view.trades_per_second() == pytest.approx(trades_per_second(prints))
+    assert view.average_trade_size() == pytest.approx(average_trade_size(prints))
+    assert view.aggressor_ratio() == pytest.approx(aggressor_ratio(prints))
+    assert buffer.cvd_series(start, end)[-1] == view.cvd()
+    assert not view.size.flags.writeable
+    with pytest.raises(ValueError):
+        buffer.append(0, 1.0, 1.0, "buy")
+
+
+def test_tape_buffer_detects_bursts() -> None:
+    quiet = np.arange(0, 10_000, 500)
+    burst = np.arange(10_000, 11_000, 10)
+    stamps = np.concatenate((quiet, burst, np.arange(11_000, 20_000, 500)))
+    buffer = TapeBuffer()
+    buffer.extend(
+        stamps, np.full(stamps.size, 100.0), np.ones(stamps.size), np.full(stamps.size, 1)
+    )
+    counts = buffer.trailing_counts(1_000)
+    assert counts.max() == 100
+    assert buffer.bursts(1_000, 50).tolist() == [quiet.size + 48]
+    assert len(buffer.last(1_000)) == 2
+    assert buffer.nbytes == stamps.size * 25
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from src.orderflow.tape_features import (
+    RollingTape,
+    TapePrint,
+    aggressor_ratio,
+    average_trade_size,
+    trades_per_second,
+)
+
+
+def test_rolling_tape_matches_batch_features_per_window() -> None:
+    rng = np.random.default_rng(0)
+    stamps = np.cumsum(rng.integers(0, 400, 3000)).tolist()
+    prints = [
+        TapePrint(timestamp_ms=stamp, size=float(size), side="buy" if buy else "sell")
+        for stamp, size, buy in zip(stamps, rng.integers(1, 50, 3000), rng.random(3000) < 0.55)
+    ]
+    tape = RollingTape((5_000, 60_000))
+    for idx, print_ in enumerate(prints):
+        tape.add_print(print_)
+        if idx % 97:
+            continue
+        for window_ms in (5_000, 60_000):
+            recent = [
+                item
+                for item in prints[: idx + 1]
+                if item.timestamp_ms > print_.timestamp_ms - window_ms
+            ]
+            features = tape.features(window_ms)
+            assert tape.window(window_ms).count == len(recent)
+            assert features["trades_per_second"] == pytest.approx(trades_per_second(recent))
+            assert features["average_trade_size"] == pytest.approx(average_trade_size(recent))
+            assert features["aggressor_ratio"] == pytest.approx(aggressor_ratio(recent))
+
+
+def test_rolling_tape_evicts_on_clock_without_prints() -> None:
+    tape = RollingTape((5_000,))
+    tape.add(1_000, 2.0, "buy")
+    tape.add(3_000, 1.0, "sell")
+    tape.evict(6_000)
+    assert tape.features(5_000) == {
+        "trades_per_second": 1.0,
+        "average_trade_size": 1.0,
+        "aggressor_ratio": 0.0,
+    }
+    tape.evict(8_000)
+    assert tape.features(5_000) == {
+        "trades_per_second": 0.0,
+        "average_trade_size": 0.0,
+        "aggressor_ratio": 0.5,
+    }